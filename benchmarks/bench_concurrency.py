@@ -0,0 +1,136 @@
+# benchmarks/bench_concurrency.py
+"""Read throughput against reader thread count while donations are written
+    
+    python -m benchmarks.bench_concurrency --db bench-copy.db --threads 1,2,4,8 --seconds 5
+
+Every round starts --writers threads making donations as fast as they can
+(the write storm) and N reader threads running a mix of donor and campaign
+lookups, then reports reads/s, writes/s and read latency. Two modes:
+  
+  split        reads on each thread's read-only connection, writes on the
+               single writer (how the models run)
+  shared       every read also goes through the writer, as if there were
+               one connection for everything
+
+The query cache is off so every read reaches SQLite. This writes donations,
+so point it at a copy of a generated database (see benchmarks.generate).
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.base import Base
+from models.cache import NullCache
+from models.campaign import Campaign
+from models.donation import Donation
+from models.donor import Donor
+
+MODES = ("split", "shared")
+
+
+def read_cases(max_donor, hot_campaign):
+    """Read operations picked at random by the reader threads"""
+    return [
+        lambda rng: Donor.get_total_donated(rng.randint(1, max_donor), "2024-01-01", "2024-07-01"),
+        lambda rng: Donor.get_donation_history_page(rng.randint(1, max_donor)),
+        lambda rng: Campaign.get_campaign_donors_page(hot_campaign)
+    ]
+
+
+def run_round(mode, readers, writers, seconds, cases, max_donor, max_campaign):
+    """One round of readers and writers, returns its throughput and latencies"""
+    stop = threading.Event()
+    read_times = [[] for _ in range(readers)]
+    write_counts = [0] * writers
+    
+    def read(n):
+        rng = random.Random(n)
+        timings = read_times[n]
+        while not stop.is_set():
+            case = rng.choice(cases)
+            started = time.perf_counter()
+            if mode == "shared":
+                with Base.connections.writing(Base.DB_PATH):
+                    case(rng)
+            else:
+                case(rng)
+            timings.append(time.perf_counter() - started)
+        Base.connections.close()
+    
+    def write(n):
+        rng = random.Random(1000 + n)
+        while not stop.is_set():
+            Donation.create(rng.randint(1, max_donor), rng.randint(1, max_campaign), "10.00")
+            write_counts[n] += 1
+    
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(writers)]
+    threads += [threading.Thread(target=read, args=(n,)) for n in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    
+    timings = sorted(t for per_thread in read_times for t in per_thread)
+    return {
+        "mode": mode,
+        "readers": readers,
+        "reads_per_sec": len(timings) / seconds,
+        "writes_per_sec": sum(write_counts) / seconds,
+        "read_p50_ms": timings[len(timings) // 2] * 1000 if timings else 0.0,
+        "read_p95_ms": timings[int(len(timings) * 0.95)] * 1000 if timings else 0.0
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure read scaling during a write storm")
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--threads", default="1,2,4,8", help="reader thread counts to try")
+    parser.add_argument("--writers", type=int, default=2, help="threads making donations")
+    parser.add_argument("--seconds", type=float, default=5.0, help="length of each round")
+    parser.add_argument("--mode", choices=MODES + ("both",), default="both")
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+    
+    if not Path(args.db).exists():
+        parser.error(f"{args.db} not found, create it with benchmarks.generate first")
+    
+    Base.configure(args.db)
+    Base.set_cache(NullCache())
+    max_donor = Base._scalar("SELECT MAX(id) FROM donors") or 0
+    max_campaign = Base._scalar("SELECT MAX(id) FROM campaigns") or 0
+    if not max_donor or not max_campaign:
+        parser.error("Database has no donors or campaigns, run benchmarks.generate first")
+    hot_campaign = Base._scalar(
+        "SELECT campaign_id FROM donations GROUP BY campaign_id ORDER BY COUNT(*) DESC LIMIT 1"
+    ) or 1
+    cases = read_cases(max_donor, hot_campaign)
+    
+    modes = MODES if args.mode == "both" else (args.mode,)
+    results = []
+    for mode in modes:
+        baseline = None
+        for readers in (int(n) for n in args.threads.split(",")):
+            result = run_round(mode, readers, args.writers, args.seconds, cases, max_donor, max_campaign)
+            baseline = baseline or result["reads_per_sec"]
+            results.append(result)
+            print(f"{mode:7} {readers:3} readers  {result['reads_per_sec']:9.1f} reads/s "
+                  f"({result['reads_per_sec'] / baseline:4.1f}x)  {result['writes_per_sec']:7.1f} writes/s  "
+                  f"read p50 {result['read_p50_ms']:7.3f}  p95 {result['read_p95_ms']:7.3f} ms")
+    
+    Base.close_connections()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"database": args.db, "writers": args.writers, "seconds": args.seconds,
+                       "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
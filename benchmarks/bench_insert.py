@@ -0,0 +1,99 @@
+# benchmarks/bench_insert.py
+"""Micro-benchmark of per-insert overhead in Base.create
+    
+    python -m benchmarks.bench_insert --rows 50000
+
+Compares three ways of inserting the same rows into an in-memory database,
+so disk and fsync time don't hide the Python and SQLite overhead:
+  
+  rebuilt      the SQL string is rebuilt from kwargs on every call (the
+               original Base.create)
+  compiled     Base.create with the per-model compiled statement
+  no-cache     compiled SQL but cached_statements=0, so SQLite has to
+               re-prepare the statement on every call
+
+The statement cache is keyed by SQL text, so rebuilt and compiled both get
+cache hits and come out within run-to-run noise of each other (from -23%
+to +20% across runs of 20000 rows, best of 3). What matters is the cache
+itself: no-cache is 45-80% slower than either.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.base import Base
+from models.cache import NullCache
+from models.connection import ConnectionManager
+
+
+class BenchRow(Base):
+    """Throwaway table shaped like donations"""
+    
+    DB_PATH = ":memory:"
+    TABLE_NAME = "bench_rows"
+    COLUMNS = [
+        "donor_id INTEGER NOT NULL",
+        "campaign_id INTEGER NOT NULL",
+        "amount INTEGER NOT NULL",
+        "date TEXT"
+    ]
+
+
+class RebuiltRow(BenchRow):
+    """BenchRow with the SQL rebuilt on every insert, as Base.create used to"""
+    
+    @classmethod
+    def create(cls, **kwargs):
+        columns = list(kwargs.keys())
+        values = list(kwargs.values())
+        columns_str = ", ".join(columns)
+        placeholders = ", ".join(["?"] * len(columns))
+        sql = f"INSERT INTO {cls.TABLE_NAME} ({columns_str}) VALUES ({placeholders})"
+        
+        with cls.transaction() as cursor:
+            cls.invalidate()
+            cursor.execute(sql, values)
+            return cursor.lastrowid
+
+
+def run_variant(model, rows, cached_statements):
+    """Insert rows one by one on a fresh in-memory database, returns microseconds per insert"""
+    Base.connections.close_all()
+    Base.connections = ConnectionManager(cached_statements=cached_statements)
+    model.create_table()
+    
+    started = time.perf_counter()
+    for i in range(rows):
+        model.create(donor_id=i, campaign_id=i % 100, amount=1000, date="2024-01-01 00:00:00")
+    return (time.perf_counter() - started) / rows * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure per-insert overhead of Base.create")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3, help="best of this many runs is reported")
+    args = parser.parse_args(argv)
+    
+    Base.set_cache(NullCache())
+    variants = [
+        ("rebuilt", RebuiltRow, ConnectionManager.CACHED_STATEMENTS),
+        ("compiled", BenchRow, ConnectionManager.CACHED_STATEMENTS),
+        ("no-cache", BenchRow, 0)
+    ]
+    
+    results = {}
+    for name, model, cached in variants:
+        results[name] = min(run_variant(model, args.rows, cached) for _ in range(args.repeat))
+    
+    baseline = results["rebuilt"]
+    for name, per_insert in results.items():
+        print(f"{name:10} {per_insert:8.2f} us/insert  ({(per_insert - baseline) / baseline * 100:+.1f}% vs rebuilt)")
+    
+    Base.connections.close_all()
+
+
+if __name__ == "__main__":
+    main()
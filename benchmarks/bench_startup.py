@@ -0,0 +1,105 @@
+# benchmarks/bench_startup.py
+"""Measure how long GiveConnect takes to start against a database
+    
+    python -m benchmarks.bench_startup --db bench.db --runs 10
+
+Each run is a fresh interpreter that imports main, runs initialize_database()
+and builds the CLI, which is everything a launch does before the first menu
+is shown. Wall time includes interpreter start-up. The child also reports
+its own phases, plus how long the old emptiness check (loading every donor
+just to see if there are any) takes on the same database for comparison.
+
+The first run against an unversioned database applies the migrations, so
+point this at a copy of a generated database (see benchmarks.generate).
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in the child interpreter, prints its phase timings as JSON
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+import main
+from models.base import Base
+from models.schema import Schema
+Base.configure({db!r})
+imported = time.perf_counter()
+main.initialize_database()
+initialized = time.perf_counter()
+from views.cli import CLI
+CLI()
+ready = time.perf_counter()
+phases = {{
+    "import_ms": (imported - started) * 1000,
+    "initialize_ms": (initialized - imported) * 1000,
+    "cli_ms": (ready - initialized) * 1000,
+    "schema_version": Schema.version()
+}}
+if {legacy!r}:
+    t0 = time.perf_counter()
+    len(main.Donor.get_all())
+    phases["legacy_check_ms"] = (time.perf_counter() - t0) * 1000
+print(json.dumps(phases))
+"""
+
+
+def launch(db_path, legacy=False):
+    """Start one child, returns (wall ms, phases reported by the child)"""
+    code = CHILD.format(root=str(ROOT), db=str(Path(db_path).resolve()), legacy=legacy)
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    wall_ms = (time.perf_counter() - started) * 1000
+    return wall_ms, json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure GiveConnect start-up time")
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+    
+    if not Path(args.db).exists():
+        parser.error(f"{args.db} not found, create it with benchmarks.generate first")
+    
+    # The first launch may migrate the database, report it separately
+    first_ms, first = launch(args.db)
+    print(f"first launch  {first_ms:8.1f} ms  (schema version {first['schema_version']})")
+    
+    walls = []
+    phases = []
+    for _ in range(args.runs):
+        wall_ms, child = launch(args.db)
+        walls.append(wall_ms)
+        phases.append(child)
+    walls.sort()
+    
+    results = {
+        "db": args.db,
+        "runs": args.runs,
+        "first_launch_ms": first_ms,
+        "wall_p50_ms": walls[len(walls) // 2],
+        "wall_min_ms": walls[0],
+        "import_ms": sorted(p["import_ms"] for p in phases)[len(phases) // 2],
+        "initialize_ms": sorted(p["initialize_ms"] for p in phases)[len(phases) // 2],
+        "cli_ms": sorted(p["cli_ms"] for p in phases)[len(phases) // 2],
+        "legacy_check_ms": launch(args.db, legacy=True)[1]["legacy_check_ms"]
+    }
+    
+    for name in ("wall_p50_ms", "wall_min_ms", "import_ms", "initialize_ms", "cli_ms", "legacy_check_ms"):
+        print(f"{name:15} {results[name]:8.1f}")
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# benchmarks/run.py
+"""Time the key model paths against a database and save the results
+    
+    python -m benchmarks.run --db bench.db --output results.json
+    python -m benchmarks.run --db bench.db --compare results.json
+
+Each case reports throughput and p50/p95/p99 latency. With --compare the
+run is checked against an earlier results file and exits with status 1 if
+any case's p50 got slower by more than --threshold percent.
+
+Donation.create writes to the database, so point this at a copy of a
+generated database (see benchmarks.generate) rather than real data, or
+pass --in-memory to run on an in-memory clone of it.
+"""
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.base import Base
+from models.cache import NullCache
+from models.campaign import Campaign
+from models.donation import Donation
+from models.donor import Donor
+
+PASSWORD = "password123"
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def measure(func, iterations, warmup=10):
+    """Call func(i) iterations times and summarise latency in milliseconds"""
+    for i in range(warmup):
+        func(i)
+    
+    timings = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        func(i)
+        timings.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - started
+    
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / elapsed if elapsed else 0.0,
+        "mean_ms": sum(timings) / len(timings),
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+        "p99_ms": percentile(timings, 99),
+        "max_ms": timings[-1]
+    }
+
+
+def build_cases(rng, iterations):
+    """The benchmark cases as (name, function, iteration count)"""
+    conn = Base.get_connection()
+    max_donor = conn.execute("SELECT MAX(id) FROM donors").fetchone()[0] or 0
+    max_campaign = conn.execute("SELECT MAX(id) FROM campaigns").fetchone()[0] or 0
+    if not max_donor or not max_campaign:
+        raise SystemExit("Database has no donors or campaigns, run benchmarks.generate first")
+    
+    # The hottest campaign is the worst case for donor listings
+    hot_campaign = conn.execute(
+        "SELECT campaign_id FROM donations GROUP BY campaign_id ORDER BY COUNT(*) DESC LIMIT 1"
+    ).fetchone()
+    hot_campaign = hot_campaign[0] if hot_campaign else 1
+    
+    donors = [rng.randint(1, max_donor) for _ in range(iterations)]
+    campaigns = [rng.randint(1, max_campaign) for _ in range(iterations)]
+    found = Donor.find_by_ids(donors[:100])
+    emails = [found[donor_id]["email"] for donor_id in donors[:100]]
+    
+    heavy = max(1, iterations // 20)
+    return [
+        ("Donor.authenticate", lambda i: Donor.authenticate(emails[i % len(emails)], PASSWORD), iterations),
+        ("Donation.create", lambda i: Donation.create(donors[i], campaigns[i], 10.0), iterations),
+        ("Campaign.get_campaign_donors", lambda i: Campaign.get_campaign_donors(campaigns[i]), heavy),
+        ("Campaign.get_campaign_donors[hot]", lambda i: Campaign.get_campaign_donors(hot_campaign), heavy),
+        ("Campaign.get_campaign_donors_page[hot]", lambda i: Campaign.get_campaign_donors_page(hot_campaign), iterations),
+        ("Donor.get_donation_history", lambda i: Donor.get_donation_history(donors[i]), iterations),
+        ("Donor.get_total_donated", lambda i: Donor.get_total_donated(donors[i]), iterations),
+        ("Base.get_all[campaigns]", lambda i: Campaign.get_all(), heavy)
+    ]
+
+
+def run(db_path, iterations=1000, seed=1, cache=False, only=None, in_memory=False):
+    """Run every case and return the results document"""
+    if in_memory:
+        Base.restore(db_path)
+    else:
+        Base.configure(db_path)
+    if not cache:
+        Base.set_cache(NullCache())
+    
+    rng = random.Random(seed)
+    results = {}
+    for name, func, count in build_cases(rng, iterations):
+        if only and only not in name:
+            continue
+        results[name] = measure(func, count)
+        stats = results[name]
+        print(f"{name:42} {stats['ops_per_sec']:10.1f} ops/s  "
+              f"p50 {stats['p50_ms']:8.3f}  p95 {stats['p95_ms']:8.3f}  p99 {stats['p99_ms']:8.3f} ms")
+    
+    Base.close_connections()
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "database": db_path,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "cache": cache,
+        "in_memory": in_memory,
+        "iterations": iterations,
+        "results": results
+    }
+
+
+def compare(current, previous, threshold=10.0):
+    """Print p50 changes against an earlier run, returns the regressed case names"""
+    regressions = []
+    print(f"\nCompared with {previous.get('timestamp', 'previous run')}:")
+    for name, stats in current["results"].items():
+        before = previous.get("results", {}).get(name)
+        if not before or not before["p50_ms"]:
+            continue
+        change = (stats["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:42} p50 {before['p50_ms']:8.3f} -> {stats['p50_ms']:8.3f} ms ({change:+.1f}%){flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark GiveConnect model paths")
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cache", action="store_true", help="keep the model cache on")
+    parser.add_argument("--only", help="only run cases whose name contains this text")
+    parser.add_argument("--in-memory", action="store_true",
+                        help="run on an in-memory copy of --db, leaving the file untouched")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="p50 slowdown in percent that counts as a regression")
+    args = parser.parse_args(argv)
+    
+    current = run(args.db, args.iterations, args.seed, args.cache, args.only, args.in_memory)
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        if compare(current, previous, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,27 @@
+# Controllers are imported on first use, so loading one controller module
+# doesn't pull in the others (ReportController brings NumPy along)
+import importlib
 
-from controllers.donor_controller import DonorController
-from controllers.campaign_controller import CampaignController
-from controllers.donation_controller import DonationController
+_MODULES = {
+    'DonorController': 'controllers.donor_controller',
+    'CampaignController': 'controllers.campaign_controller',
+    'DonationController': 'controllers.donation_controller',
+    'ReportController': 'controllers.report_controller',
+    'DiagnosticsController': 'controllers.diagnostics_controller',
+    'ExportController': 'controllers.export_controller',
+    'ReconcileController': 'controllers.reconcile_controller',
+    'AsyncDonorController': 'controllers.async_controllers',
+    'AsyncCampaignController': 'controllers.async_controllers',
+    'AsyncDonationController': 'controllers.async_controllers',
+    'AsyncReportController': 'controllers.async_controllers'
+}
 
-__all__ = ['DonorController', 'CampaignController', 'DonationController']
\ No newline at end of file
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    if name not in _MODULES:
+        raise AttributeError(f"module 'controllers' has no attribute {name!r}")
+    value = getattr(importlib.import_module(_MODULES[name]), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,150 @@
+# controllers/async_controllers.py
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from controllers.campaign_controller import CampaignController
+from controllers.donation_controller import DonationController
+from controllers.donor_controller import DonorController
+
+
+class AsyncExecutor:
+    """Runs blocking controller calls off the event loop
+    
+    Reads go to a bounded thread pool, each thread keeping its own pooled
+    connection. Every write goes through a single writer thread, so writes
+    never compete with each other for SQLite's lock and callers don't see
+    "database is locked" under concurrent load.
+    """
+    
+    def __init__(self, read_workers=8):
+        self._readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="giveconnect-read")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="giveconnect-write")
+    
+    async def read(self, func, *args, **kwargs):
+        """Run a read-only call on the reader pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, functools.partial(func, *args, **kwargs))
+    
+    async def write(self, func, *args, **kwargs):
+        """Run a call that writes on the single writer thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, functools.partial(func, *args, **kwargs))
+    
+    def shutdown(self, wait=True):
+        """Stop both pools"""
+        self._readers.shutdown(wait=wait)
+        self._writer.shutdown(wait=wait)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Get the shared executor, creating it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = AsyncExecutor()
+        return _executor
+
+
+def configure(read_workers=8):
+    """Replace the shared executor, e.g. to change the reader pool size"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+        _executor = AsyncExecutor(read_workers)
+
+
+def shutdown():
+    """Stop the shared executor, call before closing the event loop"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
+
+
+def _async(func, write=False):
+    """Wrap a blocking controller method as a coroutine with the same (success, payload) result"""
+    async def method(*args, **kwargs):
+        executor = get_executor()
+        run = executor.write if write else executor.read
+        return await run(func, *args, **kwargs)
+    
+    functools.update_wrapper(method, func)
+    return staticmethod(method)
+
+
+class AsyncDonorController:
+    """Async counterpart of DonorController"""
+    
+    register_donor = _async(DonorController.register_donor, write=True)
+    login = _async(DonorController.login)
+    get_donation_history = _async(DonorController.get_donation_history)
+    get_donation_history_page = _async(DonorController.get_donation_history_page)
+    get_donor_profile = _async(DonorController.get_donor_profile)
+    rebuild_donor_stats = _async(DonorController.rebuild_donor_stats, write=True)
+
+
+class AsyncCampaignController:
+    """Async counterpart of CampaignController"""
+    
+    create_campaign = _async(CampaignController.create_campaign, write=True)
+    get_all_campaigns = _async(CampaignController.get_all_campaigns)
+    get_active_campaigns = _async(CampaignController.get_active_campaigns)
+    get_active_campaigns_page = _async(CampaignController.get_active_campaigns_page)
+    get_campaign_details = _async(CampaignController.get_campaign_details)
+    get_campaign_donors = _async(CampaignController.get_campaign_donors)
+    get_campaign_donors_page = _async(CampaignController.get_campaign_donors_page)
+    search_campaigns = _async(CampaignController.search_campaigns)
+
+
+class AsyncDonationController:
+    """Async counterpart of DonationController"""
+    
+    make_donation = _async(DonationController.make_donation, write=True)
+    import_donations = _async(DonationController.import_donations, write=True)
+    partition_donations = _async(DonationController.partition_donations, write=True)
+    enable_write_behind = _async(DonationController.enable_write_behind, write=True)
+    disable_write_behind = _async(DonationController.disable_write_behind, write=True)
+    get_donation_details = _async(DonationController.get_donation_details)
+    get_donations_by_donor = _async(DonationController.get_donations_by_donor)
+    get_donations_by_donor_page = _async(DonationController.get_donations_by_donor_page)
+    get_donations_by_campaign = _async(DonationController.get_donations_by_campaign)
+    get_donations_by_campaign_page = _async(DonationController.get_donations_by_campaign_page)
+    
+    @staticmethod
+    async def submit_donation(donor_id, campaign_id, amount):
+        """Queue a donation, returns (True, awaitable donation ID) like submit_donation"""
+        success, result = await get_executor().read(DonationController.submit_donation, donor_id, campaign_id, amount)
+        if not success:
+            return success, result
+        return True, asyncio.wrap_future(result)
+
+
+def _report_controller():
+    # Built on first use, ReportController brings NumPy along
+    from controllers.report_controller import ReportController
+    
+    class AsyncReportController:
+        """Async counterpart of ReportController"""
+        
+        __qualname__ = "AsyncReportController"
+        top_campaigns = _async(ReportController.top_campaigns)
+        funded_distribution = _async(ReportController.funded_distribution)
+        inflow = _async(ReportController.inflow)
+        gift_size_stats = _async(ReportController.gift_size_stats)
+    
+    return AsyncReportController
+
+
+def __getattr__(name):
+    if name != "AsyncReportController":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = _report_controller()
+    return value
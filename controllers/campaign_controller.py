@@ -1,5 +1,6 @@
 # controllers/campaign_controller.py
 from models.campaign import Campaign
+from models.money import percent, to_decimal
 
 class CampaignController:
     """Controller for campaign-related operations"""
@@ -13,7 +14,7 @@ class CampaignController:
             
         try:
             
-            goal_amount = float(goal_amount)
+            goal_amount = to_decimal(goal_amount)
             if goal_amount <= 0:
                 return False, "Goal amount must be greater than zero"
                 
@@ -30,6 +31,11 @@ class CampaignController:
         except Exception as e:
             return False, f"Campaign creation failed: {str(e)}"
     
+    @staticmethod
+    def progress(current_amount, goal_amount):
+        """Percentage of the goal raised, as a Decimal worked out in whole cents"""
+        return percent(current_amount, goal_amount)
+    
     @staticmethod
     def get_all_campaigns():
         """Get all campaigns"""
@@ -54,12 +60,11 @@ class CampaignController:
         try:
             campaign = Campaign.find_by_id(campaign_id)
             if campaign:
-                # Here I'm Calculating progress percentage
-                if campaign['goal_amount'] > 0:
-                    campaign['progress'] = (campaign['current_amount'] / campaign['goal_amount']) * 100
-                else:
-                    campaign['progress'] = 0
-                    
+                # Copy so extra fields can be added whatever the row type
+                campaign = dict(campaign)
+                # Here I'm Calculating progress percentage, in whole cents so it's exact
+                campaign['progress'] = CampaignController.progress(campaign['current_amount'], campaign['goal_amount'])
+                
                 return True, campaign
             else:
                 return False, "Campaign not found"
@@ -73,4 +78,40 @@ class CampaignController:
             donors = Campaign.get_campaign_donors(campaign_id)
             return True, donors
         except Exception as e:
-            return False, f"Could not retrieve campaign donors: {str(e)}"
\ No newline at end of file
+            return False, f"Could not retrieve campaign donors: {str(e)}"
+    
+    @staticmethod
+    def get_active_campaigns_page(limit=20, cursor=None):
+        """Get one page of active campaigns"""
+        try:
+            campaigns, next_cursor = Campaign.get_active_campaigns_page(limit, cursor)
+            return True, {"items": campaigns, "next_cursor": next_cursor}
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Could not retrieve active campaigns: {str(e)}"
+    
+    @staticmethod
+    def search_campaigns(query, limit=20, cursor=None):
+        """Search active campaigns by name, description or organization"""
+        if not query or not query.strip():
+            return False, "Please enter something to search for"
+        
+        try:
+            campaigns, next_cursor = Campaign.search(query, limit=limit, cursor=cursor)
+            return True, {"items": campaigns, "next_cursor": next_cursor}
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Could not search campaigns: {str(e)}"
+    
+    @staticmethod
+    def get_campaign_donors_page(campaign_id, limit=20, cursor=None):
+        """Get one page of donors who have contributed to a campaign"""
+        try:
+            donors, next_cursor = Campaign.get_campaign_donors_page(campaign_id, limit, cursor)
+            return True, {"items": donors, "next_cursor": next_cursor}
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Could not retrieve campaign donors: {str(e)}"
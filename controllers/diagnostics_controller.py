@@ -0,0 +1,39 @@
+# controllers/diagnostics_controller.py
+from models.base import Base
+
+class DiagnosticsController:
+    """Controller for query statistics and cache diagnostics"""
+    
+    @staticmethod
+    def get_stats(top=10):
+        """Get query, connection and cache statistics"""
+        try:
+            stats = Base.query_stats.snapshot(top)
+            stats["cache"] = Base.cache.stats()
+            return True, stats
+        except Exception as e:
+            return False, f"Could not collect diagnostics: {str(e)}"
+    
+    @staticmethod
+    def set_collection(enabled, slow_ms=None, explain=None):
+        """Turn query statistics collection on or off"""
+        if enabled:
+            Base.query_stats.enable(slow_ms, explain)
+            return True, "Query statistics enabled"
+        Base.query_stats.disable()
+        return True, "Query statistics disabled"
+    
+    @staticmethod
+    def reset():
+        """Clear collected query statistics"""
+        Base.query_stats.reset()
+        return True, "Query statistics cleared"
+    
+    @staticmethod
+    def dump(path):
+        """Save the full statistics to a JSON file"""
+        try:
+            Base.query_stats.dump_json(path)
+            return True, f"Statistics written to {path}"
+        except OSError as e:
+            return False, f"Could not write statistics: {str(e)}"
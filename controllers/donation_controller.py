@@ -1,24 +1,89 @@
 # controllers/donation_controller.py
+import csv
+import gzip
+import json
 from models.donation import Donation
+from models.donation_queue import DonationQueue
+from models.import_pipeline import ImportPipeline
+from models.money import to_decimal
+
+
+def read_donation_file(path):
+    """Stream donation rows from a CSV or JSON Lines file (optionally gzipped)
+    
+    Rows are yielded one at a time so arbitrarily large files can be loaded.
+    Lines that aren't valid JSON are yielded as None and reported by the
+    importer as malformed.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    name = path[:-3] if path.endswith(".gz") else path
+    
+    with opener(path, "rt", newline="", encoding="utf-8") as f:
+        if name.endswith(".csv"):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    yield None
 
 class DonationController:
     """Controller for donation-related operations"""
     
+    # Group-commit queue, only set while write-behind mode is on
+    queue = None
+    
+    @staticmethod
+    def enable_write_behind(max_batch=500, max_delay_ms=5):
+        """Switch donations to group commit through a background committer"""
+        if DonationController.queue is None:
+            DonationController.queue = DonationQueue(max_batch, max_delay_ms / 1000).start()
+    
+    @staticmethod
+    def disable_write_behind():
+        """Flush any queued donations and go back to one commit per donation"""
+        if DonationController.queue is not None:
+            DonationController.queue.stop()
+            DonationController.queue = None
+    
+    @staticmethod
+    def submit_donation(donor_id, campaign_id, amount):
+        """Queue a donation without waiting for it to commit
+        
+        Returns (True, future), the future resolving to the donation ID once
+        it is durable. Needs write-behind mode.
+        """
+        if DonationController.queue is None:
+            return False, "Write-behind mode is not enabled"
+        try:
+            amount = to_decimal(amount)
+            return True, DonationController.queue.submit(donor_id, campaign_id, amount)
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Donation failed: {str(e)}"
+    
     @staticmethod
     def make_donation(donor_id, campaign_id, amount):
         """Make a donation to a campaign"""
         try:
-            # To Convert amount to float
-            amount = float(amount)
+            # To Convert amount to a Decimal, rounded to the cent
+            amount = to_decimal(amount)
             if amount <= 0:
                 return False, "Donation amount must be greater than zero"
                 
-            # Create donation
-            donation_id = Donation.create(
-                donor_id=donor_id,
-                campaign_id=campaign_id,
-                amount=amount
-            )
+            if DonationController.queue is not None:
+                # Wait for our group commit, concurrent callers share the fsync
+                donation_id = DonationController.queue.submit(donor_id, campaign_id, amount).result()
+            else:
+                donation_id = Donation.create(
+                    donor_id=donor_id,
+                    campaign_id=campaign_id,
+                    amount=amount
+                )
             
             return True, f"Thank you for your donation of ${amount:.2f}! Donation ID: {donation_id}"
         except ValueError as e:
@@ -54,4 +119,61 @@ class DonationController:
             donations = Donation.get_donations_by_campaign(campaign_id)
             return True, donations
         except Exception as e:
-            return False, f"Could not retrieve campaign donations: {str(e)}"
\ No newline at end of file
+            return False, f"Could not retrieve campaign donations: {str(e)}"
+    
+    @staticmethod
+    def import_donations(rows, batch_size=1000, workers=None, chunk_size=5000):
+        """Bulk import donations from a file path or an iterable of rows
+        
+        With workers set, rows are validated in that many processes (0 for
+        one per CPU) and committed by this one, see ImportPipeline.
+        """
+        try:
+            if isinstance(rows, str):
+                rows = read_donation_file(rows)
+            
+            if workers is None:
+                inserted, errors = Donation.bulk_create(rows, batch_size=batch_size)
+            else:
+                pipeline = ImportPipeline(workers, chunk_size, batch_size)
+                inserted, errors = pipeline.run(rows)
+            return True, {"inserted": inserted, "errors": errors}
+        except OSError as e:
+            return False, f"Could not read import file: {str(e)}"
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Import failed: {str(e)}"
+    
+    @staticmethod
+    def partition_donations(period="month"):
+        """Split donations into one table per month or year"""
+        try:
+            partitions = Donation.enable_partitioning(period)
+            return True, {"period": period, "partitions": partitions}
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Could not partition donations: {str(e)}"
+    
+    @staticmethod
+    def get_donations_by_donor_page(donor_id, limit=20, cursor=None):
+        """Get one page of a donor's donations"""
+        try:
+            donations, next_cursor = Donation.get_donations_by_donor_page(donor_id, limit, cursor)
+            return True, {"items": donations, "next_cursor": next_cursor}
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Could not retrieve donor donations: {str(e)}"
+    
+    @staticmethod
+    def get_donations_by_campaign_page(campaign_id, limit=20, cursor=None):
+        """Get one page of a campaign's donations"""
+        try:
+            donations, next_cursor = Donation.get_donations_by_campaign_page(campaign_id, limit, cursor)
+            return True, {"items": donations, "next_cursor": next_cursor}
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Could not retrieve campaign donations: {str(e)}"
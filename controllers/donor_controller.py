@@ -1,5 +1,6 @@
 # controllers/donor_controller.py
 from models.donor import Donor
+from models.donor_stats import DonorStats
 
 class DonorController:
     """Controller for donor-related operations"""
@@ -50,10 +51,33 @@ class DonorController:
         try:
             donor = Donor.find_by_id(donor_id)
             if donor:
-                # Add total donations to profile
-                donor['total_donated'] = Donor.get_total_donated(donor_id)
+                donor = dict(donor)
+                # Add the donor's giving totals to the profile
+                stats = Donor.get_stats(donor_id)
+                for key in DonorStats.EMPTY:
+                    donor[key] = stats[key]
                 return True, donor
             else:
                 return False, "Donor not found"
         except Exception as e:
-            return False, f"Could not retrieve donor profile: {str(e)}"
\ No newline at end of file
+            return False, f"Could not retrieve donor profile: {str(e)}"
+    
+    @staticmethod
+    def get_donation_history_page(donor_id, limit=20, cursor=None):
+        """Get one page of a donor's donation history"""
+        try:
+            history, next_cursor = Donor.get_donation_history_page(donor_id, limit, cursor)
+            return True, {"items": history, "next_cursor": next_cursor}
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Could not retrieve donation history: {str(e)}"
+    
+    @staticmethod
+    def rebuild_donor_stats():
+        """Recompute every donor's totals from the donations table"""
+        try:
+            count = DonorStats.rebuild()
+            return True, f"Rebuilt giving totals for {count} donors"
+        except Exception as e:
+            return False, f"Could not rebuild donor stats: {str(e)}"
@@ -0,0 +1,44 @@
+# controllers/export_controller.py
+from models.export import Exporter
+
+class ExportController:
+    """Controller for streaming exports of donations, donors and campaigns"""
+    
+    DATASETS = sorted(Exporter.DATASETS)
+    FORMATS = sorted(Exporter.FORMATS)
+    
+    @staticmethod
+    def stream(dataset, start=None, end=None, campaign_id=None):
+        """Get an iterator over an export's rows as dicts, in ID order"""
+        try:
+            exporter = Exporter(dataset, start=start, end=end, campaign_id=campaign_id)
+            return True, exporter.iter_rows()
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Could not export {dataset}: {str(e)}"
+    
+    @staticmethod
+    def write(stream, dataset, format="jsonl", compress=False, start=None, end=None, campaign_id=None):
+        """Write an export to an open binary stream (e.g. stdout)"""
+        try:
+            exporter = Exporter(dataset, format, compress, start, end, campaign_id)
+            return True, {"rows": exporter.write(stream)}
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Export failed: {str(e)}"
+    
+    @staticmethod
+    def export_to_file(dataset, path, format=None, compress=False, start=None, end=None,
+                       campaign_id=None, resume=False):
+        """Export to a file, checkpointing so an interrupted export can be resumed"""
+        try:
+            exporter = Exporter(dataset, format, compress, start, end, campaign_id)
+            return True, exporter.run(path, resume=resume)
+        except ValueError as e:
+            return False, str(e)
+        except OSError as e:
+            return False, f"Could not write export file: {str(e)}"
+        except Exception as e:
+            return False, f"Export failed: {str(e)}"
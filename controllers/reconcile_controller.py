@@ -0,0 +1,22 @@
+# controllers/reconcile_controller.py
+from models.campaign_ledger import CampaignLedger
+
+class ReconcileController:
+    """Controller for checking campaign totals against the donations ledger"""
+    
+    @staticmethod
+    def reconcile(repair=False):
+        """Fold new donations into the verified totals and report (or repair) drift"""
+        try:
+            return True, CampaignLedger.reconcile(repair=repair)
+        except Exception as e:
+            return False, f"Reconciliation failed: {str(e)}"
+    
+    @staticmethod
+    def rebuild_ledger():
+        """Recompute the verified totals from scratch"""
+        try:
+            high_water = CampaignLedger.rebuild()
+            return True, f"Rebuilt campaign ledger up to donation {high_water}"
+        except Exception as e:
+            return False, f"Could not rebuild campaign ledger: {str(e)}"
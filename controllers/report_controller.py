@@ -0,0 +1,46 @@
+# controllers/report_controller.py
+from models.analytics import CampaignAnalytics
+
+class ReportController:
+    """Controller for campaign reporting"""
+    
+    @staticmethod
+    def top_campaigns(n=10, by="raised", days=7):
+        """Get the top campaigns by total raised or by recent velocity"""
+        try:
+            n = int(n)
+            if by == "raised":
+                return True, CampaignAnalytics.top_campaigns_by_raised(n)
+            if by == "velocity":
+                return True, CampaignAnalytics.top_campaigns_by_velocity(n, days=int(days))
+            return False, "Ranking must be 'raised' or 'velocity'"
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Could not build top campaigns report: {str(e)}"
+    
+    @staticmethod
+    def funded_distribution(active_only=True):
+        """Get how many campaigns fall in each funded-percentage band"""
+        try:
+            return True, CampaignAnalytics.funded_distribution(active_only)
+        except Exception as e:
+            return False, f"Could not build funding distribution: {str(e)}"
+    
+    @staticmethod
+    def inflow(period="day", by="campaign", start=None, end=None):
+        """Get daily or weekly inflow per campaign or organization"""
+        try:
+            return True, CampaignAnalytics.inflow(period, by, start, end)
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Could not build inflow report: {str(e)}"
+    
+    @staticmethod
+    def gift_size_stats(campaign_id=None, start=None, end=None):
+        """Get mean and median gift size, overall or for one campaign"""
+        try:
+            return True, CampaignAnalytics.gift_size_stats(campaign_id, start, end)
+        except Exception as e:
+            return False, f"Could not build gift size report: {str(e)}"
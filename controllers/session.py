@@ -0,0 +1,12 @@
+# controllers/session.py
+from models.base import Base
+
+
+def session():
+    """Context manager scoping model lookups to one user action
+    
+    A menu choice or batch command runs inside one, so a donor or campaign
+    looked up by id more than once in it is only loaded once. See
+    Base.session().
+    """
+    return Base.session()
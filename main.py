@@ -10,20 +10,21 @@ current_dir = Path(__file__).parent.absolute()
 sys.path.insert(0, str(current_dir))
 
 # here I'm trying to import the modules directly from the root directory- they're in the root directory
+from models.base import Base
 from models.donor import Donor
 from models.campaign import Campaign
 from models.donation import Donation
-from views.cli import CLI  
+from models.schema import Schema
+# Controllers and views are imported in main() so startup doesn't pay for
+# modules (like the NumPy reports) until they're needed
 
-def initialize_database():
+def initialize_database(sample_data=True):
     """Initialize the database and create sample data if needed"""
-    # Create tables
-    Donor.initialize()
-    Campaign.initialize()
-    Donation.initialize()
+    # Create or upgrade tables, a no-op when the schema is already current
+    Schema.migrate()
     
     # Checkingto see if I need to create sample data
-    if len(Donor.get_all()) == 0:
+    if sample_data and Donor.is_empty():
         create_sample_data()
 
 
@@ -58,14 +59,44 @@ def create_sample_data():
     
     print("Sample data created successfully!")
 
-def main():
-    """Main application entry point"""
+def main(argv=None):
+    """Main application entry point
     
-    initialize_database()
+    With no arguments this starts the interactive CLI, otherwise the
+    arguments are a batch command (see `python main.py --help`).
+    """
+    argv = sys.argv[1:] if argv is None else argv
     
-    # StartING THE CLI
-    cli = CLI()
-    cli.run()
+    # GIVECONNECT_DIAGNOSTICS=1 collects query statistics from startup,
+    # GIVECONNECT_SLOW_MS sets the slow-query log threshold
+    if os.environ.get("GIVECONNECT_DIAGNOSTICS"):
+        Base.query_stats.enable(
+            slow_ms=float(os.environ.get("GIVECONNECT_SLOW_MS", 100)),
+            explain=True
+        )
+    
+    try:
+        if argv:
+            # Batch mode: no sample data, so a fresh database stays empty and
+            # nothing but results goes to stdout
+            from views.batch import BatchCLI
+            initialize_database(sample_data=False)
+            return BatchCLI().run(argv)
+        
+        initialize_database()
+        
+        # StartING THE CLI
+        from views.cli import CLI
+        cli = CLI()
+        cli.run()
+        return 0
+    finally:
+        # Flush queued donations and close the pooled connections on the way
+        # out. Write-behind can only be on if the controller was loaded.
+        donations = sys.modules.get("controllers.donation_controller")
+        if donations is not None:
+            donations.DonationController.disable_write_behind()
+        Base.close_connections()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
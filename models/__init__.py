@@ -2,5 +2,8 @@
 from models.donor import Donor
 from models.campaign import Campaign
 from models.donation import Donation
+from models.donor_stats import DonorStats
+from models.campaign_ledger import CampaignLedger
+from models.schema import Schema
 
-__all__ = ['Donor', 'Campaign', 'Donation']
\ No newline at end of file
+__all__ = ['Donor', 'Campaign', 'Donation', 'DonorStats', 'CampaignLedger', 'Schema']
\ No newline at end of file
@@ -0,0 +1,294 @@
+# models/analytics.py
+from array import array
+from bisect import bisect_right
+from datetime import date, timedelta
+from decimal import Decimal
+from statistics import median
+
+from models.base import Base
+from models.campaign import Campaign
+from models.donation import Donation
+from models.money import from_cents, to_decimal
+
+try:
+    import numpy as np
+except ImportError:
+    # Everything still works without NumPy, just on plain arrays and loops
+    np = None
+
+EPOCH = date(1970, 1, 1)
+
+# Lower edges of the funded-percentage buckets
+FUNDED_BUCKETS = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+
+
+def day_to_date(day):
+    """Convert a day number (days since 1970-01-01) to a date"""
+    return EPOCH + timedelta(days=int(day))
+
+
+class DonationColumns:
+    """Donations held column-wise instead of as one dict per row
+    
+    campaign_id, amount (in cents) and day (days since 1970-01-01) are all
+    int64 columns, as NumPy arrays when available and array.array otherwise.
+    Sums over whole cents are exact, amounts only become Decimal at the end.
+    """
+    
+    def __init__(self, campaign_id, amount, day):
+        self.campaign_id = campaign_id
+        self.amount = amount
+        self.day = day
+    
+    def __len__(self):
+        return len(self.amount)
+
+
+class CampaignAnalytics:
+    """Campaign reporting computed over whole columns at a time"""
+    
+    # Rows pulled per fetchmany() while loading columns
+    CHUNK_SIZE = 10000
+    
+    @classmethod
+    def load_columns(cls, start=None, end=None, campaign_id=None):
+        """Load donations into columns, optionally limited to a date range"""
+        conditions = []
+        params = []
+        if start:
+            conditions.append("date >= ?")
+            params.append(str(start))
+        if end:
+            conditions.append("date < ?")
+            params.append(str(end))
+        if campaign_id is not None:
+            conditions.append("campaign_id = ?")
+            params.append(campaign_id)
+        
+        # Undated rows count as day 0, so every value is a plain integer
+        sql = (
+            "SELECT campaign_id, amount, COALESCE(CAST(strftime('%s', date) AS INTEGER) / 86400, 0) "
+            f"FROM {Donation.TABLE_NAME}"
+        )
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        
+        if np is not None:
+            # Each chunk goes straight into an (n, 3) int64 array in C, so
+            # there is no Python work per row beyond building the tuples
+            chunks = [np.array(rows, dtype=np.int64) for rows in cls._chunks(sql, params)]
+            table = np.concatenate(chunks) if chunks else np.empty((0, 3), dtype=np.int64)
+            return DonationColumns(
+                np.ascontiguousarray(table[:, 0]),
+                np.ascontiguousarray(table[:, 1]),
+                np.ascontiguousarray(table[:, 2])
+            )
+        
+        campaign_ids = array("q")
+        amounts = array("q")
+        days = array("q")
+        for rows in cls._chunks(sql, params):
+            for campaign, amount, day in rows:
+                campaign_ids.append(campaign)
+                amounts.append(amount)
+                days.append(day)
+        return DonationColumns(campaign_ids, amounts, days)
+    
+    @classmethod
+    def _chunks(cls, sql, params):
+        """Yield the rows of a query as tuples, CHUNK_SIZE at a time"""
+        with Base.reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(cls.CHUNK_SIZE)
+                if not rows:
+                    return
+                yield rows
+    
+    @staticmethod
+    def group_sum(keys, values):
+        """Sum values per distinct key, returns (keys, sums, counts) sorted by key"""
+        if np is not None:
+            keys = np.asarray(keys)
+            if len(keys) == 0:
+                return [], [], []
+            unique, inverse = np.unique(keys, return_inverse=True)
+            sums = np.bincount(inverse, weights=values)
+            if np.asarray(values).dtype.kind == "i":
+                # bincount adds in float64, which is exact for whole numbers
+                # below 2**53 (cents, so some 90 trillion dollars)
+                sums = sums.round().astype(np.int64)
+            counts = np.bincount(inverse)
+            return unique.tolist(), sums.tolist(), counts.tolist()
+        
+        sums = {}
+        counts = {}
+        for key, value in zip(keys, values):
+            sums[key] = sums.get(key, 0) + value
+            counts[key] = counts.get(key, 0) + 1
+        unique = sorted(sums)
+        return unique, [sums[key] for key in unique], [counts[key] for key in unique]
+    
+    @classmethod
+    def _campaigns(cls):
+        """Campaign id -> row for every campaign (campaigns are few)"""
+        sql = f"SELECT id, name, organization, goal_amount, current_amount FROM {Campaign.TABLE_NAME}"
+        return {row["id"]: row for row in Campaign.execute_custom_query(sql)}
+    
+    @classmethod
+    def _top(cls, keys, values, n):
+        """The n (key, value) pairs with the largest values"""
+        if np is not None and len(values):
+            values = np.asarray(values)
+            order = np.argsort(-values, kind="stable")[:n]
+            return [(keys[i], values[i].item()) for i in order]
+        return sorted(zip(keys, values), key=lambda pair: -pair[1])[:n]
+    
+    @classmethod
+    def top_campaigns_by_raised(cls, n=10):
+        """Campaigns that have raised the most overall"""
+        columns = cls.load_columns()
+        keys, sums, counts = cls.group_sum(columns.campaign_id, columns.amount)
+        campaigns = cls._campaigns()
+        count_by_id = dict(zip(keys, counts))
+        
+        return [
+            {
+                "campaign_id": campaign_id,
+                "name": campaigns[campaign_id]["name"] if campaign_id in campaigns else None,
+                "raised": from_cents(raised),
+                "donations": count_by_id[campaign_id]
+            }
+            for campaign_id, raised in cls._top(keys, sums, n)
+        ]
+    
+    @classmethod
+    def top_campaigns_by_velocity(cls, n=10, days=7, as_of=None):
+        """Campaigns raising the most per day over the last `days` days"""
+        as_of = as_of or date.today()
+        start = as_of - timedelta(days=days - 1)
+        columns = cls.load_columns(start=start, end=as_of + timedelta(days=1))
+        keys, sums, counts = cls.group_sum(columns.campaign_id, columns.amount)
+        campaigns = cls._campaigns()
+        
+        return [
+            {
+                "campaign_id": campaign_id,
+                "name": campaigns[campaign_id]["name"] if campaign_id in campaigns else None,
+                "raised": from_cents(raised),
+                # Rounded to the nearest cent
+                "per_day": from_cents((raised + days // 2) // days)
+            }
+            for campaign_id, raised in cls._top(keys, sums, n)
+        ]
+    
+    @classmethod
+    def funded_distribution(cls, active_only=True):
+        """Number of campaigns in each 10% band of funding progress"""
+        sql = f"SELECT goal_amount, COALESCE(current_amount, 0) FROM {Campaign.TABLE_NAME} WHERE goal_amount > 0"
+        if active_only:
+            sql += " AND active = 1"
+        with Base.reading() as conn:
+            rows = conn.execute(sql).fetchall()
+        
+        # Whole percents in integer math, rounded down so 99.9% isn't "100%+"
+        if np is not None:
+            values = np.array(rows, dtype=np.int64).reshape(-1, 2)
+            percents = values[:, 1] * 100 // values[:, 0]
+            edges = FUNDED_BUCKETS + [float("inf")]
+            counts = np.histogram(percents, bins=edges)[0].tolist()
+        else:
+            counts = [0] * len(FUNDED_BUCKETS)
+            for goal, current in rows:
+                index = bisect_right(FUNDED_BUCKETS, current * 100 // goal) - 1
+                counts[max(index, 0)] += 1
+        
+        labels = [f"{low}-{low + 10}%" for low in FUNDED_BUCKETS[:-1]] + ["100%+"]
+        return [{"bucket": label, "campaigns": count} for label, count in zip(labels, counts)]
+    
+    @classmethod
+    def inflow(cls, period="day", by="campaign", start=None, end=None):
+        """Amount raised per period ("day" or "week") per campaign or organization
+        
+        Returns rows sorted by group then period, weeks start on Monday.
+        """
+        if period not in ("day", "week"):
+            raise ValueError("Period must be 'day' or 'week'")
+        if by not in ("campaign", "organization"):
+            raise ValueError("Group must be 'campaign' or 'organization'")
+        
+        columns = cls.load_columns(start=start, end=end)
+        if len(columns) == 0:
+            return []
+        campaigns = cls._campaigns()
+        
+        # Day 0 (1970-01-01) was a Thursday, shift by 3 so weeks start Monday
+        if np is not None:
+            periods = columns.day if period == "day" else (columns.day + 3) // 7
+        else:
+            periods = columns.day if period == "day" else array("q", ((day + 3) // 7 for day in columns.day))
+        
+        if by == "campaign":
+            groups = columns.campaign_id
+            names = {campaign_id: row["name"] for campaign_id, row in campaigns.items()}
+        else:
+            organizations = sorted({row["organization"] for row in campaigns.values()})
+            index = {name: i for i, name in enumerate(organizations)}
+            names = dict(enumerate(organizations))
+            lookup = [0] * (max(campaigns, default=0) + 1)
+            for campaign_id, row in campaigns.items():
+                lookup[campaign_id] = index[row["organization"]]
+            if np is not None:
+                groups = np.asarray(lookup, dtype=np.int64)[columns.campaign_id]
+            else:
+                groups = array("q", (lookup[campaign_id] for campaign_id in columns.campaign_id))
+        
+        # Pack (group, period) into one integer key so a single grouping pass does it
+        if np is not None:
+            low = int(periods.min())
+            span = int(periods.max()) - low + 1
+            keys = groups * span + (periods - low)
+        else:
+            low = min(periods)
+            span = max(periods) - low + 1
+            keys = [group * span + (p - low) for group, p in zip(groups, periods)]
+        
+        keys, sums, counts = cls.group_sum(keys, columns.amount)
+        
+        results = []
+        for key, total, count in zip(keys, sums, counts):
+            group, offset = divmod(int(key), span)
+            number = low + offset
+            first_day = number if period == "day" else number * 7 - 3
+            results.append({
+                by: names.get(group, group),
+                "period_start": day_to_date(first_day).isoformat(),
+                "amount": from_cents(total),
+                "donations": count
+            })
+        return results
+    
+    @classmethod
+    def gift_size_stats(cls, campaign_id=None, start=None, end=None):
+        """Count, total, mean and median donation size"""
+        columns = cls.load_columns(start=start, end=end, campaign_id=campaign_id)
+        count = len(columns)
+        if count == 0:
+            zero = Decimal("0.00")
+            return {"count": 0, "total": zero, "mean": zero, "median": zero}
+        
+        if np is not None:
+            total = int(columns.amount.sum())
+            middle = np.median(columns.amount).item()
+        else:
+            total = sum(columns.amount)
+            middle = median(columns.amount)
+        
+        # The median of an even count can land on half a cent, round it
+        return {
+            "count": count,
+            "total": from_cents(total),
+            "mean": from_cents((total + count // 2) // count),
+            "median": to_decimal(Decimal(str(middle)).scaleb(-2))
+        }
@@ -1,20 +1,322 @@
 # models/base.py
+import base64
+import json
 import sqlite3
 import os
+import threading
+from contextlib import contextmanager
+from urllib.request import pathname2url
+from models.cache import ModelCache
+from models.connection import ConnectionManager
+from models.instrumentation import stats
+from models.money import from_cents
+from models.rows import RowBase, row_class
 
 class Base:
     """Base model class that provides common ORM functionality"""
     
-    DB_PATH = "giveconnect.db"
+    # GIVECONNECT_DB picks another database for the whole process, ":memory:"
+    # for a throwaway in-memory one. Base.configure() changes it later.
+    DB_PATH = ConnectionManager.resolve(os.environ.get("GIVECONNECT_DB") or "giveconnect.db")
     TABLE_NAME = None
     COLUMNS = []
+    # Secondary indexes as (index_name, "column list") pairs, for example
+    # ("idx_donations_donor_date", "donor_id, date DESC")
+    INDEXES = []
+    
+    # How query rows are returned: "dict" (default), "slots" for compact
+    # per-model __slots__ rows, or "sqlite" for sqlite3.Row. All three
+    # support row['column'] access.
+    ROW_FACTORY = "dict"
+    # Rows pulled per fetchmany() call by the streaming iterators
+    FETCH_SIZE = 500
+    
+    # Columns holding money as whole cents. Query results with these names
+    # come back as Decimal amounts, see models/money.py.
+    MONEY_COLUMNS = frozenset({"amount", "goal_amount", "current_amount", "total_donated", "verified_amount"})
+    
+    # Shared by every model so they all reuse the same per-thread connection
+    connections = ConnectionManager()
+    # SQL text for the generic CRUD statements, built once per model and
+    # column set by statement()
+    _statements = {}
+    
+    # Statement timings, slow-query log and connection/commit counters
+    query_stats = stats
+    
+    # Read-through cache for single-record lookups, see cached()
+    cache = ModelCache()
+    # Tables written inside the current thread's transaction
+    _dirty = threading.local()
+    # The current thread's identity map while a session is open, see session()
+    _identity = threading.local()
+    
+    # Most ? placeholders put in one statement, well under SQLite's
+    # bound-variable limit (999 on older builds)
+    MAX_VARIABLES = 900
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Generate the model's compact row class up front
+        if cls.TABLE_NAME:
+            cls.row_class()
+    
+    @classmethod
+    def get_connection(cls):
+        """Get the connection for this thread: the writer inside a
+        transaction, a read-only connection otherwise. Run queries inside
+        reading() so they are isolated on an in-memory database too."""
+        return cls.connections.get(cls.DB_PATH)
+    
+    @classmethod
+    def reading(cls):
+        """Hold the connection to read with for a block, see ConnectionManager.reading()"""
+        return cls.connections.reading(cls.DB_PATH)
+    
+    @classmethod
+    def configure_connections(cls, cached_statements=None, **pragmas):
+        """Override connection pragmas (e.g. cache_size=-64000) and the
+        size of each connection's prepared-statement cache"""
+        cls.connections.configure(cached_statements, **pragmas)
+    
+    @classmethod
+    def close_connections(cls):
+        """Close all pooled connections, called once on shutdown"""
+        cls.connections.close_all()
+    
+    @classmethod
+    def configure(cls, db_path):
+        """Point every model at another database, returns the path in use
+        
+        ":memory:" gives a new, empty in-memory database each call, so
+        tests don't share state. Open connections, cached reads, identity
+        maps and whatever models remember about the old database (see
+        reset()) are dropped; call this before other threads start using
+        the models.
+        """
+        cls.connections.close_all()
+        cls.cache.clear()
+        Base._identity = threading.local()
+        cls._reset_models()
+        Base.DB_PATH = ConnectionManager.resolve(db_path)
+        return Base.DB_PATH
+    
+    @classmethod
+    def reset(cls):
+        """Forget any state kept about the current database, called by
+        configure() and after a rollback. Models that remember things
+        override this."""
+    
+    @staticmethod
+    def _reset_models():
+        models = Base.__subclasses__()
+        while models:
+            model = models.pop()
+            model.reset()
+            models.extend(model.__subclasses__())
+    
+    @classmethod
+    def snapshot(cls, path):
+        """Copy the current database to the file at path with the backup API
+        
+        The copy is consistent, taken while holding the writer so no
+        transaction commits halfway through it.
+        """
+        with cls.connections.writing(cls.DB_PATH) as conn:
+            target = sqlite3.connect(path)
+            try:
+                conn.backup(target)
+            finally:
+                target.close()
+        return path
+    
+    @classmethod
+    def restore(cls, path, db_path=":memory:"):
+        """Load a snapshot into db_path (a new in-memory database by default)
+        and point every model at it, returns the path in use
+        
+        Build a big fixture database once, e.g. with benchmarks.generate,
+        then restore it per test or benchmark run in milliseconds instead
+        of regenerating it.
+        """
+        if not os.path.exists(path):
+            raise ValueError(f"Snapshot not found: {path}")
+        
+        db_path = cls.configure(db_path)
+        source = sqlite3.connect(f"file:{pathname2url(os.path.abspath(path))}?mode=ro", uri=True)
+        try:
+            with cls.connections.writing(db_path) as conn:
+                source.backup(conn)
+        finally:
+            source.close()
+        return db_path
+    
+    @classmethod
+    def set_cache(cls, cache):
+        """Swap the cache used by every model (NullCache() turns it off)"""
+        Base.cache = cache
+    
+    @classmethod
+    def cached(cls, name, args, loader):
+        """Return loader() through the model cache
+        
+        Entries are keyed by table, lookup name and arguments. A copy is
+        returned so callers can modify the result without corrupting the
+        cached value.
+        """
+        cls.check_data_version()
+        key = (cls.TABLE_NAME, name) + tuple(args)
+        found, value = cls.cache.get(key)
+        if not found:
+            generation = cls.cache.generation(cls.TABLE_NAME)
+            value = loader()
+            cls.cache.set(key, value, generation)
+        return _copy(value)
+    
+    @classmethod
+    def check_data_version(cls):
+        """Clear the cache if another process has committed since the last look
+        
+        invalidate() only hears about writes made through this process's
+        models. The writer's PRAGMA data_version changes whenever a different
+        connection commits, and every local write goes through the writer,
+        so a change means a batch command or a second CLI wrote the file.
+        Checked here when the writer is free and at the start of every
+        transaction; our own commits don't touch the cache.
+        """
+        lock = cls.connections.write_lock(cls.DB_PATH)
+        if lock.acquire(blocking=False):
+            try:
+                cls._note_data_version(cls.connections.writer(cls.DB_PATH))
+            finally:
+                lock.release()
+    
+    @classmethod
+    def _note_data_version(cls, conn):
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        seen = getattr(conn, "seen_data_version", None)
+        if seen != version:
+            if seen is not None:
+                cls.cache.clear()
+            conn.seen_data_version = version
+    
+    @classmethod
+    def invalidate(cls, *tables):
+        """Drop cached reads for tables that are being written
+        
+        Called before the write and again after the surrounding transaction
+        ends, so no reader can cache a value that is about to go stale.
+        """
+        tables = tables or (cls.TABLE_NAME,)
+        pending = getattr(cls._dirty, "tables", None)
+        for table in tables:
+            cls.cache.invalidate(table)
+            cls._forget(table)
+            if pending is not None:
+                pending.add(table)
+    
+    @classmethod
+    @contextmanager
+    def session(cls):
+        """Scope an identity map to a block, e.g. one CLI action or controller call
+        
+        Inside it find_by_id() and find_by_ids() hand back the row already
+        loaded for an id instead of querying again, the same object each
+        time. Writing a table drops its rows from the map. Sessions are per
+        thread, and a nested session shares the outer one's map.
+        """
+        if getattr(Base._identity, "rows", None) is not None:
+            yield
+            return
+        
+        Base._identity.rows = {}
+        try:
+            yield
+        finally:
+            Base._identity.rows = None
+    
+    @classmethod
+    def _identity_map(cls):
+        """This table's {id: row} map in the open session, or None outside one"""
+        rows = getattr(Base._identity, "rows", None)
+        if rows is None:
+            return None
+        return rows.setdefault(cls.TABLE_NAME, {})
+    
+    @classmethod
+    def _forget(cls, table):
+        rows = getattr(Base._identity, "rows", None)
+        if rows:
+            rows.pop(table, None)
+    
+    @classmethod
+    @contextmanager
+    def transaction(cls):
+        """Run a block of statements as one atomic transaction
+        
+        Yields a cursor. Nested calls run as a savepoint inside the outer
+        transaction, so model methods can be composed without committing
+        halfway through and a failing inner step only undoes its own work.
+        
+        Runs on the single writer connection, held until the transaction
+        ends, so writers from other threads queue up here instead of
+        fighting over SQLite's lock.
+        """
+        with cls.connections.writing(cls.DB_PATH) as conn:
+            cursor = conn.cursor()
+            
+            if conn.in_transaction:
+                cursor.execute("SAVEPOINT nested")
+                try:
+                    yield cursor
+                except BaseException:
+                    cursor.execute("ROLLBACK TO nested")
+                    cursor.execute("RELEASE nested")
+                    cls._reset_models()
+                    raise
+                else:
+                    cursor.execute("RELEASE nested")
+                return
+            
+            cls._dirty.tables = set()
+            cls.connections.begin(conn)
+            cls._note_data_version(conn)
+            try:
+                yield cursor
+            except BaseException:
+                conn.rollback()
+                stats.record_commit(committed=False)
+                # Whatever a model learned inside the transaction may be gone
+                cls._reset_models()
+                raise
+            else:
+                conn.commit()
+                stats.record_commit()
+            finally:
+                for table in cls._dirty.tables:
+                    cls.cache.invalidate(table)
+                    cls._forget(table)
+                cls._dirty.tables = None
+    
+    @classmethod
+    @contextmanager
+    def foreign_keys_off(cls):
+        """Turn foreign key checks off for a block that rebuilds or moves tables
+        
+        SQLite ignores the pragma inside a transaction, so this has to wrap
+        the whole transaction.
+        """
+        with cls.connections.writing(cls.DB_PATH) as conn:
+            enabled = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+            conn.execute("PRAGMA foreign_keys = OFF")
+            try:
+                yield
+            finally:
+                conn.execute(f"PRAGMA foreign_keys = {enabled}")
     
     @classmethod
     def create_table(cls):
         """Create the table if it doesn't exist"""
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
-        
         # Build the table scheme using columns columns
         columns_def = ", ".join(cls.COLUMNS)
         create_table_sql = f"""
@@ -24,101 +326,366 @@ class Base:
         )
         """
         
-        cursor.execute(create_table_sql)
-        conn.commit()
-        conn.close()
+        # In a transaction so it can run as one step of a schema migration
+        with cls.transaction() as cursor:
+            cursor.execute(create_table_sql)
+    
+    @classmethod
+    def table_exists(cls, name=None):
+        """Check whether the model's table (or another named table) has been created"""
+        sql = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?"
+        return cls._scalar(sql, (name or cls.TABLE_NAME,)) is not None
+    
+    @classmethod
+    def is_empty(cls):
+        """Check whether the table has no rows, without counting or loading them"""
+        return cls._scalar(f"SELECT 1 FROM {cls.TABLE_NAME} LIMIT 1") is None
+    
+    @classmethod
+    def create_indexes(cls):
+        """Create any declared index that doesn't exist yet"""
+        with cls.transaction() as cursor:
+            for index_name, columns in cls.INDEXES:
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} "
+                    f"ON {cls.TABLE_NAME} ({columns})"
+                )
+    
+    @classmethod
+    def drop_indexes(cls):
+        """Drop the declared indexes, e.g. before a very large load"""
+        with cls.transaction() as cursor:
+            for index_name, _ in cls.INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+    
+    @classmethod
+    def statement(cls, kind, columns=()):
+        """Get the SQL for one of the generic CRUD statements
+        
+        kind is "insert" (for the given column names), "select_all",
+        "select_by_id", "delete_by_id", or "ids_in" and "select_in"
+        (columns is then the number of ids). The text is built once per
+        model and reused, which saves rebuilding the string on every call.
+        It doesn't change what SQLite does: the connection's statement
+        cache is keyed by the SQL text, so rebuilt but identical SQL hits it
+        just the same (see benchmarks/bench_insert.py).
+        """
+        key = (cls.TABLE_NAME, kind, columns)
+        sql = Base._statements.get(key)
+        if sql is None:
+            table = cls.TABLE_NAME
+            if kind == "insert":
+                sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})"
+            elif kind == "select_all":
+                sql = f"SELECT * FROM {table}"
+            elif kind == "select_by_id":
+                sql = f"SELECT * FROM {table} WHERE id = ?"
+            elif kind == "delete_by_id":
+                sql = f"DELETE FROM {table} WHERE id = ?"
+            elif kind == "ids_in":
+                sql = f"SELECT id FROM {table} WHERE id IN ({', '.join(['?'] * columns)})"
+            elif kind == "select_in":
+                sql = f"SELECT * FROM {table} WHERE id IN ({', '.join(['?'] * columns)})"
+            else:
+                raise ValueError(f"Unknown statement kind: {kind}")
+            Base._statements[key] = sql
+        return sql
     
     @classmethod
     def create(cls, **kwargs):
         """Create a new record in the database"""
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
-        
-        # Extract column names and values
-        columns = list(kwargs.keys())
+        sql = cls.statement("insert", tuple(kwargs))
         values = list(kwargs.values())
         
-        # Build the SQL query
-        columns_str = ", ".join(columns)
-        placeholders = ", ".join(["?"] * len(columns))
-        
-        sql = f"INSERT INTO {cls.TABLE_NAME} ({columns_str}) VALUES ({placeholders})"
-        
-        cursor.execute(sql, values)
-        conn.commit()
-        last_id = cursor.lastrowid
-        conn.close()
+        with cls.transaction() as cursor:
+            cls.invalidate()
+            cursor.execute(sql, values)
+            last_id = cursor.lastrowid
         
         return last_id
     
     @classmethod
     def delete(cls, record_id):
         """Delete a record by ID"""
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
+        sql = cls.statement("delete_by_id")
         
-        sql = f"DELETE FROM {cls.TABLE_NAME} WHERE id = ?"
-        
-        cursor.execute(sql, (record_id,))
-        rows_affected = cursor.rowcount
-        conn.commit()
-        conn.close()
+        with cls.transaction() as cursor:
+            cls.invalidate()
+            cursor.execute(sql, (record_id,))
+            rows_affected = cursor.rowcount
         
         return rows_affected > 0
     
     @classmethod
-    def get_all(cls):
-        """Get all records"""
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
+    def existing_ids(cls, ids, cursor=None):
+        """Return the subset of ids that exist in this table"""
+        ids = list(set(ids))
+        if cursor is None:
+            with cls.reading() as conn:
+                return cls.existing_ids(ids, conn.cursor())
         
-        sql = f"SELECT * FROM {cls.TABLE_NAME}"
+        found = set()
+        for start in range(0, len(ids), cls.MAX_VARIABLES):
+            chunk = ids[start:start + cls.MAX_VARIABLES]
+            sql = cls.statement("ids_in", len(chunk))
+            cursor.execute(sql, chunk)
+            found.update(row[0] for row in cursor.fetchall())
         
-        cursor.execute(sql)
-        rows = cursor.fetchall()
-        conn.close()
+        return found
+    
+    @classmethod
+    def all_ids(cls):
+        """Every id in this table as a set, for checking many rows in memory"""
+        with cls.reading() as conn:
+            return {row[0] for row in conn.execute(f"SELECT id FROM {cls.TABLE_NAME}")}
+    
+    @classmethod
+    def column_names(cls):
+        """Names of the table's columns in SELECT * order"""
+        names = ["id"]
+        for definition in cls.COLUMNS:
+            name = definition.split()[0]
+            if name.upper() not in ("FOREIGN", "PRIMARY", "UNIQUE", "CHECK", "CONSTRAINT"):
+                names.append(name)
+        return names
+    
+    @classmethod
+    def row_class(cls):
+        """The __slots__ row class generated from this model's COLUMNS"""
+        return row_class(cls.column_names(), f"{cls.__name__}Row")
+    
+    @classmethod
+    def _cursor(cls):
+        """Get a cursor set up for the configured row factory"""
+        cursor = cls.get_connection().cursor()
+        if cls.ROW_FACTORY == "sqlite":
+            cursor.row_factory = sqlite3.Row
+        return cursor
+    
+    @classmethod
+    def _converter(cls, cursor):
+        """Build the function that turns raw tuples from this cursor into rows
         
-        # Convert rows to dictionaries
-        columns = [column[0] for column in cursor.description]
-        results = []
-        for row in rows:
-            results.append(dict(zip(columns, row)))
+        Column names are read from the cursor description once per query,
+        not once per row. Money columns are turned from cents into Decimal
+        on the way.
+        """
+        columns = tuple(column[0] for column in cursor.description)
+        money = [i for i, name in enumerate(columns) if name in cls.MONEY_COLUMNS]
+        
+        def values(row):
+            row = list(row)
+            for i in money:
+                row[i] = from_cents(row[i])
+            return row
+        
+        if cls.ROW_FACTORY == "sqlite":
+            if not money:
+                return None
+            return lambda row: sqlite3.Row(cursor, tuple(values(row)))
+        
+        if cls.ROW_FACTORY == "slots":
+            klass = row_class(columns)
+            if klass is not None:
+                if money:
+                    return lambda row: klass(*values(row))
+                return lambda row: klass(*row)
         
-        return results
+        if money:
+            return lambda row: dict(zip(columns, values(row)))
+        return lambda row: dict(zip(columns, row))
+    
+    @classmethod
+    def _query(cls, sql, params=()):
+        """Run a query and return all rows"""
+        with cls.reading():
+            cursor = cls._cursor()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        
+        convert = cls._converter(cursor)
+        if convert is None:
+            return rows
+        return [convert(row) for row in rows]
+    
+    @classmethod
+    def _query_one(cls, sql, params=()):
+        """Run a query and return the first row or None"""
+        with cls.reading():
+            cursor = cls._cursor()
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        
+        if row is None:
+            return None
+        convert = cls._converter(cursor)
+        return row if convert is None else convert(row)
+    
+    @classmethod
+    def _scalar(cls, sql, params=()):
+        """Run a query and return the first column of the first row (as stored, so money is in cents)"""
+        with cls.reading() as conn:
+            row = conn.execute(sql, params).fetchone()
+        return row[0] if row else None
+    
+    @classmethod
+    def iter_query(cls, sql, params=(), chunk_size=None):
+        """Stream the rows of a query without loading them all in memory
+        
+        Rows are fetched in chunks of chunk_size (FETCH_SIZE by default) so
+        memory stays bounded however large the result is. The generator uses
+        its own cursor, so other queries can run while it is being consumed.
+        On an in-memory database writes from other threads wait until the
+        stream is finished (see reading()), so consume it on the thread that
+        started it.
+        """
+        chunk_size = chunk_size or cls.FETCH_SIZE
+        with cls.reading():
+            cursor = cls._cursor()
+            cursor.execute(sql, params)
+            convert = cls._converter(cursor)
+            
+            try:
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    if convert is None:
+                        yield from rows
+                    else:
+                        for row in rows:
+                            yield convert(row)
+            finally:
+                cursor.close()
+    
+    @classmethod
+    def iter_all(cls, chunk_size=None):
+        """Stream every record of the table in ID order"""
+        return cls.iter_query(f"SELECT * FROM {cls.TABLE_NAME} ORDER BY id", chunk_size=chunk_size)
+    
+    @classmethod
+    def get_all(cls):
+        """Get all records"""
+        return cls._query(cls.statement("select_all"))
     
     @classmethod
     def find_by_id(cls, record_id):
         """Find a record by its ID"""
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
+        # Same key as find_by_ids(), so "7" and 7 share a cache entry
+        record_id = int(record_id)
+        identity = cls._identity_map()
+        if identity is not None and record_id in identity:
+            return identity[record_id]
+        
+        sql = cls.statement("select_by_id")
+        row = cls.cached("id", (record_id,), lambda: cls._query_one(sql, (record_id,)))
+        if identity is not None:
+            identity[record_id] = row
+        return row
+    
+    @classmethod
+    def find_by_ids(cls, ids):
+        """Find many records at once, returns {id: row} for the ids that exist
         
-        sql = f"SELECT * FROM {cls.TABLE_NAME} WHERE id = ?"
+        One WHERE id IN (...) query per MAX_VARIABLES ids instead of a
+        find_by_id() per id. Inside a session, ids already loaded aren't
+        queried again.
+        """
+        ids = list(dict.fromkeys(int(record_id) for record_id in ids))
+        identity = cls._identity_map()
+        found = {}
+        wanted = ids
+        if identity is not None:
+            wanted = [record_id for record_id in ids if record_id not in identity]
+            found = {record_id: identity[record_id] for record_id in ids if identity.get(record_id) is not None}
         
-        cursor.execute(sql, (record_id,))
-        row = cursor.fetchone()
-        conn.close()
+        for start in range(0, len(wanted), cls.MAX_VARIABLES):
+            chunk = wanted[start:start + cls.MAX_VARIABLES]
+            for row in cls._query(cls.statement("select_in", len(chunk)), chunk):
+                found[row["id"]] = row
         
-        if row:
-            # Convert row to dictionary
-            columns = [column[0] for column in cursor.description]
-            return dict(zip(columns, row))
-        else:
-            return None
+        if identity is not None:
+            # Missing ids too, so they aren't looked up again either
+            for record_id in wanted:
+                identity[record_id] = found.get(record_id)
+        # In the order the ids were given
+        return {record_id: found[record_id] for record_id in ids if record_id in found}
             
     @classmethod
     def execute_custom_query(cls, sql, params=()):
         """Execute a custom SQL query"""
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
+        return cls._query(sql, params)
+    
+    @staticmethod
+    def encode_cursor(values):
+        """Turn the sort-key values of the last row on a page into an opaque cursor"""
+        raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+    
+    @staticmethod
+    def decode_cursor(cursor):
+        """Reverse encode_cursor"""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except (ValueError, TypeError):
+            raise ValueError("Invalid page cursor")
         
-        cursor.execute(sql, params)
-        rows = cursor.fetchall()
+        if not isinstance(values, list):
+            raise ValueError("Invalid page cursor")
+        return values
+    
+    @classmethod
+    def fetch_page(cls, select_sql, where=(), params=(), order_by=("date", "id"),
+                   keys=None, descending=True, limit=20, cursor=None):
+        """Run a keyset-paginated query and return (rows, next_cursor)
         
-        # Again Convert rows to dictionaries
-        columns = [column[0] for column in cursor.description]
-        results = []
-        for row in rows:
-            results.append(dict(zip(columns, row)))
-            
-        conn.close()
-        return results
\ No newline at end of file
+        order_by lists the SQL expressions that make up the sort key (the last
+        one must be unique, normally the id) and keys the matching column names
+        in the result rows. Instead of OFFSET, the next page starts strictly
+        after the cursor's key, so every page costs the same index seek no
+        matter how deep into the list it is. next_cursor is None on the last
+        page.
+        """
+        keys = keys or [expr.split(".")[-1] for expr in order_by]
+        conditions = list(where)
+        params = list(params)
+        
+        if cursor:
+            after = cls.decode_cursor(cursor)
+            if len(after) != len(order_by):
+                raise ValueError("Invalid page cursor")
+            op = "<" if descending else ">"
+            conditions.append(
+                f"({', '.join(order_by)}) {op} ({', '.join(['?'] * len(order_by))})"
+            )
+            params.extend(after)
+        
+        direction = "DESC" if descending else "ASC"
+        sql = select_sql
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY " + ", ".join(f"{expr} {direction}" for expr in order_by)
+        sql += " LIMIT ?"
+        # Fetch one extra row to learn whether there is another page
+        params.append(limit + 1)
+        
+        rows = cls.execute_custom_query(sql, params)
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = cls.encode_cursor(rows[-1][key] for key in keys)
+        
+        return rows, next_cursor
+
+
+def _copy(value):
+    """Shallow-copy a cached row or list of rows"""
+    if isinstance(value, list):
+        return [_copy(row) for row in value]
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, RowBase):
+        return type(value)(*value.values())
+    # None, scalars and immutable sqlite3.Row objects can be shared
+    return value
@@ -0,0 +1,107 @@
+# models/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+
+class ModelCache:
+    """Read-through cache for model lookups with LRU eviction and optional TTL
+    
+    Keys are tuples whose first item is the table name, so every entry for a
+    table can be dropped at once when that table is written to.
+    """
+    
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._generations = {}
+        # Bumped by clear(), so loads that started before it are rejected too
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key):
+        """Return (found, value) for key"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+    
+    def generation(self, table):
+        """Current write generation of a table, taken before loading a value"""
+        with self._lock:
+            return self._epoch, self._generations.get(table, 0)
+    
+    def set(self, key, value, generation=None):
+        """Store a value, unless its table was written to since generation
+        
+        This stops a slow reader from putting back a value that a concurrent
+        write has already invalidated.
+        """
+        with self._lock:
+            if generation is not None and (self._epoch, self._generations.get(key[0], 0)) != generation:
+                return
+            expires = time.monotonic() + self.ttl if self.ttl else None
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, table):
+        """Drop every entry for a table"""
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            for key in [key for key in self._entries if key[0] == table]:
+                del self._entries[key]
+    
+    def clear(self):
+        """Drop everything"""
+        with self._lock:
+            self._entries.clear()
+            self._epoch += 1
+    
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+class NullCache:
+    """Cache that never stores anything, used to switch caching off"""
+    
+    def get(self, key):
+        return False, None
+    
+    def generation(self, table):
+        return 0
+    
+    def set(self, key, value, generation=None):
+        pass
+    
+    def invalidate(self, table):
+        pass
+    
+    def clear(self):
+        pass
+    
+    def stats(self):
+        return {}
@@ -1,6 +1,8 @@
 # models/campaign.py
+import re
 import sqlite3
 from models.base import Base
+from models.money import to_cents
 
 class Campaign(Base):
     """Model representing a charitable campaign"""
@@ -9,95 +11,202 @@ class Campaign(Base):
     COLUMNS = [
         "name TEXT NOT NULL UNIQUE",
         "description TEXT NOT NULL",
-        "goal_amount REAL NOT NULL",
-        "current_amount REAL DEFAULT 0.0",
+        "goal_amount INTEGER NOT NULL",       # cents
+        "current_amount INTEGER DEFAULT 0",   # cents
         "organization TEXT NOT NULL",
         "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
         "active INTEGER DEFAULT 1"
     ]
+    INDEXES = [
+        ("idx_campaigns_active", "active")
+    ]
+    
+    # FTS5 index over the searchable text columns, an external-content table
+    # so the text itself is only stored once (in campaigns)
+    SEARCH_TABLE = "campaigns_fts"
+    SEARCH_COLUMNS = ("name", "description", "organization")
+    # bm25 column weights, a hit in the name counts most
+    SEARCH_WEIGHTS = (10.0, 1.0, 5.0)
     
     @classmethod
     def initialize(cls):
         """Initialize the campaign table"""
         cls.create_table()
+        cls.create_indexes()
     
     @classmethod
     def create(cls, name, description, goal_amount, organization):
-        """Create a new campaign with validation"""
+        """Create a new campaign with validation (goal_amount as a Decimal or string)"""
         # Validate goal amount
+        goal_amount = to_cents(goal_amount)
         if goal_amount <= 0:
             raise ValueError("Goal amount must be greater than zero")
-            
+        
         # Check if the campaign name already exists before 
         if cls.find_by_name(name):
             raise ValueError("Campaign name already exists")
-            
+        
         # Create the campaign
         return super().create(
             name=name, 
             description=description, 
             goal_amount=goal_amount,
-            current_amount=0.0,
+            current_amount=0,
             organization=organization
         )
     
     @classmethod
     def find_by_name(cls, name):
         """Find a campaign by name"""
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
-        
         sql = f"SELECT * FROM {cls.TABLE_NAME} WHERE name = ?"
         
-        cursor.execute(sql, (name,))
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            # Convert row to dictionary
-            columns = [column[0] for column in cursor.description]
-            return dict(zip(columns, row))
-        else:
-            return None
+        return cls.cached("name", (name,), lambda: cls._query_one(sql, (name,)))
     
     @classmethod
     def get_active_campaigns(cls):
         """Get all active campaigns"""
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
-        
         sql = f"SELECT * FROM {cls.TABLE_NAME} WHERE active = 1"
         
-        cursor.execute(sql)
-        rows = cursor.fetchall()
-        conn.close()
+        return cls.cached("active", (), lambda: cls._query(sql))
+    
+    @classmethod
+    def get_active_campaigns_page(cls, limit=20, cursor=None):
+        """Get one page of active campaigns in ID order"""
+        return cls.fetch_page(
+            f"SELECT * FROM {cls.TABLE_NAME}",
+            where=["active = 1"],
+            order_by=("id",),
+            descending=False,
+            limit=limit,
+            cursor=cursor
+        )
+    
+    @classmethod
+    def fts_available(cls):
+        """Check whether this SQLite build has the FTS5 module"""
+        try:
+            with cls.transaction() as cursor:
+                cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+                cursor.execute("DROP TABLE temp.fts5_probe")
+            return True
+        except sqlite3.OperationalError:
+            return False
+    
+    @classmethod
+    def create_search_index(cls):
+        """Create the full-text index and the triggers that keep it in sync
+        
+        Returns False (and does nothing) when FTS5 isn't compiled in, search
+        then falls back to a LIKE scan.
+        """
+        if not cls.fts_available():
+            return False
         
+        fts = cls.SEARCH_TABLE
+        columns = ", ".join(cls.SEARCH_COLUMNS)
+        new_values = ", ".join(f"NEW.{column}" for column in cls.SEARCH_COLUMNS)
+        old_values = ", ".join(f"OLD.{column}" for column in cls.SEARCH_COLUMNS)
         
-        columns = [column[0] for column in cursor.description]
-        results = []
-        for row in rows:
-            results.append(dict(zip(columns, row)))
+        with cls.transaction() as cursor:
+            existed = cls.table_exists(fts)
+            cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts}
+            USING fts5({columns}, content='{cls.TABLE_NAME}', content_rowid='id')
+            """)
+            
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {cls.TABLE_NAME}
+            BEGIN
+                INSERT INTO {fts} (rowid, {columns}) VALUES (NEW.id, {new_values});
+            END
+            """)
+            
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {cls.TABLE_NAME}
+            BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {columns}) VALUES ('delete', OLD.id, {old_values});
+            END
+            """)
             
-        return results
+            # current_amount changes on every donation, so only fire for text columns
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {columns} ON {cls.TABLE_NAME}
+            BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {columns}) VALUES ('delete', OLD.id, {old_values});
+                INSERT INTO {fts} (rowid, {columns}) VALUES (NEW.id, {new_values});
+            END
+            """)
+            
+            # Index the campaigns that were there before the index
+            if not existed:
+                cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+        return True
     
     @classmethod
-    def update_current_amount(cls, campaign_id, amount):
-        """Update the current amount of a campaign"""
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
+    def search(cls, query, active_only=True, limit=20, cursor=None):
+        """Search campaign name, description and organization, best matches first
         
-        sql = f"UPDATE {cls.TABLE_NAME} SET current_amount = current_amount + ? WHERE id = ?"
+        Every word in the query must match as a word prefix ("wat edu" finds
+        "Water Education"). Returns (rows, next_cursor) like fetch_page, each
+        row with a score where lower is better.
+        """
+        words = re.findall(r"\w+", query or "")
+        if not words:
+            return [], None
+        
+        if cls.table_exists(cls.SEARCH_TABLE):
+            fts = cls.SEARCH_TABLE
+            weights = ", ".join(str(weight) for weight in cls.SEARCH_WEIGHTS)
+            # Quote every word so FTS5 query syntax in the input is just text
+            params = [" ".join(f'"{word}"*' for word in words)]
+            matches = f"""
+            SELECT c.*, bm25({fts}, {weights}) AS score
+            FROM {fts} JOIN {cls.TABLE_NAME} c ON c.id = {fts}.rowid
+            WHERE {fts} MATCH ?
+            """
+        else:
+            # No FTS5, so scan with LIKE and rank name hits over organization
+            # hits over description-only hits
+            patterns = ["%" + word.replace("_", r"\_") + "%" for word in words]
+            like = "{} LIKE ? ESCAPE '\\'"
+            score = " + ".join(
+                f"(CASE WHEN {like.format('c.name')} THEN 0 WHEN {like.format('c.organization')} THEN 1 ELSE 2 END)"
+                for _ in patterns
+            )
+            conditions = " AND ".join(
+                "(" + " OR ".join(like.format(f"c.{column}") for column in cls.SEARCH_COLUMNS) + ")"
+                for _ in patterns
+            )
+            params = [pattern for pattern in patterns for _ in range(2)]
+            params += [pattern for pattern in patterns for _ in cls.SEARCH_COLUMNS]
+            matches = f"SELECT c.*, {score} AS score FROM {cls.TABLE_NAME} c WHERE {conditions}"
+        
+        if active_only:
+            matches += " AND c.active = 1"
         
-        cursor.execute(sql, (amount, campaign_id))
-        conn.commit()
-        conn.close()
+        # Page over the ranked matches with (score, id) as the sort key
+        return cls.fetch_page(
+            f"SELECT * FROM ({matches})",
+            params=params,
+            order_by=("score", "id"),
+            descending=False,
+            limit=limit,
+            cursor=cursor
+        )
+    
+    @classmethod
+    def update_current_amount(cls, campaign_id, amount):
+        """Add amount (a Decimal) to the current amount of a campaign"""
+        sql = f"UPDATE {cls.TABLE_NAME} SET current_amount = current_amount + ? WHERE id = ?"
         
+        with cls.transaction() as cursor:
+            cls.invalidate()
+            cursor.execute(sql, (to_cents(amount), campaign_id))
+            return cursor.rowcount > 0
+    
     @classmethod
     def get_campaign_donors(cls, campaign_id):
         """Get all donors for a campaign"""
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
-        
         sql = """
         SELECT d.id, d.donor_id, donors.name as donor_name, d.amount, d.date
         FROM donations d
@@ -106,14 +215,20 @@ class Campaign(Base):
         ORDER BY d.date DESC
         """
         
-        cursor.execute(sql, (campaign_id,))
-        rows = cursor.fetchall()
-        conn.close()
-        
-        
-        columns = [column[0] for column in cursor.description]
-        results = []
-        for row in rows:
-            results.append(dict(zip(columns, row)))
-            
-        return results
\ No newline at end of file
+        return cls._query(sql, (campaign_id,))
+    
+    @classmethod
+    def get_campaign_donors_page(cls, campaign_id, limit=20, cursor=None):
+        """Get one page of donors for a campaign, newest donation first"""
+        return cls.fetch_page(
+            """
+            SELECT d.id, d.donor_id, donors.name as donor_name, d.amount, d.date
+            FROM donations d
+            JOIN donors ON d.donor_id = donors.id
+            """,
+            where=["d.campaign_id = ?"],
+            params=[campaign_id],
+            order_by=("d.date", "d.id"),
+            limit=limit,
+            cursor=cursor
+        )
@@ -0,0 +1,204 @@
+# models/campaign_ledger.py
+from datetime import datetime
+from models.base import Base
+from models.campaign import Campaign
+from models.money import from_cents, to_cents
+from models.partitions import DonationPartitions
+
+
+class CampaignLedger(Base):
+    """Verified per-campaign totals, built from the donations ledger
+    
+    campaigns.current_amount is a running total bumped on every donation and
+    can drift (donations deleted without touching it, manual edits). This
+    table holds the totals as recomputed from the donations themselves.
+    reconcile() only reads donations above the high-water mark, plus the
+    adjustments that triggers log when an already-counted donation is
+    deleted or changed, so each run costs about as much as the new activity.
+    """
+    
+    TABLE_NAME = "campaign_ledger"
+    COLUMNS = [
+        "campaign_id INTEGER NOT NULL UNIQUE",
+        "verified_amount INTEGER NOT NULL DEFAULT 0",   # cents
+        "donation_count INTEGER NOT NULL DEFAULT 0"
+    ]
+    
+    # Highest donation id already folded into the verified totals
+    STATE_TABLE = "reconcile_state"
+    # Changes to already-counted donations, waiting to be folded in
+    ADJUSTMENTS_TABLE = "ledger_adjustments"
+    SOURCE_TABLE = "donations"
+    
+    @classmethod
+    def initialize(cls):
+        """Initialize the ledger, state and adjustment tables and the triggers"""
+        cls.create_table()
+        with cls.transaction() as cursor:
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {cls.STATE_TABLE} (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                high_water_id INTEGER NOT NULL DEFAULT 0,
+                last_run TIMESTAMP
+            )
+            """)
+            cursor.execute(f"INSERT OR IGNORE INTO {cls.STATE_TABLE} (id) VALUES (1)")
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {cls.ADJUSTMENTS_TABLE} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                campaign_id INTEGER NOT NULL,
+                amount INTEGER NOT NULL,
+                donation_count INTEGER NOT NULL
+            )
+            """)
+        cls.create_triggers()
+    
+    @classmethod
+    def create_triggers(cls, source=None):
+        """Log deletes and updates of donations the ledger has already counted
+        
+        Donations above the high-water mark haven't been counted yet, so
+        changing them needs no adjustment.
+        """
+        source = source or cls.SOURCE_TABLE
+        counted = f"OLD.id <= (SELECT high_water_id FROM {cls.STATE_TABLE})"
+        
+        with cls.transaction() as cursor:
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {source}_ledger_delete
+            AFTER DELETE ON {source} WHEN {counted}
+            BEGIN
+                INSERT INTO {cls.ADJUSTMENTS_TABLE} (campaign_id, amount, donation_count)
+                VALUES (OLD.campaign_id, -OLD.amount, -1);
+            END
+            """)
+            
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {source}_ledger_update
+            AFTER UPDATE OF campaign_id, amount ON {source} WHEN {counted}
+            BEGIN
+                INSERT INTO {cls.ADJUSTMENTS_TABLE} (campaign_id, amount, donation_count)
+                VALUES (OLD.campaign_id, -OLD.amount, -1), (NEW.campaign_id, NEW.amount, 1);
+            END
+            """)
+    
+    @classmethod
+    def drop_triggers(cls, source=None):
+        """Drop the adjustment triggers"""
+        source = source or cls.SOURCE_TABLE
+        with cls.transaction() as cursor:
+            for event in ("delete", "update"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {source}_ledger_{event}")
+    
+    @classmethod
+    def high_water_id(cls):
+        """Highest donation id folded into the verified totals"""
+        return cls._scalar(f"SELECT high_water_id FROM {cls.STATE_TABLE} WHERE id = 1") or 0
+    
+    @classmethod
+    def _fold_sql(cls, select):
+        """Upsert that adds (campaign_id, amount, count) rows onto the verified totals"""
+        return f"""
+        INSERT INTO {cls.TABLE_NAME} (campaign_id, verified_amount, donation_count)
+        {select}
+        ON CONFLICT (campaign_id) DO UPDATE SET
+            verified_amount = verified_amount + excluded.verified_amount,
+            donation_count = donation_count + excluded.donation_count
+        """
+    
+    @classmethod
+    def reconcile(cls, repair=False):
+        """Fold new activity into the verified totals and compare them with the campaigns
+        
+        Returns a report with the new high-water mark, how much was folded
+        in and every campaign whose current_amount disagrees with its
+        verified total. With repair, those campaigns are set to the
+        verified total in the same transaction.
+        """
+        with cls.transaction() as cursor:
+            # Write first so this transaction holds the write lock from the
+            # start and no donation can land between the reads below
+            cursor.execute(f"UPDATE {cls.STATE_TABLE} SET last_run = ? WHERE id = 1",
+                           (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),))
+            
+            previous = cls.high_water_id()
+            high_water = max(DonationPartitions.max_id() or 0, previous)
+            
+            # New donations since the last run
+            cursor.execute(cls._fold_sql(f"""
+            SELECT campaign_id, SUM(amount), COUNT(*) FROM {cls.SOURCE_TABLE}
+            WHERE id > ? AND id <= ? GROUP BY campaign_id
+            """), (previous, high_water))
+            new_donations = cls._scalar(
+                f"SELECT COUNT(*) FROM {cls.SOURCE_TABLE} WHERE id > ? AND id <= ?", (previous, high_water)
+            )
+            
+            # Deletes and updates of donations that were already counted
+            last_adjustment = cls._scalar(f"SELECT MAX(id) FROM {cls.ADJUSTMENTS_TABLE}") or 0
+            cursor.execute(cls._fold_sql(f"""
+            SELECT campaign_id, SUM(amount), SUM(donation_count) FROM {cls.ADJUSTMENTS_TABLE}
+            WHERE id <= ? GROUP BY campaign_id
+            """), (last_adjustment,))
+            cursor.execute(f"DELETE FROM {cls.ADJUSTMENTS_TABLE} WHERE id <= ?", (last_adjustment,))
+            adjustments = cursor.rowcount
+            
+            cursor.execute(f"UPDATE {cls.STATE_TABLE} SET high_water_id = ? WHERE id = 1", (high_water,))
+            
+            discrepancies = cls.discrepancies()
+            if repair and discrepancies:
+                Campaign.invalidate()
+                cursor.executemany(
+                    f"UPDATE {Campaign.TABLE_NAME} SET current_amount = ? WHERE id = ?",
+                    [(to_cents(row["verified"]), row["campaign_id"]) for row in discrepancies]
+                )
+        
+        return {
+            "previous_high_water_id": previous,
+            "high_water_id": high_water,
+            "new_donations": new_donations,
+            "adjustments": adjustments,
+            "discrepancies": discrepancies,
+            "repaired": bool(repair and discrepancies)
+        }
+    
+    @classmethod
+    def discrepancies(cls):
+        """Campaigns whose current_amount differs from the verified total
+        
+        Both are whole cents, so any difference at all is real drift.
+        """
+        sql = f"""
+        SELECT c.id AS campaign_id, c.name,
+               COALESCE(c.current_amount, 0) AS recorded,
+               COALESCE(l.verified_amount, 0) AS verified
+        FROM {Campaign.TABLE_NAME} c
+        LEFT JOIN {cls.TABLE_NAME} l ON l.campaign_id = c.id
+        WHERE COALESCE(c.current_amount, 0) != COALESCE(l.verified_amount, 0)
+        ORDER BY c.id
+        """
+        rows = []
+        for row in cls._query(sql):
+            # recorded and verified aren't money column names, so they come back in cents
+            row = dict(row)
+            row["recorded"] = from_cents(row["recorded"])
+            row["verified"] = from_cents(row["verified"])
+            row["difference"] = row["recorded"] - row["verified"]
+            rows.append(row)
+        return rows
+    
+    @classmethod
+    def rebuild(cls):
+        """Recompute every verified total from scratch with one full pass
+        
+        Returns the new high-water mark.
+        """
+        with cls.transaction() as cursor:
+            cursor.execute(f"DELETE FROM {cls.TABLE_NAME}")
+            cursor.execute(f"DELETE FROM {cls.ADJUSTMENTS_TABLE}")
+            high_water = DonationPartitions.max_id() or 0
+            cursor.execute(cls._fold_sql(f"""
+            SELECT campaign_id, SUM(amount), COUNT(*) FROM {cls.SOURCE_TABLE}
+            WHERE id <= ? GROUP BY campaign_id
+            """), (high_water,))
+            cursor.execute(f"UPDATE {cls.STATE_TABLE} SET high_water_id = ? WHERE id = 1", (high_water,))
+            return high_water
@@ -0,0 +1,257 @@
+# models/connection.py
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from urllib.request import pathname2url
+from models.instrumentation import InstrumentedConnection, stats
+
+
+class ConnectionManager:
+    """Hands out persistent SQLite connections
+    
+    Reads go through read-only connections, one per thread and database,
+    so with WAL any number of threads can read while a write commits.
+    Writes all go through a single writer connection per database, which
+    a thread holds (see writing()) for the whole of its transaction.
+    """
+    
+    # Pragmas applied to every new connection. journal_mode is persistent in
+    # the database file, the rest only last for the life of the connection.
+    DEFAULT_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -20000,        # negative means KiB, so about 20 MB
+        "mmap_size": 268435456,      # 256 MB
+        "foreign_keys": "ON",
+        "busy_timeout": 5000,
+    }
+    # Pragmas a read-only connection can't (or doesn't need to) set
+    WRITER_ONLY_PRAGMAS = {"journal_mode"}
+    
+    # Prepared statements kept per connection. Each model issues a few dozen
+    # distinct statements, so this keeps all of them compiled.
+    CACHED_STATEMENTS = 256
+    
+    # When another process holds the write lock past busy_timeout, BEGIN
+    # IMMEDIATE is retried this many times, backing off from BUSY_BACKOFF
+    # seconds and doubling each time
+    BUSY_RETRIES = 3
+    BUSY_BACKOFF = 0.05
+    
+    def __init__(self, pragmas=None, timeout=5.0, cached_statements=None, busy_retries=None, busy_backoff=None):
+        self.pragmas = dict(self.DEFAULT_PRAGMAS)
+        if pragmas:
+            self.pragmas.update(pragmas)
+        self.timeout = timeout
+        self.cached_statements = self.CACHED_STATEMENTS if cached_statements is None else cached_statements
+        self.busy_retries = self.BUSY_RETRIES if busy_retries is None else busy_retries
+        self.busy_backoff = self.BUSY_BACKOFF if busy_backoff is None else busy_backoff
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all = []
+        self._writers = {}
+        self._write_locks = {}
+    
+    @staticmethod
+    def resolve(db_path):
+        """The path to actually open for a database target
+        
+        ":memory:" becomes a new shared-cache in-memory database with its
+        own name, so every connection in this process sees the same data
+        and it lasts until they are all closed. Anything else (a file name
+        or a "file:" URI) is used as is.
+        """
+        if db_path == ":memory:":
+            return f"file:giveconnect-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        return db_path
+    
+    def configure(self, cached_statements=None, **pragmas):
+        """Change settings for connections opened from now on"""
+        if cached_statements is not None:
+            self.cached_statements = cached_statements
+        self.pragmas.update(pragmas)
+    
+    def get(self, db_path):
+        """Return the connection this thread should use for db_path
+        
+        That's the writer while the thread holds it, so a transaction reads
+        its own changes, and the thread's read-only connection otherwise.
+        """
+        if self._holding(db_path):
+            return self.writer(db_path)
+        return self.reader(db_path)
+    
+    def reader(self, db_path):
+        """Return this thread's read-only connection to db_path, opening it if needed"""
+        if self._in_memory(db_path):
+            # A plain :memory: database only exists on the connection that
+            # opened it, and shared-cache readers would fail with "table is
+            # locked" rather than wait for a write, so in-memory databases
+            # use the writer for everything (read through reading())
+            return self.writer(db_path)
+        
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        
+        conn = connections.get(db_path)
+        if conn is None:
+            # The writer creates the file and switches it to WAL first
+            self.writer(db_path)
+            if db_path.startswith("file:"):
+                uri = db_path + ("&" if "?" in db_path else "?") + "mode=ro"
+            else:
+                uri = f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro"
+            conn = self._open(uri, read_only=True)
+            connections[db_path] = conn
+        return conn
+    
+    def writer(self, db_path):
+        """Return the single writer connection to db_path, opening it if needed
+        
+        Shared by every thread, so only use it while holding writing().
+        """
+        conn = self._writers.get(db_path)
+        if conn is None:
+            with self._lock:
+                conn = self._writers.get(db_path)
+                if conn is None:
+                    conn = self._writers[db_path] = self._open(db_path, register=False)
+                    self._all.append(conn)
+        return conn
+    
+    def write_lock(self, db_path):
+        """The lock writing() takes for db_path, e.g. to check whether the writer is free"""
+        lock = self._write_locks.get(db_path)
+        if lock is None:
+            with self._lock:
+                lock = self._write_locks.setdefault(db_path, threading.RLock())
+        return lock
+    
+    @contextmanager
+    def writing(self, db_path):
+        """Hold the writer for db_path for the length of the block, yields it
+        
+        Re-entrant, so nested transactions on the same thread don't block.
+        """
+        with self.write_lock(db_path):
+            held = self._held()
+            held[db_path] = held.get(db_path, 0) + 1
+            try:
+                yield self.writer(db_path)
+            finally:
+                held[db_path] -= 1
+    
+    @contextmanager
+    def reading(self, db_path):
+        """Hold a connection to read db_path with for the length of the block, yields it
+        
+        For a file that's just get(), nothing is locked. An in-memory
+        database reads through the writer, so the block holds writing() too:
+        reads wait for another thread's transaction to finish instead of
+        seeing its uncommitted rows, and a rollback can't pull rows out from
+        under a query that is still stepping.
+        """
+        if not self._in_memory(db_path):
+            yield self.get(db_path)
+            return
+        with self.writing(db_path) as conn:
+            yield conn
+    
+    def begin(self, conn):
+        """Start a write transaction with BEGIN IMMEDIATE
+        
+        IMMEDIATE takes the write lock up front, so a transaction that reads
+        before it writes can't fail halfway through with SQLITE_BUSY. If
+        another process keeps the lock past busy_timeout the BEGIN is
+        retried a few times with backoff before giving up.
+        """
+        delay = self.busy_backoff
+        for attempt in range(self.busy_retries + 1):
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as e:
+                busy = "locked" in str(e) or "busy" in str(e)
+                if not busy or attempt == self.busy_retries:
+                    raise
+            stats.record_busy_retry()
+            # Jitter so processes that collided don't retry in lockstep
+            time.sleep(delay * random.uniform(1, 2))
+            delay *= 2
+    
+    def _held(self):
+        held = getattr(self._local, "held", None)
+        if held is None:
+            held = self._local.held = {}
+        return held
+    
+    def _holding(self, db_path):
+        return self._held().get(db_path, 0) > 0
+    
+    @staticmethod
+    def _in_memory(db_path):
+        return db_path in (":memory:", "") or "mode=memory" in db_path
+    
+    def _open(self, db_path, read_only=False, register=True):
+        """Open and tune a new connection"""
+        # isolation_level=None puts the driver in autocommit mode, so the only
+        # transactions are the ones we start explicitly with BEGIN.
+        # InstrumentedConnection routes every statement through the query
+        # stats hook, which costs one attribute check while stats are off.
+        conn = sqlite3.connect(
+            db_path,
+            timeout=self.timeout,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+            factory=InstrumentedConnection,
+            uri=db_path.startswith("file:")
+        )
+        stats.record_connection()
+        for name, value in self.pragmas.items():
+            if read_only and name in self.WRITER_ONLY_PRAGMAS:
+                continue
+            conn.execute(f"PRAGMA {name} = {value}")
+        
+        if register:
+            with self._lock:
+                self._all.append(conn)
+        return conn
+    
+    def close(self, db_path=None):
+        """Close the calling thread's read connections (or just the one for db_path)
+        
+        The writer is shared, it stays open until close_all().
+        """
+        connections = getattr(self._local, "connections", None)
+        if not connections:
+            return
+        
+        paths = [db_path] if db_path else list(connections)
+        for path in paths:
+            conn = connections.pop(path, None)
+            if conn is not None:
+                self._discard(conn)
+    
+    def close_all(self):
+        """Close every connection opened by any thread. Call on shutdown."""
+        with self._lock:
+            conns, self._all = self._all, []
+            self._writers = {}
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+    
+    def _discard(self, conn):
+        with self._lock:
+            if conn in self._all:
+                self._all.remove(conn)
+        conn.close()
@@ -3,6 +3,11 @@ import sqlite3
 from datetime import datetime
 from models.base import Base
 from models.campaign import Campaign
+from models.campaign_ledger import CampaignLedger
+from models.donor import Donor
+from models.donor_stats import DonorStats
+from models.money import to_cents, to_decimal
+from models.partitions import DonationPartitions
 
 class Donation(Base):
     """Model representing a donation from a donor to a campaign"""
@@ -11,91 +16,380 @@ class Donation(Base):
     COLUMNS = [
         "donor_id INTEGER NOT NULL",
         "campaign_id INTEGER NOT NULL",
-        "amount REAL NOT NULL",
+        "amount INTEGER NOT NULL",   # cents
         "date TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
         "FOREIGN KEY (donor_id) REFERENCES donors (id)",
         "FOREIGN KEY (campaign_id) REFERENCES campaigns (id)"
     ]
+    INDEXES = [
+        # History pages: newest first per donor / per campaign
+        ("idx_donations_donor_date", "donor_id, date DESC, id DESC"),
+        ("idx_donations_campaign_date", "campaign_id, date DESC, id DESC"),
+        ("idx_donations_date", "date"),
+        # Lets the donor_stats triggers check "first gift to this campaign?"
+        ("idx_donations_donor_campaign", "donor_id, campaign_id"),
+        # Covering index so SUM(amount) per donor never touches the table
+        ("idx_donations_donor_amount", "donor_id, amount")
+    ]
     
     @classmethod
     def initialize(cls):
         """Initialize the donation table"""
         cls.create_table()
+        cls.create_indexes()
+        DonationPartitions.initialize()
+    
+    @classmethod
+    def enable_partitioning(cls, period="month"):
+        """Split donations into one table per month or year
+        
+        Existing donations are moved into their partitions (keeping their
+        ids) and "donations" becomes a view over all of them. New donations
+        are routed to the partition for their date, which is created on
+        first use. Returns the partition names, newest first.
+        """
+        if period not in DonationPartitions.PERIODS:
+            raise ValueError("Partition period must be 'month' or 'year'")
+        current = DonationPartitions.period()
+        if current == period:
+            return DonationPartitions.names()
+        if current is not None:
+            raise ValueError(f"Donations are already partitioned by {current}")
+        
+        length = DonationPartitions.PERIODS[period]
+        columns = ", ".join(cls.column_names())
+        
+        with cls.foreign_keys_off(), cls.transaction() as cursor:
+            cls.invalidate()
+            # Carry on numbering after every id the table has ever used
+            last_id = max(
+                cls._scalar(f"SELECT MAX(id) FROM {cls.TABLE_NAME}") or 0,
+                cls._scalar("SELECT seq FROM sqlite_sequence WHERE name = ?", (cls.TABLE_NAME,)) or 0
+            )
+            keys = {DonationPartitions.key_for(datetime.now().strftime("%Y-%m-%d"), period)}
+            for (prefix,) in cursor.execute(f"SELECT DISTINCT substr(date, 1, {length}) FROM {cls.TABLE_NAME}").fetchall():
+                keys.add(DonationPartitions.key_for(prefix, period))
+            
+            # The rows are moved before the partitions get their triggers,
+            # donor stats and the ledger have already counted them
+            DonorStats.drop_triggers()
+            CampaignLedger.drop_triggers()
+            for key in sorted(keys):
+                name = DonationPartitions.create_partition(key, cls.COLUMNS, cls.INDEXES)
+                cursor.execute(
+                    f"INSERT INTO {name} ({columns}) SELECT {columns} FROM {cls.TABLE_NAME} "
+                    f"WHERE substr(date, 1, {length}) = ?", (key,)
+                )
+            cursor.execute(f"DROP TABLE {cls.TABLE_NAME}")
+            
+            DonationPartitions.rebuild_view()
+            for name in DonationPartitions.names():
+                cls._partition_triggers(name)
+            cursor.execute(
+                f"UPDATE {DonationPartitions.STATE_TABLE} SET period = ?, last_id = ? WHERE id = 1",
+                (period, last_id)
+            )
+        
+        return DonationPartitions.names()
+    
+    @classmethod
+    def partition(cls, key):
+        """Table for a partition key, created on first use"""
+        name = DonationPartitions.name_for(key)
+        if not DonationPartitions.known(name):
+            with cls.transaction():
+                DonationPartitions.create_partition(key, cls.COLUMNS, cls.INDEXES)
+                cls._partition_triggers(name)
+                DonationPartitions.rebuild_view()
+        return name
+    
+    @staticmethod
+    def _partition_triggers(name):
+        """Donor stats and ledger triggers for one partition"""
+        DonorStats.create_triggers(name)
+        CampaignLedger.create_triggers(name)
+    
+    @classmethod
+    def _insert_partitioned(cls, cursor, rows, period):
+        """Insert (donor_id, campaign_id, amount, date) rows into their partitions
+        
+        Returns the new ids in the same order as rows.
+        """
+        if not rows:
+            return []
+        first = DonationPartitions.allocate_ids(len(rows))
+        by_table = {}
+        for donation_id, row in enumerate(rows, first):
+            table = cls.partition(DonationPartitions.key_for(row[3], period))
+            by_table.setdefault(table, []).append((donation_id,) + tuple(row))
+        
+        for table, values in by_table.items():
+            cursor.executemany(
+                f"INSERT INTO {table} (id, donor_id, campaign_id, amount, date) VALUES (?, ?, ?, ?, ?)", values
+            )
+        return list(range(first, first + len(rows)))
     
     @classmethod
     def create(cls, donor_id, campaign_id, amount):
-        """Create a new donation with validation"""
+        """Create a new donation with validation (amount as a Decimal or string)"""
         # Validating the amount
+        amount = to_decimal(amount)
         if amount <= 0:
             raise ValueError("Donation amount must be greater than zero")
             
-        # Check if donor and campaign exist
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
-        
-        # Check for donor
-        cursor.execute("SELECT id FROM donors WHERE id = ?", (donor_id,))
-        if not cursor.fetchone():
-            conn.close()
+        date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        # Bump the campaign total and insert the donation in one transaction,
+        # so current_amount can never disagree with the donations table.
+        # Existence is enforced by the database: the UPDATE touches no row
+        # for an unknown campaign and the donor foreign key rejects the INSERT.
+        try:
+            with cls.transaction() as cursor:
+                if not Campaign.update_current_amount(campaign_id, amount):
+                    raise ValueError("Campaign does not exist")
+                
+                period = DonationPartitions.period()
+                if period is not None:
+                    cls.invalidate()
+                    row = (donor_id, campaign_id, to_cents(amount), date)
+                    return cls._insert_partitioned(cursor, [row], period)[0]
+                
+                donation_id = super().create(
+                    donor_id=donor_id, 
+                    campaign_id=campaign_id, 
+                    amount=to_cents(amount),
+                    date=date
+                )
+        except sqlite3.IntegrityError:
             raise ValueError("Donor does not exist")
+        
+        return donation_id
+    
+    @classmethod
+    def bulk_create(cls, rows, batch_size=1000):
+        """Insert many donations using batched transactions
+        
+        rows is any iterable of mappings with donor_id, campaign_id, amount
+        and an optional date, so files can be streamed without loading them.
+        Bad rows are skipped and reported instead of aborting the load.
+        Returns (inserted_count, errors) where errors is a list of
+        (row_number, message) pairs.
+        """
+        inserted = 0
+        errors = []
+        batch = []
+        
+        for row_number, row in enumerate(rows, start=1):
+            batch.append((row_number, row))
+            if len(batch) >= batch_size:
+                inserted += cls._insert_batch(batch, errors)
+                batch = []
+        
+        if batch:
+            inserted += cls._insert_batch(batch, errors)
+        
+        errors.sort()
+        return inserted, errors
+    
+    @staticmethod
+    def parse_row(row):
+        """Validate one raw donation row and return (donor_id, campaign_id, amount, date)
+        
+        The amount comes back in cents, ready to insert.
+        """
+        if not isinstance(row, dict):
+            raise ValueError("Malformed row")
+        
+        try:
+            donor_id = int(row["donor_id"])
+            campaign_id = int(row["campaign_id"])
+            amount = to_cents(row["amount"])
+        except KeyError as e:
+            raise ValueError(f"Missing field {e.args[0]}")
+        except (TypeError, ValueError):
+            raise ValueError("donor_id, campaign_id and amount must be numbers")
+        
+        if amount <= 0:
+            raise ValueError("Donation amount must be greater than zero")
+        
+        date = row.get("date")
+        if date:
+            try:
+                date = datetime.fromisoformat(str(date)).strftime("%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                raise ValueError(f"Invalid date: {date}")
+        else:
+            date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        return donor_id, campaign_id, amount, date
+    
+    @classmethod
+    def _insert_batch(cls, batch, errors):
+        """Validate and insert one batch in a single transaction"""
+        parsed = []
+        for row_number, row in batch:
+            try:
+                parsed.append((row_number, cls.parse_row(row)))
+            except ValueError as e:
+                errors.append((row_number, str(e)))
+        
+        if not parsed:
+            return 0
+        
+        with cls.transaction() as cursor:
+            cls.invalidate(cls.TABLE_NAME, Campaign.TABLE_NAME)
             
-        # Check for the campaign
-        cursor.execute("SELECT id FROM campaigns WHERE id = ?", (campaign_id,))
-        if not cursor.fetchone():
-            conn.close()
-            raise ValueError("Campaign does not exist")
+            # One IN query per table for the whole batch instead of a
+            # SELECT per row
+            donors = Donor.existing_ids((values[0] for _, values in parsed), cursor)
+            campaigns = Campaign.existing_ids((values[1] for _, values in parsed), cursor)
             
-        conn.close()
-        
-        # Create the donation
-        donation_id = super().create(
-            donor_id=donor_id, 
-            campaign_id=campaign_id, 
-            amount=amount,
-            date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        )
+            valid = []
+            for row_number, values in parsed:
+                donor_id, campaign_id, amount, date = values
+                if donor_id not in donors:
+                    errors.append((row_number, "Donor does not exist"))
+                elif campaign_id not in campaigns:
+                    errors.append((row_number, "Campaign does not exist"))
+                else:
+                    valid.append(values)
+            
+            cls._write_rows(cursor, valid)
         
-        # Then now Update campaign current amount
-        Campaign.update_current_amount(campaign_id, amount)
+        return len(valid)
+    
+    @classmethod
+    def insert_validated(cls, rows):
+        """Insert rows that already passed parse_row() and the existence checks
         
-        return donation_id
+        rows is a list of (donor_id, campaign_id, amount, date) tuples, all
+        written in one transaction. Used by the parallel import pipeline.
+        Returns the number inserted.
+        """
+        with cls.transaction() as cursor:
+            cls.invalidate(cls.TABLE_NAME, Campaign.TABLE_NAME)
+            cls._write_rows(cursor, rows)
+        return len(rows)
     
     @classmethod
-    def get_donations_by_donor(cls, donor_id):
-        """Get all donations made by a donor"""
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
+    def _write_rows(cls, cursor, rows):
+        """Insert valid rows and bump their campaigns' totals, inside a transaction"""
+        totals = {}
+        for donor_id, campaign_id, amount, date in rows:
+            totals[campaign_id] = totals.get(campaign_id, 0) + amount
         
-        sql = f"SELECT * FROM {cls.TABLE_NAME} WHERE donor_id = ? ORDER BY date DESC"
+        period = DonationPartitions.period()
+        if period is not None:
+            cls._insert_partitioned(cursor, rows, period)
+        else:
+            cursor.executemany(
+                f"INSERT INTO {cls.TABLE_NAME} (donor_id, campaign_id, amount, date) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
         
-        cursor.execute(sql, (donor_id,))
-        rows = cursor.fetchall()
-        conn.close()
+        # One counter update per campaign per batch
+        cursor.executemany(
+            f"UPDATE {Campaign.TABLE_NAME} SET current_amount = current_amount + ? WHERE id = ?",
+            [(total, campaign_id) for campaign_id, total in totals.items()]
+        )
+    
+    @classmethod
+    def create_many(cls, rows):
+        """Insert already-validated donations in a single transaction
         
-        # Convert rows to dictionaries
-        columns = [column[0] for column in cursor.description]
+        rows is a list of (donor_id, campaign_id, amount, date) tuples.
+        Returns one result per row in the same order: the new donation ID,
+        or a ValueError for a row that referenced a missing donor or campaign.
+        Used by the group-commit queue, which needs an ID back for every row.
+        """
         results = []
-        for row in rows:
-            results.append(dict(zip(columns, row)))
+        totals = {}
+        
+        with cls.transaction() as cursor:
+            cls.invalidate(cls.TABLE_NAME, Campaign.TABLE_NAME)
+            
+            donors = Donor.existing_ids((row[0] for row in rows), cursor)
+            campaigns = Campaign.existing_ids((row[1] for row in rows), cursor)
+            
+            period = DonationPartitions.period()
+            sql = f"INSERT INTO {cls.TABLE_NAME} (donor_id, campaign_id, amount, date) VALUES (?, ?, ?, ?)"
+            valid = []
+            for index, row in enumerate(rows):
+                donor_id, campaign_id, amount, date = row
+                if donor_id not in donors:
+                    results.append(ValueError("Donor does not exist"))
+                elif campaign_id not in campaigns:
+                    results.append(ValueError("Campaign does not exist"))
+                elif period is not None:
+                    # Placeholder, filled in once the partitioned insert has ids
+                    results.append(None)
+                    valid.append((index, row))
+                else:
+                    cursor.execute(sql, row)
+                    results.append(cursor.lastrowid)
+                    totals[campaign_id] = totals.get(campaign_id, 0) + amount
             
+            if valid:
+                ids = cls._insert_partitioned(cursor, [row for _, row in valid], period)
+                for (index, row), donation_id in zip(valid, ids):
+                    results[index] = donation_id
+                    totals[row[1]] = totals.get(row[1], 0) + row[2]
+            
+            # Coalesce the counter updates to one per campaign
+            cursor.executemany(
+                f"UPDATE {Campaign.TABLE_NAME} SET current_amount = current_amount + ? WHERE id = ?",
+                [(total, campaign_id) for campaign_id, total in totals.items()]
+            )
+        
         return results
     
     @classmethod
-    def get_donations_by_campaign(cls, campaign_id):
-        """Get all donations made to a campaign"""
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
+    def delete(cls, record_id):
+        """Delete a donation by ID, from whichever partition holds it"""
+        if DonationPartitions.period() is None:
+            return super().delete(record_id)
         
-        sql = f"SELECT * FROM {cls.TABLE_NAME} WHERE campaign_id = ? ORDER BY date DESC"
-        
-        cursor.execute(sql, (campaign_id,))
-        rows = cursor.fetchall()
-        conn.close()
+        with cls.transaction() as cursor:
+            cls.invalidate()
+            for table in DonationPartitions.names():
+                cursor.execute(f"DELETE FROM {table} WHERE id = ?", (record_id,))
+                if cursor.rowcount:
+                    return True
+        return False
+    
+    @classmethod
+    def get_donations_by_donor(cls, donor_id, start=None, end=None):
+        """Get all donations made by a donor, newest first, optionally from start up to end"""
+        sql = "SELECT * FROM {table} WHERE donor_id = ? ORDER BY date DESC"
         
+        return DonationPartitions.fan_out(cls, sql, (donor_id,), start, end)
+    
+    @classmethod
+    def get_donations_by_campaign(cls, campaign_id, start=None, end=None):
+        """Get all donations made to a campaign, newest first, optionally from start up to end"""
+        sql = "SELECT * FROM {table} WHERE campaign_id = ? ORDER BY date DESC"
         
-        columns = [column[0] for column in cursor.description]
-        results = []
-        for row in rows:
-            results.append(dict(zip(columns, row)))
-            
-        return results
\ No newline at end of file
+        return DonationPartitions.fan_out(cls, sql, (campaign_id,), start, end)
+    
+    @classmethod
+    def get_donations_by_donor_page(cls, donor_id, limit=20, cursor=None):
+        """Get one page of a donor's donations, newest first"""
+        return cls.fetch_page(
+            f"SELECT * FROM {cls.TABLE_NAME}",
+            where=["donor_id = ?"],
+            params=[donor_id],
+            limit=limit,
+            cursor=cursor
+        )
+    
+    @classmethod
+    def get_donations_by_campaign_page(cls, campaign_id, limit=20, cursor=None):
+        """Get one page of a campaign's donations, newest first"""
+        return cls.fetch_page(
+            f"SELECT * FROM {cls.TABLE_NAME}",
+            where=["campaign_id = ?"],
+            params=[campaign_id],
+            limit=limit,
+            cursor=cursor
+        )
@@ -0,0 +1,102 @@
+# models/donation_queue.py
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+
+from models.donation import Donation
+from models.money import to_cents
+
+# Placed on the queue to tell the committer thread to finish
+_STOP = object()
+
+
+class DonationQueue:
+    """Write-behind queue that commits donations in groups
+    
+    submit() returns straight away with a Future. A background committer
+    thread collects queued donations and writes up to max_batch of them in
+    one transaction, waiting at most max_delay seconds after the first one
+    arrives. Campaign totals get one UPDATE per campaign per flush. Each
+    Future resolves to the donation ID once its transaction has committed,
+    or to the ValueError that rejected it.
+    """
+    
+    def __init__(self, max_batch=500, max_delay=0.005):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._thread = None
+        self.flushes = 0
+        self.committed = 0
+    
+    def start(self):
+        """Start the committer thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="giveconnect-committer", daemon=True)
+            self._thread.start()
+        return self
+    
+    def submit(self, donor_id, campaign_id, amount):
+        """Queue a donation (amount as a Decimal or string) and return a Future for its ID"""
+        if self._thread is None:
+            raise RuntimeError("Donation queue is not running")
+        amount = to_cents(amount)
+        if amount <= 0:
+            raise ValueError("Donation amount must be greater than zero")
+        
+        future = Future()
+        date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._queue.put((future, (donor_id, campaign_id, amount, date)))
+        return future
+    
+    def stop(self):
+        """Commit everything still queued, then stop the committer thread"""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self):
+        """Committer loop: gather a batch, write it, repeat"""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            self._flush(batch)
+        
+        Donation.connections.close()
+    
+    def _flush(self, batch):
+        """Write one batch and resolve its futures"""
+        futures = [future for future, _ in batch]
+        try:
+            results = Donation.create_many([row for _, row in batch])
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        
+        self.flushes += 1
+        for future, result in zip(futures, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                self.committed += 1
+                future.set_result(result)
@@ -1,7 +1,9 @@
 # models/donor.py
 import re
-import sqlite3
 from models.base import Base
+from models.donor_stats import DonorStats
+from models.money import from_cents
+from models.partitions import DonationPartitions
 
 class Donor(Base):
     """Model representing a donor in the system"""
@@ -18,6 +20,7 @@ class Donor(Base):
     def initialize(cls):
         """Initialize the donor table"""
         cls.create_table()
+        cls.create_indexes()
     
     @classmethod
     def create(cls, name, email, password):
@@ -42,21 +45,9 @@ class Donor(Base):
     @classmethod
     def find_by_email(cls, email):
         """Find a donor by email"""
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
-        
         sql = f"SELECT * FROM {cls.TABLE_NAME} WHERE email = ?"
         
-        cursor.execute(sql, (email,))
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            # Convert row to dictionary
-            columns = [column[0] for column in cursor.description]
-            return dict(zip(columns, row))
-        else:
-            return None
+        return cls.cached("email", (email,), lambda: cls._query_one(sql, (email,)))
     
     @classmethod
     def authenticate(cls, email, password):
@@ -68,41 +59,50 @@ class Donor(Base):
         return None
         
     @classmethod
-    def get_donation_history(cls, donor_id):
-        """Get donation history for a donor"""
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
-        
+    def get_donation_history(cls, donor_id, start=None, end=None):
+        """Get donation history for a donor, optionally from start up to end"""
         sql = """
         SELECT d.id, d.amount, d.date, c.name as campaign_name
-        FROM donations d
+        FROM {table} d
         JOIN campaigns c ON d.campaign_id = c.id
         WHERE d.donor_id = ?
         ORDER BY d.date DESC
         """
         
-        cursor.execute(sql, (donor_id,))
-        rows = cursor.fetchall()
-        conn.close()
-        
-        # Convert rows to dictionaries
-        columns = [column[0] for column in cursor.description]
-        results = []
-        for row in rows:
-            results.append(dict(zip(columns, row)))
-            
-        return results
+        return DonationPartitions.fan_out(cls, sql, (donor_id,), start, end, date_column="d.date")
         
     @classmethod
-    def get_total_donated(cls, donor_id):
-        """Get total amount donated by a donor"""
-        conn = sqlite3.connect(cls.DB_PATH)
-        cursor = conn.cursor()
+    def get_donation_history_page(cls, donor_id, limit=20, cursor=None):
+        """Get one page of a donor's donation history, newest first"""
+        return cls.fetch_page(
+            """
+            SELECT d.id, d.amount, d.date, c.name as campaign_name
+            FROM donations d
+            JOIN campaigns c ON d.campaign_id = c.id
+            """,
+            where=["d.donor_id = ?"],
+            params=[donor_id],
+            order_by=("d.date", "d.id"),
+            limit=limit,
+            cursor=cursor
+        )
         
-        sql = "SELECT SUM(amount) FROM donations WHERE donor_id = ?"
-        
-        cursor.execute(sql, (donor_id,))
-        total = cursor.fetchone()[0] or 0
-        conn.close()
+    @classmethod
+    def get_total_donated(cls, donor_id, start=None, end=None):
+        """Get total amount donated by a donor, optionally only from start up to end"""
+        if not start and not end:
+            return cls.get_stats(donor_id)['total_donated']
         
-        return total
\ No newline at end of file
+        # A date range needs the donations themselves, summed over the
+        # partitions that overlap it
+        conditions, params = DonationPartitions.date_range(start, end)
+        sql = "SELECT COALESCE(SUM(amount), 0) FROM {table} WHERE " + " AND ".join(["donor_id = ?"] + conditions)
+        return from_cents(sum(
+            cls._scalar(sql.format(table=table), [donor_id] + params)
+            for table in DonationPartitions.tables(start, end)
+        ))
+    
+    @classmethod
+    def get_stats(cls, donor_id):
+        """Get a donor's precomputed totals (amount, count, first/last date, campaigns)"""
+        return DonorStats.find_by_donor(donor_id)
\ No newline at end of file
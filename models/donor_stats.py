@@ -0,0 +1,141 @@
+# models/donor_stats.py
+from decimal import Decimal
+from models.base import Base
+
+
+class DonorStats(Base):
+    """Per-donor giving totals, maintained by triggers on the donations table"""
+    
+    TABLE_NAME = "donor_stats"
+    COLUMNS = [
+        "donor_id INTEGER NOT NULL UNIQUE",
+        "total_donated INTEGER NOT NULL DEFAULT 0",   # cents
+        "donation_count INTEGER NOT NULL DEFAULT 0",
+        "first_donation TIMESTAMP",
+        "last_donation TIMESTAMP",
+        "campaign_count INTEGER NOT NULL DEFAULT 0",
+        "FOREIGN KEY (donor_id) REFERENCES donors (id)"
+    ]
+    
+    # Table the aggregates are computed from
+    SOURCE_TABLE = "donations"
+    
+    # Values reported for a donor with no donations yet
+    EMPTY = {
+        "total_donated": Decimal("0.00"),
+        "donation_count": 0,
+        "first_donation": None,
+        "last_donation": None,
+        "campaign_count": 0
+    }
+    
+    @classmethod
+    def initialize(cls):
+        """Initialize the stats table and its triggers"""
+        existed = cls.table_exists()
+        cls.create_table()
+        cls.create_triggers()
+        
+        # Backfill from the donations already in an existing database
+        if not existed:
+            cls.rebuild()
+    
+    @classmethod
+    def create_triggers(cls, source=None):
+        """Create the triggers that keep donor_stats in step with a donations table
+        
+        Every insert, delete or update on the source table adjusts the
+        donor's row in the same transaction, so reading a total is a single
+        primary-key lookup. source can be one partition of the donations,
+        the lookups inside the triggers always go to all of them.
+        """
+        source = source or cls.SOURCE_TABLE
+        donations = cls.SOURCE_TABLE
+        recompute = cls._recompute_sql(donations)
+        
+        with cls.transaction() as cursor:
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {source}_stats_insert
+            AFTER INSERT ON {source}
+            BEGIN
+                INSERT OR IGNORE INTO {cls.TABLE_NAME} (donor_id) VALUES (NEW.donor_id);
+                UPDATE {cls.TABLE_NAME} SET
+                    campaign_count = campaign_count + NOT EXISTS (
+                        SELECT 1 FROM {donations}
+                        WHERE donor_id = NEW.donor_id AND campaign_id = NEW.campaign_id AND id != NEW.id
+                    ),
+                    total_donated = total_donated + NEW.amount,
+                    donation_count = donation_count + 1,
+                    first_donation = CASE WHEN first_donation IS NULL OR NEW.date < first_donation
+                                          THEN NEW.date ELSE first_donation END,
+                    last_donation = CASE WHEN last_donation IS NULL OR NEW.date > last_donation
+                                         THEN NEW.date ELSE last_donation END
+                WHERE donor_id = NEW.donor_id;
+            END
+            """)
+            
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {source}_stats_delete
+            AFTER DELETE ON {source}
+            BEGIN
+                UPDATE {cls.TABLE_NAME} SET
+                    campaign_count = campaign_count - NOT EXISTS (
+                        SELECT 1 FROM {donations}
+                        WHERE donor_id = OLD.donor_id AND campaign_id = OLD.campaign_id
+                    ),
+                    total_donated = total_donated - OLD.amount,
+                    donation_count = donation_count - 1,
+                    first_donation = (SELECT MIN(date) FROM {donations} WHERE donor_id = OLD.donor_id),
+                    last_donation = (SELECT MAX(date) FROM {donations} WHERE donor_id = OLD.donor_id)
+                WHERE donor_id = OLD.donor_id;
+            END
+            """)
+            
+            # Updates are rare, so just recompute both affected donors
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {source}_stats_update
+            AFTER UPDATE OF donor_id, campaign_id, amount, date ON {source}
+            BEGIN
+                DELETE FROM {cls.TABLE_NAME} WHERE donor_id IN (OLD.donor_id, NEW.donor_id);
+                {recompute} WHERE donor_id IN (OLD.donor_id, NEW.donor_id) GROUP BY donor_id;
+            END
+            """)
+    
+    @classmethod
+    def drop_triggers(cls, source=None):
+        """Drop the maintenance triggers, e.g. before a very large load"""
+        source = source or cls.SOURCE_TABLE
+        with cls.transaction() as cursor:
+            for event in ("insert", "delete", "update"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {source}_stats_{event}")
+    
+    @classmethod
+    def _recompute_sql(cls, source):
+        """INSERT ... SELECT that aggregates donor rows from the source table"""
+        return f"""
+        INSERT INTO {cls.TABLE_NAME}
+            (donor_id, total_donated, donation_count, first_donation, last_donation, campaign_count)
+        SELECT donor_id, SUM(amount), COUNT(*), MIN(date), MAX(date), COUNT(DISTINCT campaign_id)
+        FROM {source}
+        """
+    
+    @classmethod
+    def rebuild(cls):
+        """Recompute every donor's stats from the donations table
+        
+        Returns the number of donors with stats.
+        """
+        with cls.transaction() as cursor:
+            cursor.execute(f"DELETE FROM {cls.TABLE_NAME}")
+            cursor.execute(cls._recompute_sql(cls.SOURCE_TABLE) + " GROUP BY donor_id")
+            return cursor.rowcount
+    
+    @classmethod
+    def find_by_donor(cls, donor_id):
+        """Get a donor's stats, with zeros if they haven't donated yet"""
+        sql = f"SELECT * FROM {cls.TABLE_NAME} WHERE donor_id = ?"
+        
+        stats = cls._query_one(sql, (donor_id,))
+        if stats is None:
+            return dict(cls.EMPTY, donor_id=donor_id)
+        return dict(stats)
@@ -0,0 +1,404 @@
+# models/export.py
+"""Streaming exports of donations, donors and campaigns
+
+Rows are read with fetchmany() and written out a chunk at a time, so memory
+use doesn't depend on the size of the table. Output is CSV, JSON Lines or
+the columnar format below, optionally gzipped.
+
+Columnar format (all integers little-endian):
+    
+    b"GCCOL\\x01"                  magic
+    uint32 + JSON                 header: {"dataset": ..., "columns": [[name, type], ...]}
+    blocks until end of file:
+        uint32                    rows in the block
+        per column:
+            ceil(rows / 8) bytes  validity bitmap, bit set = not NULL
+            int:   int64 * rows
+            money: int64 * rows, in cents
+            float: float64 * rows
+            str:   uint32 * rows byte lengths, then the UTF-8 bytes back to back
+
+Each block is one fetchmany() chunk, and read_columnar() reads a file back.
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import struct
+import sys
+from array import array
+from models.base import Base
+from models.money import from_cents
+
+MAGIC = b"GCCOL\x01"
+
+
+def _convert_money(rows, columns, convert):
+    """rows with every money column (stored in cents) passed through convert"""
+    indexes = [i for i, (_, kind) in enumerate(columns) if kind == "money"]
+    if not indexes:
+        return rows
+    converted = []
+    for row in rows:
+        row = list(row)
+        for i in indexes:
+            if row[i] is not None:
+                row[i] = convert(row[i])
+        converted.append(row)
+    return converted
+
+
+class CsvFormat:
+    """Comma-separated values with a header row, amounts like 12.50"""
+    
+    def __init__(self, dataset, columns):
+        self.columns = columns
+        self.names = [name for name, _ in columns]
+    
+    def header(self):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(self.names)
+        return buffer.getvalue().encode("utf-8")
+    
+    def encode(self, rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(_convert_money(rows, self.columns, from_cents))
+        return buffer.getvalue().encode("utf-8")
+
+
+class JsonlFormat:
+    """One JSON object per line, amounts as numbers like 12.5"""
+    
+    def __init__(self, dataset, columns):
+        self.columns = columns
+        self.names = [name for name, _ in columns]
+    
+    def header(self):
+        return b""
+    
+    def encode(self, rows):
+        names = self.names
+        # cents / 100 is the closest double to the amount, so it prints with
+        # at most two decimals
+        rows = _convert_money(rows, self.columns, lambda cents: cents / 100)
+        return "".join(json.dumps(dict(zip(names, row))) + "\n" for row in rows).encode("utf-8")
+
+
+class ColumnarFormat:
+    """Compact binary blocks, one array per column (see the module docstring)"""
+    
+    ARRAY_TYPES = {"int": "q", "money": "q", "float": "d"}
+    
+    def __init__(self, dataset, columns):
+        self.dataset = dataset
+        self.columns = columns
+    
+    def header(self):
+        meta = json.dumps({"dataset": self.dataset, "columns": [list(column) for column in self.columns]}).encode("utf-8")
+        return MAGIC + struct.pack("<I", len(meta)) + meta
+    
+    def encode(self, rows):
+        parts = [struct.pack("<I", len(rows))]
+        for index, (_, kind) in enumerate(self.columns):
+            values = [row[index] for row in rows]
+            
+            valid = bytearray((len(values) + 7) // 8)
+            for i, value in enumerate(values):
+                if value is not None:
+                    valid[i >> 3] |= 1 << (i & 7)
+            parts.append(bytes(valid))
+            
+            if kind == "str":
+                encoded = [b"" if value is None else str(value).encode("utf-8") for value in values]
+                parts.append(_little_endian(array("I", map(len, encoded))))
+                parts.append(b"".join(encoded))
+            else:
+                cast = float if kind == "float" else int
+                numbers = array(self.ARRAY_TYPES[kind], (0 if value is None else cast(value) for value in values))
+                parts.append(_little_endian(numbers))
+        return b"".join(parts)
+
+
+def _little_endian(values):
+    """Bytes of an array in little-endian order whatever the platform"""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def read_columnar(path):
+    """Read a columnar export back, yields (column names, {name: values}) per block
+    
+    Money columns come back as Decimal amounts.
+    """
+    with open(path, "rb") as f:
+        gzipped = f.read(2) == b"\x1f\x8b"
+    
+    with (gzip.open if gzipped else open)(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a columnar export file")
+        (size,) = struct.unpack("<I", f.read(4))
+        columns = json.loads(f.read(size))["columns"]
+        names = [name for name, _ in columns]
+        
+        while True:
+            head = f.read(4)
+            if not head:
+                return
+            (count,) = struct.unpack("<I", head)
+            block = {}
+            for name, kind in columns:
+                valid = f.read((count + 7) // 8)
+                if kind == "str":
+                    lengths = array("I")
+                    lengths.frombytes(f.read(4 * count))
+                    if sys.byteorder == "big":
+                        lengths.byteswap()
+                    data = f.read(sum(lengths))
+                    values, offset = [], 0
+                    for length in lengths:
+                        values.append(data[offset:offset + length].decode("utf-8"))
+                        offset += length
+                else:
+                    values = array(ColumnarFormat.ARRAY_TYPES[kind])
+                    values.frombytes(f.read(8 * count))
+                    if sys.byteorder == "big":
+                        values.byteswap()
+                    values = values.tolist()
+                    if kind == "money":
+                        values = [from_cents(value) for value in values]
+                block[name] = [value if valid[i >> 3] >> (i & 7) & 1 else None for i, value in enumerate(values)]
+            yield names, block
+
+
+class Exporter:
+    """Streams one dataset to a file or stream
+    
+    Exports to a file checkpoint every checkpoint_every rows: the output is
+    flushed and the last exported id and file size are saved next to it in
+    <path>.checkpoint. run(resume=True) after an interruption cuts the file
+    back to the last checkpoint and carries on after that id. The checkpoint
+    is removed once the export finishes.
+    """
+    
+    # Each dataset: SELECT (first column is the id, in id order), the
+    # columns with their types, and the columns the filters apply to
+    DATASETS = {
+        "donations": {
+            "sql": """
+            SELECT d.id, d.donor_id, donors.name, donors.email, d.campaign_id,
+                   c.name, c.organization, d.amount, d.date
+            FROM donations d
+            LEFT JOIN donors ON donors.id = d.donor_id
+            LEFT JOIN campaigns c ON c.id = d.campaign_id
+            """,
+            "columns": [
+                ("id", "int"), ("donor_id", "int"), ("donor_name", "str"), ("donor_email", "str"),
+                ("campaign_id", "int"), ("campaign_name", "str"), ("organization", "str"),
+                ("amount", "money"), ("date", "str")
+            ],
+            "id": "d.id",
+            "date": "d.date",
+            "campaign": "d.campaign_id = ?"
+        },
+        "donors": {
+            # Never export passwords
+            "sql": """
+            SELECT donors.id, donors.name, donors.email, donors.created_at,
+                   COALESCE(s.total_donated, 0), COALESCE(s.donation_count, 0)
+            FROM donors
+            LEFT JOIN donor_stats s ON s.donor_id = donors.id
+            """,
+            "columns": [
+                ("id", "int"), ("name", "str"), ("email", "str"), ("created_at", "str"),
+                ("total_donated", "money"), ("donation_count", "int")
+            ],
+            "id": "donors.id",
+            "date": "donors.created_at",
+            "campaign": "donors.id IN (SELECT donor_id FROM donations WHERE campaign_id = ?)"
+        },
+        "campaigns": {
+            "sql": """
+            SELECT id, name, description, goal_amount, current_amount, organization, created_at, active
+            FROM campaigns
+            """,
+            "columns": [
+                ("id", "int"), ("name", "str"), ("description", "str"), ("goal_amount", "money"),
+                ("current_amount", "money"), ("organization", "str"), ("created_at", "str"), ("active", "int")
+            ],
+            "id": "id",
+            "date": "created_at",
+            "campaign": "id = ?"
+        }
+    }
+    
+    FORMATS = {"csv": CsvFormat, "jsonl": JsonlFormat, "columnar": ColumnarFormat}
+    # File extension (before any .gz) -> format
+    EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".json": "jsonl", ".cols": "columnar"}
+    # gzip's default of 9 is several times slower for a few percent smaller files
+    COMPRESS_LEVEL = 6
+    
+    def __init__(self, dataset, format=None, compress=False, start=None, end=None,
+                 campaign_id=None, chunk_size=5000, checkpoint_every=50000):
+        if dataset not in self.DATASETS:
+            raise ValueError(f"Unknown dataset: {dataset}")
+        if format is not None and format not in self.FORMATS:
+            raise ValueError(f"Unknown export format: {format}")
+        
+        self.dataset = dataset
+        self.format = format
+        self.compress = compress
+        self.start = str(start) if start else None
+        self.end = str(end) if end else None
+        self.campaign_id = campaign_id
+        self.chunk_size = chunk_size
+        self.checkpoint_every = checkpoint_every
+    
+    def query(self, after_id=None):
+        """The SELECT and its parameters for this export's filters"""
+        spec = self.DATASETS[self.dataset]
+        conditions, params = [], []
+        if self.start:
+            conditions.append(f"{spec['date']} >= ?")
+            params.append(self.start)
+        if self.end:
+            conditions.append(f"{spec['date']} < ?")
+            params.append(self.end)
+        if self.campaign_id is not None:
+            conditions.append(spec["campaign"])
+            params.append(self.campaign_id)
+        if after_id is not None:
+            conditions.append(f"{spec['id']} > ?")
+            params.append(after_id)
+        
+        sql = spec["sql"]
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        return sql + f" ORDER BY {spec['id']}", params
+    
+    def _options(self):
+        """Settings that must match for a checkpoint to be resumed"""
+        return {
+            "dataset": self.dataset,
+            "format": self.format,
+            "compress": self.compress,
+            "start": self.start,
+            "end": self.end,
+            "campaign_id": self.campaign_id
+        }
+    
+    def _chunks(self, after_id=None):
+        """Yield lists of rows (as tuples) in id order"""
+        sql, params = self.query(after_id)
+        # A plain tuple cursor, rows go straight to the encoder
+        with Base.reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(self.chunk_size)
+                    if not rows:
+                        return
+                    yield rows
+            finally:
+                cursor.close()
+    
+    def _encoder(self):
+        return self.FORMATS[self.format or "jsonl"](self.dataset, self.DATASETS[self.dataset]["columns"])
+    
+    def iter_rows(self):
+        """Stream the export as dicts, amounts as Decimal"""
+        columns = self.DATASETS[self.dataset]["columns"]
+        names = [name for name, _ in columns]
+        for rows in self._chunks():
+            for row in _convert_money(rows, columns, from_cents):
+                yield dict(zip(names, row))
+    
+    def write(self, stream):
+        """Write the whole export to a binary stream (no checkpoints), returns the row count"""
+        encoder = self._encoder()
+        out = gzip.GzipFile(fileobj=stream, mode="wb", compresslevel=self.COMPRESS_LEVEL) if self.compress else stream
+        out.write(encoder.header())
+        count = 0
+        for rows in self._chunks():
+            out.write(encoder.encode(rows))
+            count += len(rows)
+        if self.compress:
+            out.close()
+        stream.flush()
+        return count
+    
+    def run(self, path, resume=False):
+        """Export to a file, returns {"path", "rows", "last_id", "resumed"}
+        
+        The format and compression default from the file name (.csv,
+        .jsonl, .cols, plus .gz).
+        """
+        path = str(path)
+        name = path[:-3] if path.endswith(".gz") else path
+        if path.endswith(".gz"):
+            self.compress = True
+        if self.format is None:
+            self.format = self.EXTENSIONS.get(os.path.splitext(name)[1], "jsonl")
+        
+        checkpoint_path = path + ".checkpoint"
+        checkpoint = None
+        if resume and os.path.exists(checkpoint_path) and os.path.exists(path):
+            with open(checkpoint_path) as f:
+                checkpoint = json.load(f)
+            if checkpoint["options"] != self._options():
+                raise ValueError("Checkpoint was written by an export with different options")
+        
+        encoder = self._encoder()
+        last_id = checkpoint["last_id"] if checkpoint else None
+        count = checkpoint["rows"] if checkpoint else 0
+        
+        with open(path, "r+b" if checkpoint else "wb") as raw:
+            if checkpoint:
+                # Drop anything written after the last checkpoint
+                raw.truncate(checkpoint["bytes"])
+                raw.seek(checkpoint["bytes"])
+            
+            # gzip output is a series of complete gzip members, one per
+            # checkpoint, so the file can be cut back to any checkpoint
+            out = self._segment(raw)
+            if not checkpoint:
+                out.write(encoder.header())
+            
+            pending = 0
+            for rows in self._chunks(last_id):
+                out.write(encoder.encode(rows))
+                last_id = rows[-1][0]
+                count += len(rows)
+                pending += len(rows)
+                
+                if pending >= self.checkpoint_every:
+                    self._end_segment(out, raw)
+                    self._save_checkpoint(checkpoint_path, last_id, count, raw.tell())
+                    out = self._segment(raw)
+                    pending = 0
+            
+            self._end_segment(out, raw)
+        
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        return {"path": path, "rows": count, "last_id": last_id, "resumed": checkpoint is not None}
+    
+    def _segment(self, raw):
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=self.COMPRESS_LEVEL) if self.compress else raw
+    
+    def _end_segment(self, out, raw):
+        """Finish the current gzip member and make the file durable"""
+        if out is not raw:
+            out.close()
+        raw.flush()
+        os.fsync(raw.fileno())
+    
+    def _save_checkpoint(self, checkpoint_path, last_id, count, size):
+        state = {"options": self._options(), "last_id": last_id, "rows": count, "bytes": size}
+        temporary = checkpoint_path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump(state, f)
+        os.replace(temporary, checkpoint_path)
@@ -0,0 +1,121 @@
+# models/import_pipeline.py
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from models.campaign import Campaign
+from models.donation import Donation
+from models.donor import Donor
+
+# The donor and campaign ids each worker process checks rows against, set
+# once per worker by _init_worker so they aren't sent with every chunk
+_donor_ids = None
+_campaign_ids = None
+
+
+def _init_worker(donor_ids, campaign_ids):
+    global _donor_ids, _campaign_ids
+    _donor_ids = donor_ids
+    _campaign_ids = campaign_ids
+
+
+def validate_chunk(first_row, rows, donor_ids=None, campaign_ids=None):
+    """Parse and check one chunk of raw rows, returns (valid rows, errors)
+    
+    Pure Python with no database access, so it can run in a worker process.
+    Valid rows are (donor_id, campaign_id, amount, date) tuples ready to
+    insert, errors are (row_number, message) pairs, both in input order.
+    """
+    donor_ids = _donor_ids if donor_ids is None else donor_ids
+    campaign_ids = _campaign_ids if campaign_ids is None else campaign_ids
+    
+    valid = []
+    errors = []
+    for row_number, row in enumerate(rows, start=first_row):
+        try:
+            values = Donation.parse_row(row)
+        except ValueError as e:
+            errors.append((row_number, str(e)))
+            continue
+        
+        if values[0] not in donor_ids:
+            errors.append((row_number, "Donor does not exist"))
+        elif values[1] not in campaign_ids:
+            errors.append((row_number, "Campaign does not exist"))
+        else:
+            valid.append(values)
+    return valid, errors
+
+
+class ImportPipeline:
+    """Bulk donation import with validation spread over several processes
+    
+    Three stages: this process reads the rows and cuts them into chunks, a
+    pool of worker processes parses and validates the chunks in parallel
+    against donor and campaign ids loaded once up front, and this process,
+    the only one that touches the database, commits the validated rows in
+    batches. Results are taken in the order the chunks were sent, so rows
+    are inserted and errors reported in input order.
+    
+    The id sets are a snapshot from the start of the import, so a donor or
+    campaign created while it runs counts as missing.
+    """
+    
+    def __init__(self, workers=None, chunk_size=5000, batch_size=None):
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size or chunk_size
+    
+    def chunks(self, rows):
+        """Yield (first row number, list of rows) for each chunk of the input"""
+        rows = iter(rows)
+        first_row = 1
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            yield first_row, chunk
+            first_row += len(chunk)
+    
+    def validated(self, rows, donor_ids, campaign_ids):
+        """Yield validate_chunk() results in input order
+        
+        At most two chunks per worker are in flight at a time, so memory
+        stays bounded while the writer catches up. With one worker the
+        chunks are validated in this process.
+        """
+        if self.workers <= 1:
+            for first_row, chunk in self.chunks(rows):
+                yield validate_chunk(first_row, chunk, donor_ids, campaign_ids)
+            return
+        
+        with ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                 initargs=(donor_ids, campaign_ids)) as pool:
+            in_flight = deque()
+            for first_row, chunk in self.chunks(rows):
+                in_flight.append(pool.submit(validate_chunk, first_row, chunk))
+                if len(in_flight) >= self.workers * 2:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+    
+    def run(self, rows):
+        """Import rows, returns (inserted_count, errors) like Donation.bulk_create"""
+        donor_ids = Donor.all_ids()
+        campaign_ids = Campaign.all_ids()
+        
+        inserted = 0
+        errors = []
+        pending = []
+        for valid, chunk_errors in self.validated(rows, donor_ids, campaign_ids):
+            errors.extend(chunk_errors)
+            pending.extend(valid)
+            if len(pending) >= self.batch_size:
+                inserted += Donation.insert_validated(pending)
+                pending = []
+        
+        if pending:
+            inserted += Donation.insert_validated(pending)
+        return inserted, errors
@@ -0,0 +1,244 @@
+# models/instrumentation.py
+import json
+import logging
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger("giveconnect.sql")
+
+# Helpers that sit between a model method and the cursor, skipped when
+# working out which model method ran a statement
+_PLUMBING = {
+    "cached", "iter_query", "iter_all", "transaction", "execute_custom_query",
+    "fetch_page", "existing_ids", "<lambda>", "<genexpr>", "<listcomp>", "__exit__", "__enter__"
+}
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"IN \((?:\?, )*\?\)", re.IGNORECASE)
+_NUMBER = re.compile(r"(?<![\w.])\d+(?:\.\d+)?")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def normalize_sql(sql):
+    """Collapse a statement to a stable shape so its calls can be grouped
+    
+    Whitespace is squashed, literals become ? and IN lists of any length
+    become IN (...).
+    """
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    return _IN_LIST.sub("IN (...)", sql)
+
+
+def _caller():
+    """Name the model method (Class.method) that issued the current statement"""
+    frame = sys._getframe(3)
+    while frame is not None:
+        code = frame.f_code
+        owner = frame.f_locals.get("cls")
+        if isinstance(owner, type) and not code.co_name.startswith("_") and code.co_name not in _PLUMBING:
+            return f"{owner.__name__}.{code.co_name}"
+        frame = frame.f_back
+    return "<other>"
+
+
+class QueryStats:
+    """Collects per-statement and per-model-method timings
+    
+    Disabled by default; enable() turns collection on. Statements slower
+    than slow_ms are logged to the "giveconnect.sql" logger and kept in
+    slow_queries, with their query plan when explain is set.
+    """
+    
+    def __init__(self, slow_ms=100.0, explain=False, keep_slow=100):
+        self.enabled = False
+        self.slow_ms = slow_ms
+        self.explain = explain
+        self._lock = threading.Lock()
+        self.slow_queries = deque(maxlen=keep_slow)
+        self.reset()
+    
+    def enable(self, slow_ms=None, explain=None):
+        """Start collecting, optionally changing the slow-query settings"""
+        if slow_ms is not None:
+            self.slow_ms = slow_ms
+        if explain is not None:
+            self.explain = explain
+        self.enabled = True
+    
+    def disable(self):
+        self.enabled = False
+    
+    def reset(self):
+        """Forget everything collected so far"""
+        with self._lock:
+            self.statements = {}
+            self.methods = {}
+            self.connections = 0
+            self.commits = 0
+            self.rollbacks = 0
+            self.busy_retries = 0
+            self.slow_queries.clear()
+    
+    def record_connection(self):
+        with self._lock:
+            self.connections += 1
+    
+    def record_commit(self, committed=True):
+        with self._lock:
+            if committed:
+                self.commits += 1
+            else:
+                self.rollbacks += 1
+    
+    def record_busy_retry(self):
+        with self._lock:
+            self.busy_retries += 1
+    
+    def record(self, sql, method, elapsed_ms, rows=0, calls=1):
+        """Add one execution (or fetch) to the statement and method totals"""
+        with self._lock:
+            for table, key in ((self.statements, sql), (self.methods, method)):
+                entry = table.get(key)
+                if entry is None:
+                    entry = table[key] = {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0}
+                entry["calls"] += calls
+                entry["total_ms"] += elapsed_ms
+                entry["rows"] += rows
+                if elapsed_ms > entry["max_ms"]:
+                    entry["max_ms"] = elapsed_ms
+    
+    def record_slow(self, connection, raw_sql, params, sql, method, elapsed_ms):
+        """Log a slow statement, with its plan if explain is on"""
+        entry = {"sql": sql, "method": method, "ms": round(elapsed_ms, 3)}
+        explainable = params is not None and raw_sql.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE"))
+        if self.explain and explainable:
+            try:
+                # A plain cursor, so the EXPLAIN itself isn't recorded
+                plan = sqlite3.Cursor(connection).execute(f"EXPLAIN QUERY PLAN {raw_sql}", params).fetchall()
+                entry["plan"] = [row[-1] for row in plan]
+            except sqlite3.Error:
+                pass
+        
+        with self._lock:
+            self.slow_queries.append(entry)
+        logger.warning("Slow query (%.1f ms) in %s: %s%s", elapsed_ms, method, sql,
+                       "".join(f"\n    {step}" for step in entry.get("plan", [])))
+    
+    def snapshot(self, top=None):
+        """Everything collected, statements sorted by total time"""
+        with self._lock:
+            statements = sorted(self.statements.items(), key=lambda item: -item[1]["total_ms"])
+            methods = sorted(self.methods.items(), key=lambda item: -item[1]["total_ms"])
+            if top:
+                statements = statements[:top]
+                methods = methods[:top]
+            return {
+                "enabled": self.enabled,
+                "connections_opened": self.connections,
+                "commits": self.commits,
+                "rollbacks": self.rollbacks,
+                "busy_retries": self.busy_retries,
+                "statements": [dict(entry, sql=sql) for sql, entry in statements],
+                "methods": [dict(entry, method=method) for method, entry in methods],
+                "slow_queries": list(self.slow_queries)
+            }
+    
+    def dump_json(self, path):
+        """Write snapshot() to a JSON file"""
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+
+# Process-wide collector used by every connection
+stats = QueryStats()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports its statements and fetches to stats
+    
+    Time spent fetching is charged to the statement that produced the rows,
+    and a statement counts as slow once execute plus fetches pass slow_ms.
+    """
+    
+    _current = None
+    
+    def execute(self, sql, parameters=()):
+        if not stats.enabled:
+            return super().execute(sql, parameters)
+        
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._finish(sql, parameters, started)
+    
+    def executemany(self, sql, seq_of_parameters):
+        if not stats.enabled:
+            return super().executemany(sql, seq_of_parameters)
+        
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._finish(sql, None, started)
+    
+    def _finish(self, raw_sql, params, started):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        sql = normalize_sql(raw_sql)
+        method = _caller()
+        # [normalized sql, method, raw sql, params, time so far, already logged]
+        self._current = [sql, method, raw_sql, params, elapsed_ms, False]
+        stats.record(sql, method, elapsed_ms)
+        self._check_slow()
+    
+    def _fetched(self, rows, started):
+        """Charge fetch time and row counts to the statement that produced them"""
+        current = self._current
+        if current is not None:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            current[4] += elapsed_ms
+            stats.record(current[0], current[1], elapsed_ms, rows=rows, calls=0)
+            self._check_slow()
+    
+    def _check_slow(self):
+        sql, method, raw_sql, params, elapsed_ms, logged = self._current
+        if not logged and elapsed_ms >= stats.slow_ms:
+            self._current[5] = True
+            stats.record_slow(self.connection, raw_sql, params, sql, method, elapsed_ms)
+    
+    def fetchone(self):
+        if not stats.enabled:
+            return super().fetchone()
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(1 if row is not None else 0, started)
+        return row
+    
+    def fetchmany(self, size=None):
+        if not stats.enabled:
+            return super().fetchmany(self.arraysize if size is None else size)
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(len(rows), started)
+        return rows
+    
+    def fetchall(self):
+        if not stats.enabled:
+            return super().fetchall()
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(len(rows), started)
+        return rows
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (including those behind execute()) are instrumented"""
+    
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
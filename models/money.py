@@ -0,0 +1,60 @@
+# models/money.py
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Money is stored as whole cents in INTEGER columns, so sums are exact and
+# nothing has to be rounded after adding up thousands of donations.
+# Everything above the models sees Decimal amounts with two places.
+
+CENT = Decimal("0.01")
+# Largest value an SQLite INTEGER column can hold
+MAX_CENTS = 2 ** 63 - 1
+
+
+def to_cents(value):
+    """Turn an amount (str, int, float or Decimal) into whole cents
+    
+    Rounds half up to the nearest cent. Raises ValueError for anything
+    that isn't a finite number or doesn't fit in an SQLite INTEGER.
+    """
+    if isinstance(value, bool):
+        raise ValueError("Amount must be a number")
+    try:
+        # Through str() so a float like 0.1 means 0.10, not 0.1000000000000000055...
+        amount = value if isinstance(value, Decimal) else Decimal(str(value).strip())
+    except (InvalidOperation, ValueError):
+        raise ValueError("Amount must be a number")
+    if not amount.is_finite():
+        raise ValueError("Amount must be a number")
+    try:
+        # Too many digits for the decimal context raises InvalidOperation
+        cents = int(amount.quantize(CENT, rounding=ROUND_HALF_UP).scaleb(2))
+    except InvalidOperation:
+        raise ValueError("Invalid amount")
+    if abs(cents) > MAX_CENTS:
+        raise ValueError("Invalid amount")
+    return cents
+
+
+def from_cents(cents):
+    """Turn whole cents back into a Decimal amount (None stays None)"""
+    if cents is None:
+        return None
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def to_decimal(value):
+    """Parse an amount into a Decimal rounded to the cent"""
+    return from_cents(to_cents(value))
+
+
+def percent(current, goal):
+    """Progress of current towards goal as a percentage with two places
+    
+    Both amounts go to whole cents and the division is done in integer
+    basis points (hundredths of a percent), rounding down, so a campaign
+    only shows 100% once it has really reached its goal.
+    """
+    goal_cents = to_cents(goal or 0)
+    if goal_cents <= 0:
+        return Decimal("0.00")
+    return from_cents(to_cents(current or 0) * 10000 // goal_cents)
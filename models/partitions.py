@@ -0,0 +1,201 @@
+# models/partitions.py
+import heapq
+import re
+from models.base import Base
+
+
+class DonationPartitions(Base):
+    """Registry of the per-period tables donations are split into
+    
+    Partitioning is off until Donation.enable_partitioning() is called.
+    After that each month (or year) of donations lives in its own table,
+    e.g. donations_2024_03, and "donations" becomes a UNION ALL view over
+    all of them, so code that only reads keeps working. Donation ids come
+    from a counter here so they stay unique and increasing across tables.
+    """
+    
+    TABLE_NAME = "donation_partitions"
+    COLUMNS = [
+        "name TEXT NOT NULL UNIQUE",
+        "period_start TEXT NOT NULL",     # first day in the table
+        "period_end TEXT NOT NULL"        # first day after it
+    ]
+    
+    # The period (NULL while not partitioned) and the last donation id handed out
+    STATE_TABLE = "donation_partitioning"
+    # Logical name of the donations, a table or (once partitioned) the view
+    SOURCE_TABLE = "donations"
+    PERIODS = {"month": 7, "year": 4}     # period -> length of its date prefix
+    
+    # Partitions are only ever added, so the ones seen already are remembered
+    # per database file instead of being looked up on every write. A rollback
+    # can undo a partition created in it, so reset() forgets them all then.
+    _known = {}
+    
+    @classmethod
+    def initialize(cls):
+        """Initialize the registry and state tables"""
+        cls.create_table()
+        with cls.transaction() as cursor:
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {cls.STATE_TABLE} (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                period TEXT,
+                last_id INTEGER NOT NULL DEFAULT 0
+            )
+            """)
+            cursor.execute(f"INSERT OR IGNORE INTO {cls.STATE_TABLE} (id) VALUES (1)")
+    
+    @classmethod
+    def period(cls):
+        """"month" or "year" when donations are partitioned, else None"""
+        return cls._scalar(f"SELECT period FROM {cls.STATE_TABLE} WHERE id = 1")
+    
+    @classmethod
+    def key_for(cls, date, period):
+        """Partition key of a date: "2024-03" by month, "2024" by year"""
+        key = str(date or "")[:cls.PERIODS[period]]
+        if not re.fullmatch(r"\d{4}(-\d{2})?", key) or len(key) != cls.PERIODS[period]:
+            raise ValueError(f"Invalid date: {date}")
+        return key
+    
+    @classmethod
+    def name_for(cls, key):
+        """Table name of a partition key"""
+        return f"{cls.SOURCE_TABLE}_{key.replace('-', '_')}"
+    
+    @classmethod
+    def bounds(cls, key):
+        """(first day, first day after) of a partition key"""
+        if len(key) == 4:
+            return f"{key}-01-01", f"{int(key) + 1}-01-01"
+        year, month = int(key[:4]), int(key[5:])
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return f"{key}-01", f"{year:04d}-{month:02d}-01"
+    
+    @classmethod
+    def names(cls, start=None, end=None):
+        """Partition tables that can hold dates in [start, end), newest first"""
+        sql = f"SELECT name FROM {cls.TABLE_NAME}"
+        conditions, params = [], []
+        # Pruning: skip the periods that end before start or begin at or after end
+        if start:
+            conditions.append("period_end > ?")
+            params.append(str(start))
+        if end:
+            conditions.append("period_start < ?")
+            params.append(str(end))
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY period_start DESC"
+        with cls.reading() as conn:
+            return [row[0] for row in conn.execute(sql, params)]
+    
+    @classmethod
+    def tables(cls, start=None, end=None):
+        """Tables to query for donations in [start, end): the partitions, or just donations"""
+        if cls.period() is None:
+            return [cls.SOURCE_TABLE]
+        return cls.names(start, end)
+    
+    @classmethod
+    def reset(cls):
+        """Forget the partitions seen so far"""
+        cls._known.clear()
+    
+    @classmethod
+    def known(cls, name):
+        """Whether a partition table exists, remembered once seen"""
+        known = cls._known.setdefault(cls.DB_PATH, set())
+        if name not in known:
+            if not cls.table_exists(name):
+                return False
+            known.add(name)
+        return True
+    
+    @classmethod
+    def create_partition(cls, key, columns, indexes):
+        """Create and register one partition table with the donations columns and indexes
+        
+        The view isn't touched, call rebuild_view() once the partitions are
+        in place. Returns the table name.
+        """
+        name = cls.name_for(key)
+        period_start, period_end = cls.bounds(key)
+        suffix = name[len(cls.SOURCE_TABLE):]
+        
+        with cls.transaction() as cursor:
+            # Plain INTEGER PRIMARY KEY, ids are handed out by allocate_ids()
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS {name} (id INTEGER PRIMARY KEY, {', '.join(columns)})")
+            for index_name, index_columns in indexes:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name}{suffix} ON {name} ({index_columns})")
+            cursor.execute(
+                f"INSERT OR IGNORE INTO {cls.TABLE_NAME} (name, period_start, period_end) VALUES (?, ?, ?)",
+                (name, period_start, period_end)
+            )
+        return name
+    
+    @classmethod
+    def rebuild_view(cls):
+        """Point the donations view at every registered partition"""
+        names = sorted(cls.names())
+        with cls.transaction() as cursor:
+            cls.invalidate(cls.SOURCE_TABLE)
+            cursor.execute(f"DROP VIEW IF EXISTS {cls.SOURCE_TABLE}")
+            cursor.execute(
+                f"CREATE VIEW {cls.SOURCE_TABLE} AS "
+                + " UNION ALL ".join(f"SELECT * FROM {name}" for name in names)
+            )
+    
+    @classmethod
+    def allocate_ids(cls, count):
+        """Reserve count new donation ids, returns the first"""
+        # UPDATE ... RETURNING needs SQLite 3.35, so read the counter back
+        # inside the same transaction instead
+        with cls.transaction() as cursor:
+            cursor.execute(f"UPDATE {cls.STATE_TABLE} SET last_id = last_id + ? WHERE id = 1", (count,))
+            cursor.execute(f"SELECT last_id FROM {cls.STATE_TABLE} WHERE id = 1")
+            return cursor.fetchone()[0] - count + 1
+    
+    @classmethod
+    def max_id(cls):
+        """Highest donation id handed out so far
+        
+        MAX(id) over the view would scan every partition, the counter is a
+        single row.
+        """
+        if cls.period() is None:
+            return cls._scalar(f"SELECT MAX(id) FROM {cls.SOURCE_TABLE}")
+        return cls._scalar(f"SELECT last_id FROM {cls.STATE_TABLE} WHERE id = 1")
+    
+    @staticmethod
+    def date_range(start=None, end=None, column="date"):
+        """WHERE conditions and parameters for dates in [start, end)"""
+        conditions, params = [], []
+        if start:
+            conditions.append(f"{column} >= ?")
+            params.append(str(start))
+        if end:
+            conditions.append(f"{column} < ?")
+            params.append(str(end))
+        return conditions, params
+    
+    @classmethod
+    def fan_out(cls, model, sql, params=(), start=None, end=None, date_column="date"):
+        """Run a query on every table that can hold donations in [start, end)
+        
+        sql is a SELECT with {table} where the donations table goes, already
+        ordered by date_column, newest first. The date range is added to its
+        WHERE clause, and the per-table results are merged newest first.
+        """
+        conditions, extra = cls.date_range(start, end, date_column)
+        head, order = re.split(r"\s+ORDER BY\s+", sql, maxsplit=1, flags=re.I)
+        if conditions:
+            head += (" AND " if re.search(r"\bWHERE\b", head, re.I) else " WHERE ") + " AND ".join(conditions)
+        sql = f"{head} ORDER BY {order}"
+        
+        key = date_column.split(".")[-1]
+        results = [model._query(sql.format(table=table), list(params) + extra) for table in cls.tables(start, end)]
+        if len(results) == 1:
+            return results[0]
+        return list(heapq.merge(*results, key=lambda row: row[key], reverse=True))
@@ -0,0 +1,84 @@
+# models/rows.py
+import keyword
+
+_row_classes = {}
+
+
+class RowBase:
+    """Mapping-style access for the generated __slots__ row classes
+    
+    Rows behave enough like dicts that existing code such as
+    campaign['name'], row.get('x') and dict(row) keeps working, while
+    costing one small fixed-size object per row instead of a dict.
+    """
+    
+    __slots__ = ()
+    
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(f"{key} is not a column of this row, copy it with dict(row) first")
+        setattr(self, key, value)
+    
+    def __contains__(self, key):
+        return key in self.__slots__
+    
+    def __iter__(self):
+        return iter(self.__slots__)
+    
+    def __len__(self):
+        return len(self.__slots__)
+    
+    def __eq__(self, other):
+        if isinstance(other, (RowBase, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+    
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+    
+    def keys(self):
+        return self.__slots__
+    
+    def values(self):
+        return [getattr(self, name) for name in self.__slots__]
+    
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.__slots__]
+    
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+
+def row_class(names, class_name="Row"):
+    """Return a cached __slots__ class for rows with these column names
+    
+    Returns None when a name can't be used as a slot (e.g. "SUM(amount)"),
+    callers then fall back to plain dicts.
+    """
+    names = tuple(names)
+    if names in _row_classes:
+        return _row_classes[names]
+    
+    usable = (
+        len(set(names)) == len(names)
+        and all(name.isidentifier() and not keyword.iskeyword(name) and name != "self"
+            for name in names)
+    )
+    klass = None
+    if usable:
+        # Generate a straight-line __init__ so building a row is just a few
+        # attribute stores
+        args = ", ".join(names)
+        body = "".join(f"\n    self.{name} = {name}" for name in names) or "\n    pass"
+        namespace = {}
+        exec(f"def __init__(self, {args}):{body}", namespace)
+        
+        klass = type(class_name, (RowBase,), {"__slots__": names, "__init__": namespace["__init__"]})
+    
+    _row_classes[names] = klass
+    return klass
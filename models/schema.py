@@ -0,0 +1,149 @@
+# models/schema.py
+import re
+from models.base import Base
+from models.campaign import Campaign
+from models.campaign_ledger import CampaignLedger
+from models.donation import Donation
+from models.donor import Donor
+from models.donor_stats import DonorStats
+from models.partitions import DonationPartitions
+
+
+class Schema:
+    """Database schema versioning through SQLite's PRAGMA user_version
+    
+    MIGRATIONS lists the steps in order, each one moving the schema up to
+    its version number. migrate() only runs the steps newer than the version
+    stored in the database, so starting against an up-to-date database
+    costs a single PRAGMA read.
+    """
+    
+    # (version, description, method name), in order. Add new steps at the end
+    # and never change one that has already shipped.
+    MIGRATIONS = [
+        (1, "Tables, indexes and donor stats triggers", "_baseline"),
+        (2, "Full-text search index on campaigns", "_campaign_search"),
+        (3, "Campaign ledger for reconciling campaign totals", "_campaign_ledger"),
+        (4, "Money stored as integer cents", "_money_in_cents"),
+        (5, "Registry for partitioned donations", "_donation_partitions"),
+    ]
+    
+    # Money columns that were REAL (dollars) before version 4, per table
+    CENTS_COLUMNS = {
+        "campaigns": ("goal_amount", "current_amount"),
+        "donations": ("amount",),
+        "donor_stats": ("total_donated",),
+        "campaign_ledger": ("verified_amount",),
+        "ledger_adjustments": ("amount",),
+    }
+    
+    @classmethod
+    def version(cls):
+        """Schema version stored in the database (0 for a new or legacy file)"""
+        return Base._scalar("PRAGMA user_version")
+    
+    @classmethod
+    def latest(cls):
+        """Version the code expects"""
+        return cls.MIGRATIONS[-1][0]
+    
+    @classmethod
+    def migrate(cls):
+        """Bring the database up to the latest version
+        
+        Each step runs in its own transaction together with the version
+        bump, so an interrupted upgrade resumes from the last finished step.
+        Returns the (version, description) of each step applied.
+        """
+        current = cls.version()
+        if current >= cls.latest():
+            return []
+        
+        # Some steps rebuild tables that others reference, so foreign keys
+        # are off for the whole upgrade
+        applied = []
+        with Base.foreign_keys_off():
+            for version, description, step in cls.MIGRATIONS:
+                if version <= current:
+                    continue
+                with Base.transaction() as cursor:
+                    getattr(cls, step)()
+                    cursor.execute(f"PRAGMA user_version = {version}")
+                applied.append((version, description))
+        return applied
+    
+    @classmethod
+    def _baseline(cls):
+        # Everything uses IF NOT EXISTS, so this also adopts databases
+        # created before versioning
+        Donor.initialize()
+        Campaign.initialize()
+        Donation.initialize()
+        DonorStats.initialize()
+    
+    @classmethod
+    def _campaign_search(cls):
+        # Skipped without FTS5, Campaign.search falls back to LIKE
+        Campaign.create_search_index()
+    
+    @classmethod
+    def _campaign_ledger(cls):
+        # Starts empty with a high-water mark of 0, so the first
+        # reconcile does the one full pass
+        CampaignLedger.initialize()
+    
+    @classmethod
+    def _money_in_cents(cls):
+        # SQLite can't change a column's type in place, so each table is
+        # copied into a new one with INTEGER columns and the amounts * 100
+        for table, columns in cls.CENTS_COLUMNS.items():
+            cls._rebuild_in_cents(table, columns)
+        
+        # Dropping the old tables took their indexes and triggers with them
+        for model in (Campaign, Donation, DonorStats):
+            model.create_indexes()
+        DonorStats.create_triggers()
+        CampaignLedger.create_triggers()
+        Campaign.create_search_index()
+        # On a pre-versioning database the baseline step has just backfilled
+        # donor_stats from the dollar amounts, so recompute it from the cents
+        DonorStats.rebuild()
+    
+    @classmethod
+    def _rebuild_in_cents(cls, table, columns):
+        """Copy a table into a new one where the given REAL columns hold cents"""
+        sql = Base._scalar("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        if sql is None:
+            return
+        
+        original = sql
+        for column in columns:
+            sql = re.sub(rf"\b({column}\s+)REAL\b([^,]*?)DEFAULT 0\.0\b", r"\1INTEGER\2DEFAULT 0", sql)
+            sql = re.sub(rf"\b({column}\s+)REAL\b", r"\1INTEGER", sql)
+        if sql == original:
+            # Created with INTEGER columns already (a new database)
+            return
+        
+        new_table = f"{table}_cents"
+        sql = re.sub(rf"^CREATE TABLE\s+(IF NOT EXISTS\s+)?\"?{table}\"?", f"CREATE TABLE {new_table}", sql)
+        
+        conn = Base.get_connection()
+        names = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        select = ", ".join(
+            f"CAST(ROUND({name} * 100) AS INTEGER)" if name in columns else name for name in names
+        )
+        # Keep AUTOINCREMENT counting from where it was
+        sequence = Base._scalar("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+        
+        with Base.transaction() as cursor:
+            cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {new_table} ({', '.join(names)}) SELECT {select} FROM {table}")
+            cursor.execute(f"DROP TABLE {table}")
+            cursor.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+            if sequence is not None:
+                cursor.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = ?", (sequence, table))
+    
+    @classmethod
+    def _donation_partitions(cls):
+        # Partitioning stays off until Donation.enable_partitioning()
+        DonationPartitions.initialize()
@@ -0,0 +1,31 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.base import Base
+from models.campaign import Campaign
+from models.donor import Donor
+from models.schema import Schema
+
+
+@pytest.fixture
+def db():
+    """A new, empty in-memory database at the current schema version"""
+    path = Base.configure(":memory:")
+    Schema.migrate()
+    yield path
+    Base.close_connections()
+
+
+@pytest.fixture
+def donor(db):
+    return Donor.create(name="Test Donor", email="donor@example.com", password="password123")
+
+
+@pytest.fixture
+def campaign(db):
+    return Campaign.create(name="Test Campaign", description="For tests", goal_amount="1000.00", organization="Test Org")
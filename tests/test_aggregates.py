@@ -0,0 +1,108 @@
+# tests/test_aggregates.py
+import pytest
+
+from models.base import Base
+from models.campaign import Campaign
+from models.campaign_ledger import CampaignLedger
+from models.donation import Donation
+from models.donor import Donor
+from models.partitions import DonationPartitions
+
+
+def rows(sql, params=()):
+    with Base.reading() as conn:
+        return [tuple(row) for row in conn.execute(sql, params)]
+
+
+def update_donation(donation_id, **values):
+    """Change a donation with plain SQL, as a manual fix would"""
+    # Once partitioned "donations" is a view, the row lives in one partition
+    table = "donations"
+    if DonationPartitions.period() is not None:
+        table = next(name for name in DonationPartitions.names() if rows(f"SELECT 1 FROM {name} WHERE id = ?", (donation_id,)))
+    
+    assignments = ", ".join(f"{name} = ?" for name in values)
+    with Base.transaction() as cursor:
+        Donation.invalidate()
+        cursor.execute(f"UPDATE {table} SET {assignments} WHERE id = ?", list(values.values()) + [donation_id])
+
+
+def assert_donor_stats_match():
+    expected = rows("""
+        SELECT donor_id, SUM(amount), COUNT(*), MIN(date), MAX(date), COUNT(DISTINCT campaign_id)
+        FROM donations GROUP BY donor_id ORDER BY donor_id
+    """)
+    actual = rows("""
+        SELECT donor_id, total_donated, donation_count, first_donation, last_donation, campaign_count
+        FROM donor_stats WHERE donation_count > 0 ORDER BY donor_id
+    """)
+    assert actual == expected
+    assert rows("SELECT * FROM donor_stats WHERE donation_count < 0 OR total_donated < 0") == []
+
+
+def assert_ledger_matches():
+    expected = rows("SELECT campaign_id, SUM(amount), COUNT(*) FROM donations GROUP BY campaign_id ORDER BY campaign_id")
+    actual = rows("""
+        SELECT campaign_id, verified_amount, donation_count FROM campaign_ledger
+        WHERE donation_count != 0 ORDER BY campaign_id
+    """)
+    assert actual == expected
+
+
+# Partitions get their own copies of the triggers, so run everything both ways
+@pytest.fixture(params=[None, "month"])
+def donations(db, request):
+    if request.param:
+        Donation.enable_partitioning(request.param)
+    ann = Donor.create(name="Ann", email="ann@example.com", password="password123")
+    bob = Donor.create(name="Bob", email="bob@example.com", password="password123")
+    wells = Campaign.create(name="Wells", description="Clean water", goal_amount="1000.00", organization="Org")
+    books = Campaign.create(name="Books", description="School books", goal_amount="500.00", organization="Org")
+    ids = [
+        Donation.create(ann, wells, "19.99"),
+        Donation.create(ann, wells, "5.01"),
+        Donation.create(ann, books, "12.50"),
+        Donation.create(bob, books, "0.10"),
+    ]
+    return {"ann": ann, "bob": bob, "wells": wells, "books": books, "ids": ids}
+
+
+def test_creates_keep_donor_stats_in_step(donations):
+    assert_donor_stats_match()
+    assert rows("SELECT total_donated, campaign_count FROM donor_stats WHERE donor_id = ?", (donations["ann"],)) == [(3750, 2)]
+
+
+def test_deletes_and_updates_keep_aggregates_in_step(donations):
+    CampaignLedger.reconcile()
+    assert_ledger_matches()
+    first, second, third, fourth = donations["ids"]
+    
+    Donation.delete(second)
+    update_donation(third, amount=2000, campaign_id=donations["wells"])
+    update_donation(fourth, donor_id=donations["ann"])
+    assert_donor_stats_match()
+    
+    # The ledger had counted all of them, so each change is logged
+    assert rows("SELECT campaign_id, amount, donation_count FROM ledger_adjustments ORDER BY id") == [
+        (donations["wells"], -501, -1),
+        (donations["books"], -1250, -1),
+        (donations["wells"], 2000, 1),
+    ]
+    
+    report = CampaignLedger.reconcile()
+    assert report["adjustments"] == 3
+    assert rows("SELECT * FROM ledger_adjustments") == []
+    assert_ledger_matches()
+
+
+def test_changes_above_the_high_water_mark_are_not_logged(donations):
+    CampaignLedger.reconcile()
+    
+    new = Donation.create(donations["bob"], donations["wells"], "7.00")
+    update_donation(new, amount=800)
+    Donation.delete(new)
+    assert rows("SELECT * FROM ledger_adjustments") == []
+    assert_donor_stats_match()
+    
+    CampaignLedger.reconcile()
+    assert_ledger_matches()
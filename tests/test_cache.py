@@ -0,0 +1,62 @@
+# tests/test_cache.py
+import sqlite3
+
+import pytest
+
+from models.base import Base
+from models.cache import ModelCache
+from models.campaign import Campaign
+from models.donor import Donor
+from models.schema import Schema
+
+
+@pytest.fixture
+def cache():
+    previous = Base.cache
+    Base.set_cache(ModelCache())
+    yield Base.cache
+    Base.set_cache(previous)
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    """A database file, so other connections can write to it like another process would"""
+    path = Base.configure(str(tmp_path / "giveconnect.db"))
+    Schema.migrate()
+    yield path
+    Base.close_connections()
+
+
+def test_load_started_before_a_clear_is_not_stored():
+    cache = ModelCache()
+    generation = cache.generation("donors")
+    # Another thread invalidates, commits and clears while the load runs
+    cache.invalidate("donors")
+    cache.clear()
+    cache.set(("donors", "id", 1), "stale", generation)
+    
+    assert cache.get(("donors", "id", 1)) == (False, None)
+    cache.set(("donors", "id", 1), "fresh", cache.generation("donors"))
+    assert cache.get(("donors", "id", 1)) == (True, "fresh")
+
+
+def test_local_commit_keeps_other_tables_cached(cache, file_db):
+    campaign = Campaign.create(name="Wells", description="Clean water", goal_amount="1000.00", organization="Org")
+    Campaign.find_by_id(campaign)
+    Donor.create(name="Other", email="other@example.com", password="password123")
+    
+    hits = cache.hits
+    Campaign.find_by_id(campaign)
+    assert cache.hits == hits + 1
+
+
+def test_commit_from_another_process_clears_the_cache(cache, file_db):
+    donor_id = Donor.create(name="Before", email="donor@example.com", password="password123")
+    assert Donor.find_by_id(donor_id)["name"] == "Before"
+    
+    other = sqlite3.connect(file_db)
+    with other:
+        other.execute("UPDATE donors SET name = 'After' WHERE id = ?", (donor_id,))
+    other.close()
+    
+    assert Donor.find_by_id(donor_id)["name"] == "After"
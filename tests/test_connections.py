@@ -0,0 +1,63 @@
+# tests/test_connections.py
+import threading
+import time
+
+from models.base import Base
+from models.donation import Donation
+
+
+def count_donations():
+    return Base._scalar("SELECT COUNT(*) FROM donations")
+
+
+def test_in_memory_reads_skip_uncommitted_rows(donor, campaign):
+    inserted = threading.Event()
+    release = threading.Event()
+    
+    def write():
+        try:
+            with Base.transaction() as cursor:
+                cursor.execute(
+                    "INSERT INTO donations (donor_id, campaign_id, amount) VALUES (?, ?, ?)",
+                    (donor, campaign, 500)
+                )
+                inserted.set()
+                release.wait(5)
+                raise RuntimeError("roll back")
+        except RuntimeError:
+            pass
+    
+    counts = []
+    writer = threading.Thread(target=write)
+    reader = threading.Thread(target=lambda: counts.append(count_donations()))
+    writer.start()
+    assert inserted.wait(5)
+    reader.start()
+    
+    # The read waits for the transaction instead of seeing its row
+    time.sleep(0.1)
+    assert reader.is_alive()
+    
+    release.set()
+    writer.join(5)
+    reader.join(5)
+    assert counts == [0]
+
+
+def test_in_memory_stream_survives_a_concurrent_write(donor, campaign):
+    for _ in range(5):
+        Donation.create(donor, campaign, "10.00")
+    
+    stream = Donation.iter_query("SELECT * FROM donations ORDER BY id", chunk_size=2)
+    first = next(stream)
+    
+    # The write waits until the stream is finished
+    writer = threading.Thread(target=Donation.create, args=(donor, campaign, "20.00"))
+    writer.start()
+    time.sleep(0.1)
+    assert writer.is_alive()
+    
+    rest = list(stream)
+    writer.join(5)
+    assert [first["id"]] + [row["id"] for row in rest] == [1, 2, 3, 4, 5]
+    assert count_donations() == 6
@@ -0,0 +1,94 @@
+# tests/test_donation_queue.py
+from decimal import Decimal
+
+import pytest
+
+from controllers.donation_controller import DonationController
+from models.base import Base
+from models.campaign import Campaign
+from models.donation_queue import DonationQueue
+
+
+def count_donations():
+    return Base._scalar("SELECT COUNT(*) FROM donations")
+
+
+@pytest.fixture
+def campaigns(db, donor, campaign):
+    other = Campaign.create(name="Books", description="School books", goal_amount="500.00", organization="Org")
+    return campaign, other
+
+
+def test_batches_commit_with_the_right_totals(donor, campaigns):
+    wells, books = campaigns
+    donations = DonationQueue(max_batch=10, max_delay=5).start()
+    futures = [
+        donations.submit(donor, wells if n % 2 else books, "1.25")
+        for n in range(25)
+    ]
+    donations.stop()
+    
+    ids = [future.result(timeout=5) for future in futures]
+    assert ids == list(range(1, 26))
+    # Two full batches, and stop() flushes the last five
+    assert donations.flushes == 3
+    assert donations.committed == 25
+    assert count_donations() == 25
+    assert Campaign.find_by_id(wells)["current_amount"] == Decimal("15.00")
+    assert Campaign.find_by_id(books)["current_amount"] == Decimal("16.25")
+
+
+def test_stop_flushes_queued_donations(donor, campaigns):
+    wells, _ = campaigns
+    # Far longer than the test, so only stop() can flush
+    donations = DonationQueue(max_batch=500, max_delay=60).start()
+    future = donations.submit(donor, wells, "3.00")
+    donations.stop()
+    
+    assert future.done()
+    assert future.result() == 1
+    assert count_donations() == 1
+
+
+def test_bad_donation_only_fails_its_own_future(donor, campaigns):
+    wells, _ = campaigns
+    donations = DonationQueue(max_batch=10, max_delay=5).start()
+    good = donations.submit(donor, wells, "2.00")
+    bad = donations.submit(donor, 999, "2.00")
+    donations.stop()
+    
+    assert good.result(timeout=5) == 1
+    with pytest.raises(ValueError):
+        bad.result(timeout=5)
+    assert Campaign.find_by_id(wells)["current_amount"] == Decimal("2.00")
+
+
+def test_invalid_amount_is_rejected_before_queueing(donor, campaigns):
+    wells, _ = campaigns
+    donations = DonationQueue().start()
+    try:
+        with pytest.raises(ValueError):
+            donations.submit(donor, wells, "0")
+    finally:
+        donations.stop()
+    assert donations.flushes == 0
+
+
+def test_controller_write_behind(donor, campaigns):
+    wells, _ = campaigns
+    assert DonationController.submit_donation(donor, wells, "1.00") == (False, "Write-behind mode is not enabled")
+    
+    DonationController.enable_write_behind(max_batch=50, max_delay_ms=5)
+    try:
+        success, message = DonationController.make_donation(donor, wells, "4.00")
+        assert success
+        assert message.endswith("Donation ID: 1")
+        # make_donation waits for its batch to commit
+        assert count_donations() == 1
+        success, future = DonationController.submit_donation(donor, wells, "6.00")
+        assert success
+    finally:
+        DonationController.disable_write_behind()
+    
+    assert future.result(timeout=5) == 2
+    assert Campaign.find_by_id(wells)["current_amount"] == Decimal("10.00")
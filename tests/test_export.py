@@ -0,0 +1,83 @@
+# tests/test_export.py
+import gzip
+
+import pytest
+
+from models.donation import Donation
+from models.export import Exporter, read_columnar
+
+
+class Interrupted(Exception):
+    pass
+
+
+def read(path):
+    """File contents, decompressed if gzipped"""
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rb") as f:
+        return f.read()
+
+
+def interrupt_after(monkeypatch, chunks):
+    """Make exports fail partway, after the given number of chunks"""
+    original = Exporter._chunks
+    
+    def failing(self, after_id=None):
+        for n, rows in enumerate(original(self, after_id), start=1):
+            yield rows
+            if n == chunks:
+                raise Interrupted()
+    
+    monkeypatch.setattr(Exporter, "_chunks", failing)
+
+
+@pytest.fixture
+def donations(donor, campaign):
+    Donation.insert_validated([
+        (donor, campaign, 100 + n, f"2024-01-{n % 28 + 1:02d} 12:00:00") for n in range(95)
+    ])
+
+
+@pytest.mark.parametrize("name", ["out.csv", "out.csv.gz", "out.jsonl.gz", "out.cols", "out.cols.gz"])
+def test_resumed_export_matches_a_full_one(donations, tmp_path, monkeypatch, name):
+    full = tmp_path / ("full-" + name)
+    Exporter("donations", chunk_size=10).run(full)
+    
+    path = tmp_path / name
+    with monkeypatch.context() as patch:
+        # Checkpoints every 20 rows up to 80, then 10 more rows past the last one
+        interrupt_after(patch, 9)
+        with pytest.raises(Interrupted):
+            Exporter("donations", chunk_size=10, checkpoint_every=20).run(path)
+    assert (tmp_path / (name + ".checkpoint")).exists()
+    # A torn write, longer than what is left to export
+    with open(path, "ab") as f:
+        f.write(b"torn" * 1024)
+    
+    result = Exporter("donations", chunk_size=10, checkpoint_every=20).run(path, resume=True)
+    
+    assert result["resumed"]
+    assert result["rows"] == 95
+    assert read(path) == read(full)
+    assert not (tmp_path / (name + ".checkpoint")).exists()
+    if ".cols" in name:
+        assert sum(len(values["id"]) for _, values in read_columnar(path)) == 95
+
+
+def test_resume_with_different_options_is_refused(donations, campaign, tmp_path, monkeypatch):
+    path = tmp_path / "out.jsonl"
+    with monkeypatch.context() as patch:
+        interrupt_after(patch, 3)
+        with pytest.raises(Interrupted):
+            Exporter("donations", chunk_size=10, checkpoint_every=20).run(path)
+    
+    with pytest.raises(ValueError, match="different options"):
+        Exporter("donations", campaign_id=campaign, chunk_size=10, checkpoint_every=20).run(path, resume=True)
+
+
+def test_resume_without_a_checkpoint_starts_over(donations, tmp_path):
+    path = tmp_path / "out.csv"
+    result = Exporter("donations", chunk_size=10).run(path, resume=True)
+    
+    assert not result["resumed"]
+    assert result["rows"] == 95
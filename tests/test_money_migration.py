@@ -0,0 +1,162 @@
+# tests/test_money_migration.py
+from decimal import Decimal
+
+import pytest
+
+from models.base import Base
+from models.campaign import Campaign
+from models.donation import Donation
+from models.import_pipeline import ImportPipeline
+from models.money import MAX_CENTS, from_cents, to_cents
+from models.schema import Schema
+
+# The tables with money in them as they were at schema version 3, amounts
+# stored as REAL dollars
+LEGACY_TABLES = [
+    """CREATE TABLE donors (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL, email TEXT NOT NULL UNIQUE, password TEXT NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE campaigns (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE, description TEXT NOT NULL, goal_amount REAL NOT NULL, current_amount REAL DEFAULT 0.0, organization TEXT NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, active INTEGER DEFAULT 1
+    )""",
+    """CREATE TABLE donations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        donor_id INTEGER NOT NULL, campaign_id INTEGER NOT NULL, amount REAL NOT NULL, date TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (donor_id) REFERENCES donors (id), FOREIGN KEY (campaign_id) REFERENCES campaigns (id)
+    )""",
+    """CREATE TABLE donor_stats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        donor_id INTEGER NOT NULL UNIQUE, total_donated REAL NOT NULL DEFAULT 0, donation_count INTEGER NOT NULL DEFAULT 0, first_donation TIMESTAMP, last_donation TIMESTAMP, campaign_count INTEGER NOT NULL DEFAULT 0, FOREIGN KEY (donor_id) REFERENCES donors (id)
+    )""",
+    """CREATE TABLE campaign_ledger (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        campaign_id INTEGER NOT NULL UNIQUE, verified_amount REAL NOT NULL DEFAULT 0, donation_count INTEGER NOT NULL DEFAULT 0
+    )""",
+    """CREATE TABLE reconcile_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        high_water_id INTEGER NOT NULL DEFAULT 0,
+        last_run TIMESTAMP
+    )""",
+    """CREATE TABLE ledger_adjustments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        campaign_id INTEGER NOT NULL,
+        amount REAL NOT NULL,
+        donation_count INTEGER NOT NULL
+    )""",
+]
+
+
+def column(sql):
+    """First column of every row of a query, as stored"""
+    with Base.reading() as conn:
+        return [row[0] for row in conn.execute(sql)]
+
+
+def sequences():
+    with Base.reading() as conn:
+        return dict(conn.execute("SELECT name, seq FROM sqlite_sequence"))
+
+
+@pytest.fixture
+def legacy_db():
+    """An in-memory database at version 3 holding fractional dollar amounts"""
+    path = Base.configure(":memory:")
+    with Base.transaction() as cursor:
+        for sql in LEGACY_TABLES:
+            cursor.execute(sql)
+        cursor.executemany(
+            "INSERT INTO donors (name, email, password) VALUES (?, ?, ?)",
+            [("Ann", "ann@example.com", "x"), ("Bob", "bob@example.com", "x")]
+        )
+        cursor.executemany(
+            "INSERT INTO campaigns (name, description, goal_amount, current_amount, organization) VALUES (?, ?, ?, ?, ?)",
+            [("Wells", "Clean water", 1500.5, 60.44, "Org"), ("Books", "School books", 999.99, 0.1 + 0.2, "Org")]
+        )
+        cursor.executemany(
+            "INSERT INTO donations (donor_id, campaign_id, amount, date) VALUES (?, ?, ?, ?)",
+            [
+                (1, 1, 19.99, "2024-01-05 10:00:00"),
+                (1, 1, 33.38, "2024-02-05 10:00:00"),
+                (2, 2, 0.1, "2024-02-06 10:00:00"),
+                (2, 2, 0.2, "2024-03-01 10:00:00"),
+                (2, 1, 7.07, "2024-03-02 10:00:00"),
+                (2, 1, 5.55, "2024-03-03 10:00:00"),
+            ]
+        )
+        # A deleted donation, AUTOINCREMENT must not hand out its id again
+        cursor.execute("DELETE FROM donations WHERE id = 6")
+        cursor.execute("INSERT INTO campaign_ledger (campaign_id, verified_amount, donation_count) VALUES (1, 60.44, 3)")
+        cursor.execute("INSERT INTO reconcile_state (id, high_water_id) VALUES (1, 5)")
+        cursor.execute("INSERT INTO ledger_adjustments (campaign_id, amount, donation_count) VALUES (2, -12.34, -1)")
+        cursor.execute("PRAGMA user_version = 3")
+    yield path
+    Base.close_connections()
+
+
+def test_migration_converts_amounts_to_cents(legacy_db):
+    applied = Schema.migrate()
+    
+    assert [version for version, _ in applied] == [4, 5]
+    assert Schema.version() == Schema.latest()
+    assert column("SELECT amount FROM donations ORDER BY id") == [1999, 3338, 10, 20, 707]
+    assert column("SELECT goal_amount FROM campaigns ORDER BY id") == [150050, 99999]
+    assert column("SELECT current_amount FROM campaigns ORDER BY id") == [6044, 30]
+    assert column("SELECT verified_amount FROM campaign_ledger") == [6044]
+    assert column("SELECT amount FROM ledger_adjustments") == [-1234]
+    # Recomputed from the cents, not carried over from the dollars
+    assert column("SELECT total_donated FROM donor_stats ORDER BY donor_id") == [5337, 737]
+    assert set(column("SELECT typeof(amount) FROM donations")) == {"integer"}
+    
+    assert Donation.find_by_id(1)["amount"] == Decimal("19.99")
+    assert Campaign.find_by_id(2)["current_amount"] == Decimal("0.30")
+
+
+def test_migration_keeps_autoincrement_sequences(legacy_db):
+    before = sequences()
+    Schema.migrate()
+    
+    after = sequences()
+    for table in ("donors", "campaigns", "donations", "ledger_adjustments"):
+        assert after[table] == before[table]
+    assert Donation.create(1, 1, "1.00") == 7
+    assert Schema.migrate() == []
+
+
+@pytest.mark.parametrize("amount", ["1e30", "1e400", "-1e400"])
+def test_amounts_too_precise_for_decimal_are_rejected(amount):
+    with pytest.raises(ValueError, match="Invalid amount"):
+        to_cents(amount)
+
+
+@pytest.mark.parametrize("amount", ["1e17", "-1e17", str(from_cents(MAX_CENTS) + Decimal("0.01"))])
+def test_amounts_outside_sqlite_integers_are_rejected(amount):
+    with pytest.raises(ValueError, match="Invalid amount"):
+        to_cents(amount)
+
+
+def test_largest_amount_still_fits():
+    assert to_cents(from_cents(MAX_CENTS)) == MAX_CENTS
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_huge_amount_only_fails_its_own_row(donor, campaign, workers):
+    rows = [
+        {"donor_id": donor, "campaign_id": campaign, "amount": "10.00"},
+        {"donor_id": donor, "campaign_id": campaign, "amount": "1e30"},
+        {"donor_id": donor, "campaign_id": campaign, "amount": "1e17"},
+        {"donor_id": donor, "campaign_id": campaign, "amount": "2.50"},
+    ]
+    if workers is None:
+        inserted, errors = Donation.bulk_create(rows)
+    else:
+        inserted, errors = ImportPipeline(workers, chunk_size=2).run(rows)
+    
+    assert inserted == 2
+    assert [row_number for row_number, _ in errors] == [2, 3]
+    assert Campaign.find_by_id(campaign)["current_amount"] == Decimal("12.50")
+
+
+def test_huge_goal_is_a_validation_error(db):
+    with pytest.raises(ValueError):
+        Campaign.create(name="Moonshot", description="Too big", goal_amount="1e400", organization="Org")
@@ -0,0 +1,118 @@
+# tests/test_paging.py
+import pytest
+
+from controllers.campaign_controller import CampaignController
+from controllers.donor_controller import DonorController
+from models.base import Base
+from models.campaign import Campaign
+from models.donation import Donation
+from models.donor import Donor
+
+
+def rows(sql, params=()):
+    with Base.reading() as conn:
+        return [tuple(row) for row in conn.execute(sql, params)]
+
+
+def walk(fetch, limit):
+    """Follow next_cursor from the first page to the last, returning every page"""
+    pages = []
+    cursor = None
+    # A cursor that never moves forward would loop forever
+    for _ in range(100):
+        items, cursor = fetch(limit=limit, cursor=cursor)
+        pages.append(items)
+        if cursor is None:
+            return pages
+    pytest.fail("Paging never reached the last page")
+
+
+@pytest.fixture
+def history(donor, campaign):
+    other = Donor.create(name="Bob", email="bob@example.com", password="password123")
+    # Runs of donations share a timestamp, so only the id breaks the ties
+    Donation.insert_validated([
+        (donor if n % 4 else other, campaign, 100 + n, f"2024-01-{n // 3 + 1:02d} 12:00:00")
+        for n in range(40)
+    ])
+    return donor
+
+
+def newest_first(donor_id):
+    return rows("SELECT id FROM donations WHERE donor_id = ? ORDER BY date DESC, id DESC", (donor_id,))
+
+
+@pytest.mark.parametrize("limit", [1, 4, 7, 30, 100])
+def test_pages_cover_every_donation_once_newest_first(history, limit):
+    pages = walk(lambda **page: Donation.get_donations_by_donor_page(history, **page), limit)
+    
+    ids = [(row["id"],) for page in pages for row in page]
+    assert ids == newest_first(history)
+    assert all(len(page) == limit for page in pages[:-1])
+    assert 0 < len(pages[-1]) <= limit
+
+
+def test_history_pages_match_donation_pages(history):
+    pages = walk(lambda **page: Donor.get_donation_history_page(history, **page), 4)
+    
+    assert [(row["id"],) for page in pages for row in page] == newest_first(history)
+    assert {row["campaign_name"] for page in pages for row in page} == {"Test Campaign"}
+
+
+def test_new_donations_do_not_shift_later_pages(history, campaign):
+    _, cursor = Donation.get_donations_by_donor_page(history, limit=5)
+    expected = newest_first(history)[5:10]
+    
+    # Newer than everything listed, so it belongs on a page already seen
+    Donation.create(history, campaign, "9.00")
+    second, _ = Donation.get_donations_by_donor_page(history, limit=5, cursor=cursor)
+    
+    assert [(row["id"],) for row in second] == expected
+
+
+def test_exact_fit_has_no_empty_last_page(history):
+    count = len(newest_first(history))
+    
+    items, cursor = Donation.get_donations_by_donor_page(history, limit=count)
+    assert len(items) == count
+    assert cursor is None
+
+
+def test_active_campaign_pages_skip_inactive_ones(campaign):
+    ids = [campaign] + [
+        Campaign.create(name=f"Campaign {n}", description="More", goal_amount="10.00", organization="Org")
+        for n in range(6)
+    ]
+    with Base.transaction() as cursor:
+        Campaign.invalidate()
+        cursor.execute("UPDATE campaigns SET active = 0 WHERE id IN (?, ?)", (ids[2], ids[5]))
+    
+    pages = walk(Campaign.get_active_campaigns_page, 2)
+    
+    assert [row["id"] for page in pages for row in page] == [ids[n] for n in (0, 1, 3, 4, 6)]
+    assert [len(page) for page in pages] == [2, 2, 1]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    Base.encode_cursor([]).rstrip("="),
+    Base.encode_cursor(["2024-01-01 12:00:00"]),
+    "eyJkYXRlIjogMX0=",
+])
+def test_bad_cursors_are_rejected(history, cursor):
+    with pytest.raises(ValueError, match="Invalid page cursor"):
+        Donation.get_donations_by_donor_page(history, cursor=cursor)
+    
+    assert DonorController.get_donation_history_page(history, cursor=cursor) == (False, "Invalid page cursor")
+
+
+def test_controllers_return_items_and_next_cursor(history):
+    success, page = CampaignController.get_active_campaigns_page(limit=1)
+    assert success
+    assert page["next_cursor"] is None
+    assert len(page["items"]) == 1
+    
+    success, page = DonorController.get_donation_history_page(history, limit=3)
+    assert success
+    assert len(page["items"]) == 3
+    assert page["next_cursor"] == Base.encode_cursor([page["items"][-1]["date"], page["items"][-1]["id"]])
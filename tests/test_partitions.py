@@ -0,0 +1,124 @@
+# tests/test_partitions.py
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from models.base import Base
+from models.campaign import Campaign
+from models.donation import Donation
+from models.donor import Donor
+from models.partitions import DonationPartitions
+
+RANGES = [
+    (None, None),
+    ("2024-01-01", "2024-03-01"),
+    ("2023-12-15", None),
+    (None, "2024-01-01"),
+    ("2025-01-01", "2025-02-01"),
+]
+
+
+def rows(sql, params=()):
+    with Base.reading() as conn:
+        return [tuple(row) for row in conn.execute(sql, params)]
+
+
+def observe(donors, campaigns):
+    """Everything partitioning must leave unchanged"""
+    seen = {
+        "ids": rows("SELECT id FROM donations ORDER BY id"),
+        "campaign_totals": rows("SELECT id, current_amount FROM campaigns ORDER BY id"),
+        "donor_stats": rows("SELECT * FROM donor_stats ORDER BY donor_id"),
+    }
+    for start, end in RANGES:
+        for donor_id in donors:
+            seen["by_donor", donor_id, start, end] = Donation.get_donations_by_donor(donor_id, start, end)
+            seen["history", donor_id, start, end] = Donor.get_donation_history(donor_id, start, end)
+            seen["total", donor_id, start, end] = Donor.get_total_donated(donor_id, start, end)
+        for campaign_id in campaigns:
+            seen["by_campaign", campaign_id, start, end] = Donation.get_donations_by_campaign(campaign_id, start, end)
+    return seen
+
+
+@pytest.fixture
+def history(db):
+    donors = [
+        Donor.create(name="Ann", email="ann@example.com", password="password123"),
+        Donor.create(name="Bob", email="bob@example.com", password="password123"),
+    ]
+    campaigns = [
+        Campaign.create(name="Wells", description="Clean water", goal_amount="1000.00", organization="Org"),
+        Campaign.create(name="Books", description="School books", goal_amount="500.00", organization="Org"),
+    ]
+    dates = ["2023-11-20", "2023-12-31", "2024-01-01", "2024-01-15", "2024-02-29", "2024-03-10", "2024-03-11"]
+    Donation.insert_validated([
+        (donors[i % 2], campaigns[i % 3 % 2], 1000 + i * 137, f"{date} 12:00:00")
+        for i, date in enumerate(dates)
+    ])
+    # The newest id is gone, it still must not be handed out again
+    Donation.delete(len(dates))
+    return donors, campaigns
+
+
+@pytest.mark.parametrize("period", ["month", "year"])
+def test_partitioning_keeps_ids_totals_and_results(history, period):
+    donors, campaigns = history
+    before = observe(donors, campaigns)
+    
+    names = Donation.enable_partitioning(period)
+    
+    current = DonationPartitions.key_for(datetime.now().strftime("%Y-%m-%d"), period)
+    if period == "month":
+        keys = {"2023-11", "2023-12", "2024-01", "2024-02", "2024-03", current}
+    else:
+        keys = {"2023", "2024", current}
+    assert sorted(names) == sorted(DonationPartitions.name_for(key) for key in keys)
+    assert observe(donors, campaigns) == before
+    
+    new_id = Donation.create(donors[0], campaigns[0], "3.00")
+    assert new_id == 8
+    assert DonationPartitions.max_id() == 8
+    assert rows(f"SELECT id FROM {DonationPartitions.name_for(current)}") == [(8,)]
+
+
+def test_partitioning_is_one_way(history):
+    Donation.enable_partitioning("month")
+    
+    assert Donation.enable_partitioning("month") == DonationPartitions.names()
+    with pytest.raises(ValueError):
+        Donation.enable_partitioning("year")
+
+
+def test_dates_outside_the_range_skip_partitions(history):
+    Donation.enable_partitioning("month")
+    
+    assert DonationPartitions.names("2024-01-01", "2024-03-01") == ["donations_2024_02", "donations_2024_01"]
+
+
+def test_create_drops_a_cached_miss_for_the_new_id(history):
+    donors, campaigns = history
+    Donation.enable_partitioning("month")
+    
+    assert Donation.find_by_id(8) is None
+    with Base.session():
+        assert Donation.find_by_id(8) is None
+        assert Donation.create(donors[0], campaigns[0], "3.00") == 8
+        assert Donation.find_by_id(8)["amount"] == Decimal("3.00")
+    assert Donation.find_by_id(8)["amount"] == Decimal("3.00")
+
+
+def test_partition_created_in_a_rolled_back_transaction_is_forgotten(history):
+    donors, campaigns = history
+    Donation.enable_partitioning("month")
+    
+    with pytest.raises(RuntimeError):
+        with Base.transaction():
+            Donation.partition("2030-01")
+            # The second lookup finds the new table and remembers it
+            assert DonationPartitions.known("donations_2030_01")
+            raise RuntimeError("roll back")
+    
+    assert not DonationPartitions.known("donations_2030_01")
+    Donation.insert_validated([(donors[0], campaigns[0], 500, "2030-01-02 12:00:00")])
+    assert rows("SELECT amount FROM donations_2030_01") == [(500,)]
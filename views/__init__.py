@@ -1,4 +1,19 @@
 # views/__init__.py
-from views.cli import CLI
+# Views are imported on first use, so main.py's batch mode doesn't load the
+# interactive CLI and the other way round
+import importlib
 
-__all__ = ['CLI']
\ No newline at end of file
+_MODULES = {
+    'CLI': 'views.cli',
+    'BatchCLI': 'views.batch'
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    if name not in _MODULES:
+        raise AttributeError(f"module 'views' has no attribute {name!r}")
+    value = getattr(importlib.import_module(_MODULES[name]), name)
+    globals()[name] = value
+    return value
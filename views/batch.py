@@ -0,0 +1,294 @@
+# views/batch.py
+import argparse
+import csv
+import json
+import os
+import shlex
+import sys
+import time
+from controllers.campaign_controller import CampaignController
+from controllers.donation_controller import DonationController
+from controllers.donor_controller import DonorController
+from controllers.export_controller import ExportController
+from controllers.reconcile_controller import ReconcileController
+from controllers.session import session
+
+
+class BatchError(Exception):
+    """A command line that couldn't be parsed"""
+
+
+class BatchParser(argparse.ArgumentParser):
+    """ArgumentParser that raises instead of exiting, so one bad line in a
+    batch doesn't end the whole run"""
+    
+    def error(self, message):
+        raise BatchError(message)
+
+
+class BatchCLI:
+    """Non-interactive commands for scripts and scheduled jobs
+    
+    Each command calls the controllers directly and writes its result to
+    stdout, as one JSON object per line (default) or as CSV. Nothing prompts
+    or redraws the screen, and `batch` runs many commands read from stdin in
+    one process over the same database connection.
+    """
+    
+    REPORTS = ("top", "funded", "inflow", "gift-size")
+    
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+        self.format = "json"
+        self.failures = 0
+        self._csv = None
+        self._csv_columns = None
+        self.parser = self.build_parser()
+    
+    def build_parser(self):
+        """Build the argument parser for every command"""
+        # --format is accepted before or after the command name
+        common = BatchParser(add_help=False)
+        common.add_argument("--format", choices=("json", "csv"), default=argparse.SUPPRESS,
+                            help="output format (default json)")
+        
+        parser = BatchParser(prog="main.py", parents=[common],
+                             description="GiveConnect without the menus. Run with no arguments for the interactive CLI.")
+        commands = parser.add_subparsers(dest="command", required=True)
+        
+        donate = commands.add_parser("donate", parents=[common], help="make a donation")
+        donate.add_argument("--donor-id", type=int, required=True)
+        donate.add_argument("--campaign-id", type=int, required=True)
+        donate.add_argument("--amount", required=True)
+        
+        load = commands.add_parser("import", parents=[common], help="bulk import donations from a file")
+        load.add_argument("path", help=".csv or .jsonl file, optionally .gz")
+        load.add_argument("--batch-size", type=int, default=1000)
+        load.add_argument("--workers", type=int,
+                          help="validate in this many processes (0 for one per CPU), default validates in-process")
+        load.add_argument("--chunk-size", type=int, default=5000, help="rows sent to a worker at a time")
+        
+        report = commands.add_parser("report", parents=[common], help="run a campaign report")
+        report.add_argument("name", choices=self.REPORTS)
+        report.add_argument("--n", type=int, default=10, help="rows for the top report")
+        report.add_argument("--by", help="top: raised or velocity, inflow: campaign or organization")
+        report.add_argument("--days", type=int, default=7, help="velocity window in days")
+        report.add_argument("--period", choices=("day", "week"), default="day")
+        report.add_argument("--start", help="first date (YYYY-MM-DD)")
+        report.add_argument("--end", help="date to stop before (YYYY-MM-DD)")
+        report.add_argument("--campaign-id", type=int)
+        report.add_argument("--all", action="store_true", help="funded: include inactive campaigns")
+        
+        export = commands.add_parser("export", parents=[common],
+                                     help="stream donations, donors or campaigns to stdout or a file")
+        export.add_argument("dataset", choices=ExportController.DATASETS)
+        export.add_argument("--output", help="write to this file (format from its extension: .csv, .jsonl, .cols, .gz)")
+        export.add_argument("--file-format", choices=ExportController.FORMATS,
+                            help="csv, jsonl or columnar (default from --output, else --format)")
+        export.add_argument("--gzip", action="store_true", help="gzip the output")
+        export.add_argument("--start", help="first date (YYYY-MM-DD)")
+        export.add_argument("--end", help="date to stop before (YYYY-MM-DD)")
+        export.add_argument("--campaign-id", type=int)
+        export.add_argument("--resume", action="store_true",
+                            help="continue an interrupted --output export from its checkpoint")
+        
+        register = commands.add_parser("register", parents=[common], help="register a donor")
+        register.add_argument("--name", required=True)
+        register.add_argument("--email", required=True)
+        register.add_argument("--password", required=True)
+        
+        campaign = commands.add_parser("campaign", parents=[common], help="manage campaigns")
+        campaign_commands = campaign.add_subparsers(dest="action", required=True)
+        create = campaign_commands.add_parser("create", parents=[common], help="create a campaign")
+        create.add_argument("--name", required=True)
+        create.add_argument("--description", required=True)
+        create.add_argument("--goal", required=True)
+        create.add_argument("--organization", required=True)
+        
+        reconcile = commands.add_parser("reconcile", parents=[common],
+                                        help="check campaign totals against the donations")
+        reconcile.add_argument("--repair", action="store_true",
+                               help="set drifted campaign totals to the verified amount")
+        reconcile.add_argument("--rebuild", action="store_true",
+                               help="recompute the verified totals from scratch first")
+        reconcile.add_argument("--every", type=float, metavar="SECONDS",
+                               help="keep running, once every SECONDS (Ctrl-C to stop)")
+        reconcile.add_argument("--runs", type=int, help="with --every, stop after this many runs")
+        
+        partition = commands.add_parser("partition", parents=[common],
+                                        help="split donations into per-month or per-year tables")
+        partition.add_argument("--by", choices=("month", "year"), default="month")
+        
+        batch = commands.add_parser("batch", parents=[common],
+                                    help="run one command per line from stdin (or --file)")
+        batch.add_argument("--file", help="read commands from this file instead of stdin")
+        batch.add_argument("--keep-going", action="store_true",
+                           help="carry on after a failed command (default stops at the first failure)")
+        
+        return parser
+    
+    def run(self, argv):
+        """Run one command line, returns the process exit status"""
+        try:
+            args = self.parser.parse_args(argv)
+        except BatchError as e:
+            self.parser.print_usage(sys.stderr)
+            print(f"main.py: error: {e}", file=sys.stderr)
+            return 2
+        
+        self.format = getattr(args, "format", "json")
+        try:
+            self.dispatch(args)
+            self.out.flush()
+        except BrokenPipeError:
+            # The reader went away (e.g. piped into head), so stop quietly.
+            # Point stdout at devnull so the flush at exit doesn't fail again.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+        return 1 if self.failures else 0
+    
+    def dispatch(self, args):
+        """Run a parsed command, returns True if it succeeded"""
+        name = args.command if args.command != "campaign" else f"campaign_{args.action}"
+        if name == "batch":
+            return self.do_batch(args)
+        # Each command gets its own identity map, a batch doesn't share one
+        with session():
+            return getattr(self, f"do_{name}")(args)
+    
+    def do_batch(self, args):
+        """Run every command line in a file or stdin
+        
+        Blank lines and lines starting with # are skipped. Each result is
+        written as it completes.
+        """
+        source = open(args.file, encoding="utf-8") if args.file else sys.stdin
+        try:
+            for line_number, line in enumerate(source, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                
+                try:
+                    command = self.parser.parse_args(shlex.split(line))
+                    if command.command == "batch":
+                        raise BatchError("batch can't be nested")
+                except (BatchError, ValueError) as e:
+                    ok = self.emit("batch", False, f"Line {line_number}: {e}")
+                else:
+                    ok = self.dispatch(command)
+                
+                if not ok and not args.keep_going:
+                    return False
+        finally:
+            if args.file:
+                source.close()
+        return True
+    
+    def do_donate(self, args):
+        return self.emit("donate", *DonationController.make_donation(args.donor_id, args.campaign_id, args.amount))
+    
+    def do_import(self, args):
+        return self.emit("import", *DonationController.import_donations(
+            args.path, args.batch_size, args.workers, args.chunk_size
+        ))
+    
+    def do_register(self, args):
+        return self.emit("register", *DonorController.register_donor(args.name, args.email, args.password, args.password))
+    
+    def do_campaign_create(self, args):
+        return self.emit("campaign create", *CampaignController.create_campaign(
+            args.name, args.description, args.goal, args.organization
+        ))
+    
+    def do_report(self, args):
+        # Imported here since analytics pulls in NumPy, which is slow to load
+        from controllers.report_controller import ReportController
+        
+        if args.name == "top":
+            result = ReportController.top_campaigns(args.n, args.by or "raised", args.days)
+        elif args.name == "funded":
+            result = ReportController.funded_distribution(not args.all)
+        elif args.name == "inflow":
+            result = ReportController.inflow(args.period, args.by or "campaign", args.start, args.end)
+        else:
+            result = ReportController.gift_size_stats(args.campaign_id, args.start, args.end)
+        return self.emit(f"report {args.name}", *result)
+    
+    def do_export(self, args):
+        filters = {"start": args.start, "end": args.end, "campaign_id": args.campaign_id}
+        if args.output:
+            return self.emit("export", *ExportController.export_to_file(
+                args.dataset, args.output, args.file_format, args.gzip, resume=args.resume, **filters
+            ))
+        if args.resume:
+            return self.emit("export", False, "--resume needs --output")
+        
+        # To stdout the rows go straight out, not wrapped in a result
+        file_format = args.file_format or ("csv" if self.format == "csv" else "jsonl")
+        self.out.flush()
+        success, result = ExportController.write(self.out.buffer, args.dataset, file_format, args.gzip, **filters)
+        self._csv_columns = None
+        if not success:
+            return self.emit("export", False, result)
+        return True
+    
+    def do_partition(self, args):
+        return self.emit("partition", *DonationController.partition_donations(args.by))
+    
+    def do_reconcile(self, args):
+        if args.rebuild and not self.emit("reconcile", *ReconcileController.rebuild_ledger()):
+            return False
+        
+        runs = 0
+        try:
+            while True:
+                ok = self.emit("reconcile", *ReconcileController.reconcile(args.repair))
+                runs += 1
+                if not args.every or (args.runs and runs >= args.runs):
+                    return ok
+                # Scheduled runs: report each one as it finishes
+                self.out.flush()
+                time.sleep(args.every)
+        except KeyboardInterrupt:
+            return True
+    
+    def emit(self, command, success, payload):
+        """Write a command's result, returns success
+        
+        Lists of rows (reports) are written row by row in CSV and as a
+        "result" list in JSON. Anything else becomes one record with the
+        command name and an ok flag.
+        """
+        if not success:
+            self.failures += 1
+            record = {"command": command, "ok": False, "error": payload}
+        elif isinstance(payload, list) and self.format == "csv":
+            for row in payload:
+                self.write_row(row)
+            return True
+        elif isinstance(payload, dict) and self.format == "csv":
+            record = dict({"command": command, "ok": True}, **payload)
+        else:
+            record = {"command": command, "ok": True, "result": payload}
+        
+        self.write_row(record)
+        return success
+    
+    def write_row(self, row):
+        """Write one row in the current format"""
+        row = dict(row)
+        if self.format == "json":
+            self.out.write(json.dumps(row, default=str) + "\n")
+            return
+        
+        # Start a new header whenever the shape of the rows changes
+        columns = list(row)
+        if columns != self._csv_columns:
+            self._csv = csv.writer(self.out)
+            self._csv.writerow(columns)
+            self._csv_columns = columns
+        self._csv.writerow(
+            json.dumps(value, default=str) if isinstance(value, (list, dict)) else value
+            for value in row.values()
+        )
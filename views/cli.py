@@ -1,19 +1,29 @@
 # views/cli.py
 import os
+import sys
 import time
+from decimal import Decimal, InvalidOperation
 from controllers.donor_controller import DonorController
 from controllers.campaign_controller import CampaignController
 from controllers.donation_controller import DonationController
+from controllers.session import session
 
 class CLI:
     """Command Line Interface for the GiveConnect application"""
     
+    # Rows shown per screen in paged lists
+    PAGE_SIZE = 10
+    
     def __init__(self):
         self.current_donor = None
     
     def clear_screen(self):
         """Clear the terminal screen"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        if os.name == 'nt':
+            os.system('cls')
+        elif sys.stdout.isatty():
+            # ANSI clear and cursor home, instead of forking `clear` on every redraw
+            print("\033[2J\033[H", end="", flush=True)
     
     def print_header(self, title):
         """Print a formatted header"""
@@ -37,8 +47,13 @@ class CLI:
             elif choice == '2':
                 self.register()
             elif choice == '3':
+                self.admin_menu()
+            elif choice == '4':
                 print("\nThank you for using GiveConnect! Goodbye.")
                 break
+            elif choice.strip().lower() == 'd':
+                # Hidden: query statistics for whoever is tuning the app
+                self.diagnostics()
             else:
                 print("Invalid choice. Please try again.")
                 self.pause()
@@ -50,9 +65,190 @@ class CLI:
         print("Main Menu")
         print("1. Login")
         print("2. Register")
-        print("3. Exit")
+        print("3. Admin Tools")
+        print("4. Exit")
+        
+        return input("\nEnter your choice (1-4): ")
+    
+    def admin_menu(self):
+        """Display the admin tools menu"""
+        while True:
+            self.print_header("Admin Tools")
+            
+            print("Admin Menu")
+            print("1. Import Donations")
+            print("2. Rebuild Donor Stats")
+            print("3. Reports")
+            print("4. Return to Main Menu")
+            
+            choice = input("\nEnter your choice (1-4): ")
+            
+            if choice == '1':
+                self.import_donations()
+            elif choice == '2':
+                self.rebuild_donor_stats()
+            elif choice == '3':
+                self.reports_menu()
+            elif choice == '4':
+                break
+            else:
+                print("Invalid choice. Please try again.")
+                self.pause()
+    
+    def import_donations(self):
+        """Bulk import donations from a CSV or JSONL file"""
+        self.print_header("Import Donations")
+        
+        path = input("Enter path to a .csv or .jsonl file: ").strip()
+        
+        success, result = DonationController.import_donations(path)
+        
+        if not success:
+            print(f"\nError: {result}")
+            self.pause()
+            return
+        
+        print(f"\nImported {result['inserted']} donations.")
+        
+        errors = result['errors']
+        if errors:
+            print(f"{len(errors)} rows were rejected:")
+            for row_number, message in errors[:20]:
+                print(f"  Row {row_number}: {message}")
+            if len(errors) > 20:
+                print(f"  ...and {len(errors) - 20} more")
+        
+        self.pause()
+    
+    def reports_menu(self):
+        """Display the reports menu"""
+        # Imported here since analytics pulls in NumPy, which is slow to load
+        from controllers.report_controller import ReportController
+        
+        while True:
+            self.print_header("Reports")
+            
+            print("Reports Menu")
+            print("1. Top Campaigns by Amount Raised")
+            print("2. Top Campaigns by Velocity (last 7 days)")
+            print("3. Funding Progress Distribution")
+            print("4. Daily Inflow per Campaign")
+            print("5. Weekly Inflow per Organization")
+            print("6. Gift Size Statistics")
+            print("7. Return to Admin Menu")
+            
+            choice = input("\nEnter your choice (1-7): ")
+            
+            if choice == '1':
+                self.show_report("Top Campaigns by Amount Raised", *ReportController.top_campaigns(10, "raised"))
+            elif choice == '2':
+                self.show_report("Top Campaigns by Velocity", *ReportController.top_campaigns(10, "velocity"))
+            elif choice == '3':
+                self.show_report("Funding Progress Distribution", *ReportController.funded_distribution())
+            elif choice == '4':
+                self.show_report("Daily Inflow per Campaign", *ReportController.inflow("day", "campaign"))
+            elif choice == '5':
+                self.show_report("Weekly Inflow per Organization", *ReportController.inflow("week", "organization"))
+            elif choice == '6':
+                success, stats = ReportController.gift_size_stats()
+                self.show_report("Gift Size Statistics", success, [stats] if success else stats)
+            elif choice == '7':
+                break
+            else:
+                print("Invalid choice. Please try again.")
+                self.pause()
+    
+    def show_report(self, title, success, rows):
+        """Print report rows as a simple table"""
+        self.print_header(title)
+        
+        if not success:
+            print(f"Error: {rows}")
+            self.pause()
+            return
+        
+        if len(rows) == 0:
+            print("No data for this report yet.")
+            self.pause()
+            return
+        
+        columns = list(rows[0].keys())
+        print(" | ".join(columns))
+        print("-" * 60)
+        
+        for row in rows:
+            values = [f"{row[column]:.2f}" if isinstance(row[column], (float, Decimal)) else str(row[column]) for column in columns]
+            print(" | ".join(values))
+        
+        self.pause()
+    
+    def rebuild_donor_stats(self):
+        """Recompute donor totals after a bulk load"""
+        self.print_header("Rebuild Donor Stats")
+        
+        success, message = DonorController.rebuild_donor_stats()
         
-        return input("\nEnter your choice (1-3): ")
+        if success:
+            print(message)
+        else:
+            print(f"Error: {message}")
+        
+        self.pause()
+    
+    def diagnostics(self):
+        """Show query statistics (hidden screen, 'd' from the main menu)"""
+        from controllers.diagnostics_controller import DiagnosticsController
+        
+        while True:
+            self.print_header("Diagnostics")
+            
+            success, stats = DiagnosticsController.get_stats()
+            
+            if not success:
+                print(f"Error: {stats}")
+                self.pause()
+                return
+            
+            print(f"Collection: {'on' if stats['enabled'] else 'off'}")
+            print(f"Connections opened: {stats['connections_opened']} | Commits: {stats['commits']} | Rollbacks: {stats['rollbacks']} | Busy retries: {stats['busy_retries']}")
+            cache = stats['cache']
+            if cache:
+                print(f"Cache: {cache['hits']} hits, {cache['misses']} misses, {cache['size']}/{cache['maxsize']} entries")
+            
+            print("\nSlowest statements (total ms | calls | rows | sql)")
+            print("-" * 60)
+            for entry in stats['statements']:
+                print(f"{entry['total_ms']:.1f} | {entry['calls']} | {entry['rows']} | {entry['sql'][:100]}")
+            
+            print("\nBy model method (total ms | statements | rows | method)")
+            print("-" * 60)
+            for entry in stats['methods']:
+                print(f"{entry['total_ms']:.1f} | {entry['calls']} | {entry['rows']} | {entry['method']}")
+            
+            print(f"\nSlow queries logged: {len(stats['slow_queries'])}")
+            
+            print("\nOptions:")
+            print("1. Turn Collection " + ("Off" if stats['enabled'] else "On"))
+            print("2. Clear Statistics")
+            print("3. Save to JSON")
+            print("4. Return to Main Menu")
+            
+            choice = input("\nEnter your choice (1-4): ")
+            
+            if choice == '1':
+                DiagnosticsController.set_collection(not stats['enabled'])
+            elif choice == '2':
+                DiagnosticsController.reset()
+            elif choice == '3':
+                path = input("Enter file path: ").strip() or "diagnostics.json"
+                success, message = DiagnosticsController.dump(path)
+                print(message)
+                self.pause()
+            elif choice == '4':
+                break
+            else:
+                print("Invalid choice. Please try again.")
+                self.pause()
     
     def register(self):
         """Register a new donor"""
@@ -118,20 +314,62 @@ class CLI:
                 print("Invalid choice. Please try again.")
                 self.pause()
     
+    def page_options(self, cursors, next_cursor):
+        """Print the next/previous page options that apply"""
+        if next_cursor:
+            print("N. Next Page")
+        if len(cursors) > 1:
+            print("P. Previous Page")
+    
+    def change_page(self, choice, cursors, next_cursor):
+        """Move through a paged list, returns True if the choice was a page move
+        
+        cursors is the stack of cursors for the pages seen so far, the last
+        one being the page on screen.
+        """
+        choice = choice.strip().lower()
+        if choice == 'n' and next_cursor:
+            cursors.append(next_cursor)
+            return True
+        if choice == 'p' and len(cursors) > 1:
+            cursors.pop()
+            return True
+        return False
+    
     def browse_campaigns(self):
         """Browse available campaigns"""
+        self.list_campaigns("Browse Campaigns", CampaignController.get_active_campaigns_page,
+                            "No active campaigns available.", searchable=True)
+    
+    def search_campaigns(self):
+        """Search active campaigns and browse the matches"""
+        self.print_header("Search Campaigns")
+        query = input("Search for (name, cause or organization): ")
+        
+        def fetch(limit, cursor):
+            return CampaignController.search_campaigns(query, limit, cursor)
+        
+        self.list_campaigns(f"Search Results: {query}", fetch, "No campaigns match your search.")
+    
+    def list_campaigns(self, title, fetch, empty_message, searchable=False):
+        """Paged campaign list with view, donate (and search) options
+        
+        fetch(limit, cursor) returns (success, page) like the controller page methods.
+        """
+        cursors = [None]
         while True:
-            self.print_header("Browse Campaigns")
+            self.print_header(title)
             
-            success, campaigns = CampaignController.get_active_campaigns()
+            success, page = fetch(self.PAGE_SIZE, cursors[-1])
             
             if not success:
-                print(f"Error: {campaigns}")
+                print(f"Error: {page}")
                 self.pause()
                 return
             
+            campaigns = page['items']
             if len(campaigns) == 0:
-                print("No active campaigns available.")
+                print(empty_message)
                 self.pause()
                 return
             
@@ -139,23 +377,36 @@ class CLI:
             print("-" * 60)
             
             for campaign in campaigns:
-                progress = (campaign['current_amount'] / campaign['goal_amount']) * 100 if campaign['goal_amount'] > 0 else 0
+                progress = CampaignController.progress(campaign['current_amount'], campaign['goal_amount'])
                 print(f"{campaign['id']} | {campaign['name']} | {campaign['organization']} | ${campaign['current_amount']:.2f} ({progress:.1f}%) | ${campaign['goal_amount']:.2f}")
             
+            options = ["View Campaign Details", "Make a Donation"]
+            if searchable:
+                options.append("Search Campaigns")
+            options.append("Return to Donor Menu" if searchable else "Return to Campaign List")
+            
             print("\nOptions:")
-            print("1. View Campaign Details")
-            print("2. Make a Donation")
-            print("3. Return to Donor Menu")
+            for number, option in enumerate(options, 1):
+                print(f"{number}. {option}")
+            self.page_options(cursors, page['next_cursor'])
             
-            choice = input("\nEnter your choice (1-3): ")
+            choice = input(f"\nEnter your choice (1-{len(options)}): ")
             
-            if choice == '1':
+            if self.change_page(choice, cursors, page['next_cursor']):
+                continue
+            elif choice == '1':
                 campaign_id = input("Enter campaign ID to view details: ")
-                self.view_campaign_details(campaign_id)
+                # One session per action, so donating from the details
+                # screen doesn't load the campaign a second time
+                with session():
+                    self.view_campaign_details(campaign_id)
             elif choice == '2':
                 campaign_id = input("Enter campaign ID to donate to: ")
-                self.make_donation(campaign_id)
-            elif choice == '3':
+                with session():
+                    self.make_donation(campaign_id)
+            elif choice == '3' and searchable:
+                self.search_campaigns()
+            elif choice == str(len(options)):
                 break
             else:
                 print("Invalid choice. Please try again.")
@@ -179,7 +430,7 @@ class CLI:
             self.pause()
             return
         
-        progress = (campaign['current_amount'] / campaign['goal_amount']) * 100 if campaign['goal_amount'] > 0 else 0
+        progress = campaign['progress']
         
         print(f"Name: {campaign['name']}")
         print(f"Organization: {campaign['organization']}")
@@ -190,16 +441,52 @@ class CLI:
         
         print("\nOptions:")
         print("1. Make a Donation")
-        print("2. Return to Campaign List")
+        print("2. View Donors")
+        print("3. Return to Campaign List")
         
-        choice = input("\nEnter your choice (1-2): ")
+        choice = input("\nEnter your choice (1-3): ")
         
         if choice == '1':
             self.make_donation(campaign_id)
-        elif choice != '2':
+        elif choice == '2':
+            self.view_campaign_donors(campaign_id)
+        elif choice != '3':
             print("Invalid choice.")
             self.pause()
     
+    def view_campaign_donors(self, campaign_id):
+        """Page through the donations made to a campaign"""
+        cursors = [None]
+        while True:
+            self.print_header("Campaign Donors")
+            
+            success, page = CampaignController.get_campaign_donors_page(campaign_id, self.PAGE_SIZE, cursors[-1])
+            
+            if not success:
+                print(f"Error: {page}")
+                self.pause()
+                return
+            
+            if len(page['items']) == 0:
+                print("This campaign has no donations yet.")
+                self.pause()
+                return
+            
+            print("Date | Donor | Amount")
+            print("-" * 60)
+            
+            for donation in page['items']:
+                print(f"{donation['date']} | {donation['donor_name']} | ${donation['amount']:.2f}")
+            
+            print("\nOptions:")
+            self.page_options(cursors, page['next_cursor'])
+            print("R. Return")
+            
+            choice = input("\nEnter your choice: ")
+            
+            if not self.change_page(choice, cursors, page['next_cursor']):
+                break
+    
     def make_donation(self, campaign_id):
         """Make a donation to a campaign"""
         self.print_header("Make a Donation")
@@ -223,8 +510,8 @@ class CLI:
         amount_str = input("Enter donation amount: $")
         
         try:
-            amount = float(amount_str)
-        except ValueError:
+            amount = Decimal(amount_str.strip())
+        except InvalidOperation:
             print("Invalid amount. Please enter a number.")
             self.pause()
             return
@@ -244,27 +531,43 @@ class CLI:
     
     def view_donation_history(self):
         """View donor's donation history"""
-        self.print_header("My Donation History")
-        
-        success, donations = DonorController.get_donation_history(self.current_donor['id'])
-        
-        if not success:
-            print(f"Error: {donations}")
-            self.pause()
-            return
-        
-        if len(donations) == 0:
-            print("You have not made any donations yet.")
-            self.pause()
-            return
-        
-        print("ID | Date | Campaign | Amount")
-        print("-" * 60)
-        
-        for donation in donations:
-            print(f"{donation['id']} | {donation['date']} | {donation['campaign_name']} | ${donation['amount']:.2f}")
-        
-        self.pause()
+        cursors = [None]
+        while True:
+            self.print_header("My Donation History")
+            
+            success, page = DonorController.get_donation_history_page(
+                self.current_donor['id'], self.PAGE_SIZE, cursors[-1]
+            )
+            
+            if not success:
+                print(f"Error: {page}")
+                self.pause()
+                return
+            
+            donations = page['items']
+            if len(donations) == 0:
+                print("You have not made any donations yet.")
+                self.pause()
+                return
+            
+            print("ID | Date | Campaign | Amount")
+            print("-" * 60)
+            
+            for donation in donations:
+                print(f"{donation['id']} | {donation['date']} | {donation['campaign_name']} | ${donation['amount']:.2f}")
+            
+            if not page['next_cursor'] and len(cursors) == 1:
+                self.pause()
+                return
+            
+            print("\nOptions:")
+            self.page_options(cursors, page['next_cursor'])
+            print("R. Return to Donor Menu")
+            
+            choice = input("\nEnter your choice: ")
+            
+            if not self.change_page(choice, cursors, page['next_cursor']):
+                break
     
     def view_profile(self):
         """View donor's profile"""
@@ -280,6 +583,10 @@ class CLI:
         print(f"Name: {profile['name']}")
         print(f"Email: {profile['email']}")
         print(f"Total Donations: ${profile['total_donated']:.2f}")
+        print(f"Number of Donations: {profile['donation_count']}")
+        print(f"Campaigns Supported: {profile['campaign_count']}")
+        if profile['last_donation']:
+            print(f"Last Donation: {profile['last_donation']}")
         print(f"Member Since: {profile['created_at']}")
         
         self.pause()
\ No newline at end of file